@@ -0,0 +1,81 @@
+
+import sys
+
+import glfw
+
+import ovr
+from ovr.triangle_drawer_core import TriangleDrawerCore
+from ovr.rift_gl_renderer_core import RiftGLRendererCore
+
+
+class GlfwApp(object):
+
+    def __init__(self, layered=False):
+        self.layered = layered
+
+    @ovr.LogCallback
+    def log_callback(userData, level, message):
+        if (message is not None):
+            print(message.decode("utf-8"))
+
+    def key_callback(self, window, key, scancode, action, mods):
+        "press ESCAPE to quit the application"
+        if key == glfw.KEY_ESCAPE and action == glfw.PRESS:
+            glfw.set_window_should_close(window, True)
+
+    def run(self):
+        params = ovr.InitParams()
+        params.Flags = ovr.Init_Debug | ovr.Init_RequestVersion | ovr.Init_FocusAware
+        params.LogCallback = self.log_callback
+        params.UserData = None
+        params.RequestedMinorVersion = ovr.MINOR_VERSION
+        params.ConnectionTimeoutMS = 0
+
+        renderer = RiftGLRendererCore(params, layered=self.layered)
+
+        # Initialize the library
+        if not glfw.init():
+            return
+
+        # Create a windowed mode window and its OpenGL 3.3 core profile context
+        glfw.window_hint(glfw.CONTEXT_VERSION_MAJOR, 3)
+        glfw.window_hint(glfw.CONTEXT_VERSION_MINOR, 3)
+        glfw.window_hint(glfw.OPENGL_PROFILE, glfw.OPENGL_CORE_PROFILE)
+        glfw.window_hint(glfw.OPENGL_FORWARD_COMPAT, True)
+        windowSize = ovr.Sizei();
+        windowSize.w = int(renderer.rift.get_resolution().w / 2)
+        windowSize.h = int(renderer.rift.get_resolution().h / 2)
+        self.window = glfw.create_window(windowSize.w, windowSize.h, "Hello World", None, None)
+        if not self.window:
+            glfw.terminate()
+            return
+    
+        renderer.append(TriangleDrawerCore())
+    
+        # Make the window's context current
+        glfw.make_context_current(self.window)
+    
+        # Initialize Oculus Rift
+        renderer.init_gl(windowSize)
+        renderer.rift.recenter_pose()
+        
+        glfw.set_key_callback(self.window, self.key_callback)
+    
+        # Loop until the user closes the window
+        while not glfw.window_should_close(self.window):
+            # Render here, e.g. using pyOpenGL
+            renderer.display_rift_gl(windowSize.w, windowSize.h)
+    
+            # Swap front and back buffers
+            glfw.swap_buffers(self.window)
+    
+            # Poll for and process events
+            glfw.poll_events()
+
+        renderer.dispose_gl()
+
+        glfw.terminate()
+
+if __name__ == "__main__":
+    # Run with --layered to render the eyes to texture array layers
+    GlfwApp(layered="--layered" in sys.argv).run()
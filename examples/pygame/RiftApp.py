@@ -2,6 +2,7 @@ import ovr
 import pygame
 import pygame.locals as pgl
 from ovr.rift import Rift
+from ovr.swap_chain_framebuffers import SwapChainFramebuffers
 from OpenGL.GL import *    #@UnusedWildImport
 
 class RiftSwapFramebuffer():
@@ -10,7 +11,7 @@ class RiftSwapFramebuffer():
     self.depth = 0
     self.size = size
     self.format = format_
-    self.fbo = 0
+    self.framebuffers = None
     self.build()
     
   def build(self, ):
@@ -21,33 +22,21 @@ class RiftSwapFramebuffer():
     glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT, self.size.w, self.size.h)
     glBindRenderbuffer(GL_RENDERBUFFER, 0)
 
-    # Set up the framebuffer proper
-    self.fbo = glGenFramebuffers(1)
-    glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
-    glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, self.depth)
-    glBindFramebuffer(GL_FRAMEBUFFER, 0)
+    # Set up and validate one framebuffer per texture of the swap chain
+    self.framebuffers = SwapChainFramebuffers(self.rift.session, self.pTextureSet, depthRenderbuffer=self.depth)
     
   def commit(self):
     self.rift.commit_texture_swap_chain(self.pTextureSet)
 
   def destroy(self):
-    glDeleteFramebuffers(1, [self.fbo])
+    self.framebuffers.destroy()
     glDeleteRenderbuffers(1, [self.depth])
     if self.pTextureSet is not None:
       self.rift.destroy_swap_texture(self.pTextureSet)
   
-  def attachCurrentTexture(self, target = GL_DRAW_FRAMEBUFFER):
-    textureId =  ovr.getTextureSwapChainBufferGL(self.rift.session, self.pTextureSet, -1)
-    # We switch textures every frame, so we need to bind the new texture here
-    glFramebufferTexture2D(target, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, textureId, 0)
-
-    # FIXME? validating every frame may be excessive
-    fboStatus = glCheckFramebufferStatus(target)
-    if (GL_FRAMEBUFFER_COMPLETE != fboStatus):
-      raise Exception("Bad framebuffer setup")
-    
   def bind(self, target = GL_DRAW_FRAMEBUFFER):
-    glBindFramebuffer(target, self.fbo)
+    # We switch textures every frame, so we bind the framebuffer of the current texture
+    self.framebuffers.bind(target)
 
     
   def unbind(self, target = GL_DRAW_FRAMEBUFFER):
@@ -141,7 +130,6 @@ class RiftApp():
 
     # Active the offscreen framebuffer and render the scene
     self.framebuffer.bind()
-    self.framebuffer.attachCurrentTexture()
     for eye in range(0, 2):
       self.currentEye = eye
       vp = self.layer.Viewport[eye]
@@ -5,11 +5,15 @@ Python bindings for Oculus Rift SDK version 1.69.0
 Works on Windows only at the moment (just like Oculus Rift SDK...)
 """
 
+import contextlib
 import ctypes
 from ctypes import * #@UnusedWildImport
 import math
 import platform
 import os
+import sys
+import threading
+import weakref
 
 
 OVR_PTR_SIZE = sizeof(c_voidp) # distinguish 32 vs 64 bit python
@@ -17,7 +21,7 @@ OVR_PTR_SIZE = sizeof(c_voidp) # distinguish 32 vs 64 bit python
 # Load Oculus runtime library (only tested on Windows)
 # 1) Figure out name of library to load
 
-if hasattr(os, 'add_dll_directory'):
+if hasattr(os, 'add_dll_directory') and os.getenv("OculusBase"):
     OVR_PATH = os.path.join(os.getenv("OculusBase"), "Support", "oculus-runtime")
     os.add_dll_directory(OVR_PATH)
 
@@ -26,12 +30,83 @@ if OVR_PTR_SIZE == 8:
     _libname = "OVRRT64_1" # 64-bit python
 if platform.system().startswith("Win"):
     _libname = "Lib"+_libname # i.e. "LibOVRRT32_1"
+
+def _loadBackend(backend):
+    """
+    Returns the library object that the bindings below call into.
+    The PYOVR_BACKEND environment variable selects it:
+      unset or "runtime"       -- the installed Oculus runtime
+      "sim"                    -- ovr.simulated_runtime.SimulatedRuntime, no headset required
+      "replay:path"            -- ovr.recording.ReplayRuntime, replaying a log recorded with PYOVR_RECORD
+      "package.module:factory" -- the object returned by calling factory()
+      anything else            -- name or path of a shared library standing in for LibOVRRT
+    """
+    if not backend or backend == "runtime":
+        try:
+            return CDLL(_libname)
+        except:
+            print("Is Oculus Runtime 1.69 installed on this machine?")
+            raise
+    if backend in ("sim", "simulated"):
+        from .simulated_runtime import SimulatedRuntime
+        return SimulatedRuntime()
+    if backend.startswith("replay:"):
+        from .recording import ReplayRuntime
+        return ReplayRuntime(backend[len("replay:"):])
+    moduleName, _, factoryName = backend.rpartition(":")
+    if moduleName and factoryName.isidentifier() and not os.path.exists(backend):
+        import importlib
+        return getattr(importlib.import_module(moduleName), factoryName)()
+    return CDLL(backend)
+
+class _LazyLibrary(object):
+    """
+    Binds the ovr_* functions of the backend library on first use.
+    Resolving a symbol and applying its restype and argtypes is deferred until
+    the function is first called, so importing ovr does not pay for parts of
+    the API that an application never uses.
+    """
+
+    def __init__(self, library):
+        self.library = library
+        self._prototypes = {}
+
+    def prototype(self, name, restype, argtypes=None):
+        "Records the ctypes signature of function name without resolving it"
+        self._prototypes[name] = (restype, argtypes)
+
+    def bindAll(self):
+        "Resolves every registered function now, e.g. to fail fast on a runtime missing symbols"
+        for name in self._prototypes:
+            getattr(self, name)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            restype, argtypes = self._prototypes[name]
+        except KeyError:
+            return getattr(self.library, name)
+        try:
+            function = getattr(self.library, name)
+        except AttributeError:
+            raise OculusFunctionError("The Oculus runtime does not export %s; it is older than the SDK version that added it." % name,
+                functionName=name)
+        function.restype = restype
+        if argtypes is not None:
+            function.argtypes = argtypes
+        setattr(self, name, function) # later lookups no longer reach __getattr__
+        return function
+
 # Load library
-try:
-    libovr = CDLL(_libname)
-except:
-    print("Is Oculus Runtime 1.69 installed on this machine?")
-    raise
+def _recordBackend(library, path):
+    "Records the tracking, input and session state the application sees to path, if set"
+    if not path:
+        return library
+    from .recording import recordingBackend
+    return recordingBackend(library, path)
+
+libovr = _LazyLibrary(_recordBackend(_loadBackend(os.getenv("PYOVR_BACKEND")), os.getenv("PYOVR_RECORD")))
 
 
 ENUM_TYPE = c_int32 # Hopefully a close enough guess...
@@ -102,21 +177,119 @@ class OculusFunctionError(RuntimeError):
     """
     OculusFunctionError is a custom exception type for when OVR functions return a failure code.
     Such a specific exception type allows more precise exception handling that does just raising Exception().
-    """
-    pass
+    The ovrResult error code is available as result, and the name of the failed function as function_name.
+    Failures with specific codes raise the subclasses below, e.g. DisplayLostError.
+    The ErrorInfo of the failure, fetched when it occurred, is available as error_info;
+    the message is only formatted when it is first read.
+    """
+    def __init__(self, message=None, result=None, functionName=None, errorInfo=None):
+        super(OculusFunctionError, self).__init__(message)
+        self.result = result
+        self.function_name = functionName
+        self.error_info = errorInfo # None if getLastErrorInfo() failed
+        self._message = message
+
+    def __str__(self):
+        if self._message is None:
+            msg = "Call to function ovr.%s() failed. Error code %d." % (
+                self.function_name, self.result)
+            errorInfo = self.error_info
+            if errorInfo is not None:
+                msg += " %s (%d)" % (errorInfo.ErrorString.decode("utf-8"), errorInfo.Result)
+            else:
+                msg += " And, annoyingly, getLastErrorInfo() failed too."
+            self._message = msg
+        return self._message
+
+class InvalidSessionError(OculusFunctionError):
+    "ovrError_InvalidSession: the session is not valid"
+
+class NoHmdError(OculusFunctionError):
+    "ovrError_NoHmd: no HMD is connected"
+
+class InvalidParameterError(OculusFunctionError):
+    "ovrError_InvalidParameter"
+
+class InvalidOperationError(OculusFunctionError):
+    "ovrError_InvalidOperation: the call is invalid in the object's current state"
+
+class InsufficientArraySizeError(OculusFunctionError):
+    "ovrError_InsufficientArraySize: the output array is too small"
+
+class LostTrackingError(OculusFunctionError):
+    "ovrError_LostTracking: tracking was lost during ovr_GetDevicePoses()"
+
+class ServiceConnectionError(OculusFunctionError):
+    "ovrError_ServiceConnection: the connection to the Oculus service was lost; the session must be destroyed"
+
+class DisplayLostError(OculusFunctionError):
+    "ovrError_DisplayLost: the session has to be re-created, see ovr.managed_session"
+
+class TextureSwapChainFullError(OculusFunctionError):
+    "ovrError_TextureSwapChainFull: the swap chain was committed too often without ending a frame"
+
+class TextureSwapChainInvalidError(OculusFunctionError):
+    "ovrError_TextureSwapChainInvalid: the swap chain is incomplete, e.g. was never committed"
+
+class GraphicsDeviceResetError(OculusFunctionError):
+    "ovrError_GraphicsDeviceReset"
+
+class DisplayRemovedError(OculusFunctionError):
+    "ovrError_DisplayRemoved: the HMD was removed from the display adapter"
+
+_errorTypes = {} # ovrResult -> OculusFunctionError subclass, filled in below the error codes
+_errorMode = threading.local() # raise_errors and last_failure of each thread
+
+def _lastErrorInfo():
+    try:
+        return getLastErrorInfo()
+    except Exception:
+        return None
 
 def _checkResult(ovrResult, functionName):
-    "Raises an exception if a function returns an error code"
-    if not FAILURE(ovrResult):
-        return # Function succeeded, so carry on
-    msg = "Call to function ovr.%s() failed. Error code %d." % (
-        functionName, ovrResult)
+    """
+    Raises the exception for ovrResult if it is a failure code, or records it when
+    raising is disabled with setRaiseOnError(False). The bindings test result < 0 before calling,
+    so the ErrorInfo of the failure is fetched right away, before any other call can replace it.
+    """
+    if ovrResult >= 0:
+        return ovrResult # Function succeeded, so carry on
+    failure = (ovrResult, functionName, _lastErrorInfo())
+    if not getattr(_errorMode, "raise_errors", True):
+        _errorMode.last_failure = failure
+        return ovrResult
+    raise _errorTypes.get(ovrResult, OculusFunctionError)(None, *failure)
+
+def setRaiseOnError(enabled):
+    """
+    With enabled False, failed calls on the calling thread return instead of raising, e.g. in
+    tight loops: functions that return an ovrResult return the failure code, others return their
+    unfilled outputs (getDevicePoses returns None), and getLastFailure() reports the failure.
+    Returns the previous setting.
+    """
+    previous = getattr(_errorMode, "raise_errors", True)
+    _errorMode.raise_errors = bool(enabled)
+    return previous
+
+@contextlib.contextmanager
+def noRaise():
+    "Context manager running its block with setRaiseOnError(False)"
+    previous = setRaiseOnError(False)
     try:
-        errorInfo = getLastErrorInfo()
-        msg += " %s (%d)" % (errorInfo.ErrorString.decode("utf-8"), errorInfo.Result)
-    except:
-        msg += " And, annoyingly, getLastErrorInfo() failed too."
-    raise OculusFunctionError(msg)
+        yield
+    finally:
+        setRaiseOnError(previous)
+
+def getLastFailure():
+    """
+    Returns, without raising it, the exception for the latest call on this thread that failed
+    while raising was disabled, or None, and forgets it.
+    """
+    failure = getattr(_errorMode, "last_failure", None)
+    if failure is None:
+        return None
+    _errorMode.last_failure = None
+    return _errorTypes.get(failure[0], OculusFunctionError)(None, *failure)
 
 ### BEGIN Declarations from C header file OVR_Version.h ###
 
@@ -515,6 +688,11 @@ class Vector2i(Structure):
         else:
             return getattr(self, self._fields_[key][0])
 
+    def as_numpy(self):
+        "NumPy view of the components, sharing memory with this structure (requires numpy)"
+        from .pose_math import as_array
+        return as_array(self)
+
 
 # Translated from header file OVR_CAPI.h line 276
 class Sizei(Structure):
@@ -539,6 +717,11 @@ class Sizei(Structure):
         else:
             return getattr(self, self._fields_[key][0])
 
+    def as_numpy(self):
+        "NumPy view of the components, sharing memory with this structure (requires numpy)"
+        from .pose_math import as_array
+        return as_array(self)
+
 
 # Translated from header file OVR_CAPI.h line 279
 class Recti(Structure):
@@ -581,6 +764,11 @@ class Quatf(Structure):
         else:
             return getattr(self, self._fields_[key][0])
 
+    def as_numpy(self):
+        "NumPy view of the components, sharing memory with this structure (requires numpy)"
+        from .pose_math import as_array
+        return as_array(self)
+
     def getEulerAngles(self, axis1=0, axis2=1, axis3=2, rotate_direction=1, handedness=1):
         assert(axis1 != axis2)
         assert(axis1 != axis3)
@@ -642,6 +830,11 @@ class Vector2f(Structure):
         else:
             return getattr(self, self._fields_[key][0])
 
+    def as_numpy(self):
+        "NumPy view of the components, sharing memory with this structure (requires numpy)"
+        from .pose_math import as_array
+        return as_array(self)
+
 
 # Translated from header file OVR_CAPI.h line 292
 class Vector3f(Structure):
@@ -667,6 +860,11 @@ class Vector3f(Structure):
         else:
             return getattr(self, self._fields_[key][0])
 
+    def as_numpy(self):
+        "NumPy view of the components, sharing memory with this structure (requires numpy)"
+        from .pose_math import as_array
+        return as_array(self)
+
 
 # Translated from header file OVR_CAPI.h line 295
 class Matrix4f(Structure):
@@ -689,6 +887,18 @@ class Matrix4f(Structure):
         j = key % 4
         return self.M[j][i]
 
+    def as_numpy(self, column_major=False):
+        """
+        NumPy 4x4 view of M, sharing memory with this matrix (requires numpy).
+        Indexed [row][column] as stored, or, if column_major, the same memory
+        read as a column-major matrix, i.e. the transpose.
+        """
+        from .pose_math import as_array
+        m = as_array(self)
+        if column_major:
+            return m.T
+        return m
+
 
 # Translated from header file OVR_CAPI.h line 298
 class Posef(Structure):
@@ -705,6 +915,14 @@ class Posef(Structure):
     def __repr__(self):
         return "ovr.Posef(%s, %s)" % (self.Orientation, self.Position)
 
+    def as_numpy(self):
+        """
+        NumPy view with Orientation (x, y, z, w) and Position (x, y, z) fields,
+        sharing memory with this pose (requires numpy)
+        """
+        from .pose_math import as_array
+        return as_array(self)
+
 
 # Translated from header file OVR_CAPI.h line 305
 class PoseStatef(Structure):
@@ -1651,8 +1869,7 @@ class InitParams(Structure):
         return "ovr.InitParams(%s, %s, %s, %s, %s)" % (self.Flags, self.RequestedMinorVersion, self.LogCallback, self.UserData, self.ConnectionTimeoutMS)
 
 # Translated from header file OVR_CAPI.h line 1231
-libovr.ovr_Initialize.restype = Result
-libovr.ovr_Initialize.argtypes = [POINTER(InitParams)]
+libovr.prototype("ovr_Initialize", Result, [POINTER(InitParams)])
 def initialize(params):
     """
     Initializes LibOVR
@@ -1710,13 +1927,22 @@ def initialize(params):
         params.Flags = Init_RequestVersion
         params.RequestedMinorVersion = MINOR_VERSION
         params.ConnectionTimeoutMS = 0
+    # Older runtimes refuse a newer minor version than their own, so request theirs
+    # and select the variants of the functions that changed since (see selectSdkVersion)
+    runtimeMinorVersion = getRuntimeMinorVersion()
+    if params.Flags & Init_RequestVersion:
+        params.RequestedMinorVersion = min(params.RequestedMinorVersion, runtimeMinorVersion)
+        selectSdkVersion(params.RequestedMinorVersion)
+    else:
+        selectSdkVersion(min(MINOR_VERSION, runtimeMinorVersion))
     result = libovr.ovr_Initialize(byref(params))
-    _checkResult(result, "initialize")
+    if result < 0:
+        _checkResult(result, "initialize")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 1282
-libovr.ovr_Shutdown.restype = None
+libovr.prototype("ovr_Shutdown", None)
 def shutdown():
     """
     Shuts down LibOVR
@@ -1731,11 +1957,11 @@ def shutdown():
     \see ovr_Initialize
     """
     libovr.ovr_Shutdown()
+    selectSdkVersion(MINOR_VERSION) # until the next initialize() negotiates a version again
 
 
 # Translated from header file OVR_CAPI.h line 1295
-libovr.ovr_GetLastErrorInfo.restype = None
-libovr.ovr_GetLastErrorInfo.argtypes = [POINTER(ErrorInfo)]
+libovr.prototype("ovr_GetLastErrorInfo", None, [POINTER(ErrorInfo)])
 def getLastErrorInfo():
     """
     Returns information about the most recent failed return value by the
@@ -1759,7 +1985,7 @@ def getLastErrorInfo():
 
 
 # Translated from header file OVR_CAPI.h line 1312
-libovr.ovr_GetVersionString.restype = c_char_p
+libovr.prototype("ovr_GetVersionString", c_char_p)
 def getVersionString():
     """
     Returns the version string representing the LibOVRRT version.
@@ -1780,8 +2006,7 @@ def getVersionString():
 
 
 # Translated from header file OVR_CAPI.h line 1327
-libovr.ovr_TraceMessage.restype = c_int
-libovr.ovr_TraceMessage.argtypes = [c_int, c_char_p]
+libovr.prototype("ovr_TraceMessage", c_int, [c_int, c_char_p])
 def traceMessage(level, message):
     """
     Writes a message string to the LibOVR tracing mechanism (if enabled).
@@ -1800,8 +2025,7 @@ def traceMessage(level, message):
 
 
 # Translated from header file OVR_CAPI.h line 1340
-libovr.ovr_IdentifyClient.restype = Result
-libovr.ovr_IdentifyClient.argtypes = [c_char_p]
+libovr.prototype("ovr_IdentifyClient", Result, [c_char_p])
 def identifyClient(identity):
     """
     Identify client application info.
@@ -1831,13 +2055,13 @@ def identifyClient(identity):
         \endcode
     """
     result = libovr.ovr_IdentifyClient(identity)
-    _checkResult(result, "identifyClient")
+    if result < 0:
+        _checkResult(result, "identifyClient")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 1374
-libovr.ovr_GetHmdDesc.restype = HmdDesc
-libovr.ovr_GetHmdDesc.argtypes = [Session]
+libovr.prototype("ovr_GetHmdDesc", HmdDesc, [Session])
 def getHmdDesc(session):
     """
     Returns information about the current HMD.
@@ -1856,8 +2080,7 @@ def getHmdDesc(session):
 
 
 # Translated from header file OVR_CAPI.h line 1387
-libovr.ovr_GetTrackerCount.restype = c_uint
-libovr.ovr_GetTrackerCount.argtypes = [Session]
+libovr.prototype("ovr_GetTrackerCount", c_uint, [Session])
 def getTrackerCount(session):
     """
     Returns the number of attached trackers.
@@ -1874,8 +2097,7 @@ def getTrackerCount(session):
 
 
 # Translated from header file OVR_CAPI.h line 1398
-libovr.ovr_GetTrackerDesc.restype = TrackerDesc
-libovr.ovr_GetTrackerDesc.argtypes = [Session, c_uint]
+libovr.prototype("ovr_GetTrackerDesc", TrackerDesc, [Session, c_uint])
 def getTrackerDesc(session, trackerDescIndex):
     """
     Returns a given attached tracker description.
@@ -1899,8 +2121,7 @@ def getTrackerDesc(session, trackerDescIndex):
 
 
 # Translated from header file OVR_CAPI.h line 1417
-libovr.ovr_Create.restype = Result
-libovr.ovr_Create.argtypes = [POINTER(Session), POINTER(GraphicsLuid)]
+libovr.prototype("ovr_Create", Result, [POINTER(Session), POINTER(GraphicsLuid)])
 def create():
     """
     Creates a handle to a VR session.
@@ -1934,13 +2155,13 @@ def create():
     pSession = Session()
     pLuid = GraphicsLuid()
     result = libovr.ovr_Create(byref(pSession), byref(pLuid))
-    _checkResult(result, "create")
+    if result < 0:
+        _checkResult(result, "create")
     return pSession, pLuid
 
 
 # Translated from header file OVR_CAPI.h line 1447
-libovr.ovr_Destroy.restype = None
-libovr.ovr_Destroy.argtypes = [Session]
+libovr.prototype("ovr_Destroy", None, [Session])
 def destroy(session):
     """
     Destroys the session.
@@ -1974,14 +2195,14 @@ class SessionStatus(Structure):
 
 
 # Translated from header file OVR_CAPI.h line 1473
-libovr.ovr_GetSessionStatus.restype = Result
-libovr.ovr_GetSessionStatus.argtypes = [Session, POINTER(SessionStatus)]
-def getSessionStatus(session):
+libovr.prototype("ovr_GetSessionStatus", Result, [Session, POINTER(SessionStatus)])
+def getSessionStatus(session, outStatus=None):
     """
     Returns status information for the application.
     
     \param[in] session Specifies an ovrSession previously returned by ovr_Create.
     \param[out] sessionStatus Provides an ovrSessionStatus that is filled in.
+                Pass a SessionStatus to fill it in place instead of allocating a new one.
     
     \return Returns an ovrResult indicating success or failure. In the case of
             failure, use ovr_GetLastErrorInfo to get more information.
@@ -1990,15 +2211,16 @@ def getSessionStatus(session):
         - ovrError_ServiceConnection: The service connection was lost and the application
            must destroy the session.
     """
-    sessionStatus = SessionStatus()
-    result = libovr.ovr_GetSessionStatus(session, byref(sessionStatus))
-    _checkResult(result, "getSessionStatus")
-    return sessionStatus
+    if outStatus is None:
+        outStatus = SessionStatus()
+    result = libovr.ovr_GetSessionStatus(session, byref(outStatus))
+    if result < 0:
+        _checkResult(result, "getSessionStatus")
+    return outStatus
 
 
 # Translated from header file OVR_CAPI.h line 1501
-libovr.ovr_SetTrackingOriginType.restype = Result
-libovr.ovr_SetTrackingOriginType.argtypes = [Session, TrackingOrigin]
+libovr.prototype("ovr_SetTrackingOriginType", Result, [Session, TrackingOrigin])
 def setTrackingOriginType(session, origin):
     """
     Sets the tracking origin type
@@ -2015,13 +2237,13 @@ def setTrackingOriginType(session, origin):
     \see ovrTrackingOrigin, ovr_GetTrackingOriginType
     """
     result = libovr.ovr_SetTrackingOriginType(session, origin)
-    _checkResult(result, "setTrackingOriginType")
+    if result < 0:
+        _checkResult(result, "setTrackingOriginType")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 1516
-libovr.ovr_GetTrackingOriginType.restype = TrackingOrigin
-libovr.ovr_GetTrackingOriginType.argtypes = [Session]
+libovr.prototype("ovr_GetTrackingOriginType", TrackingOrigin, [Session])
 def getTrackingOriginType(session):
     """
     Gets the tracking origin state
@@ -2038,8 +2260,7 @@ def getTrackingOriginType(session):
 
 
 # Translated from header file OVR_CAPI.h line 1526
-libovr.ovr_RecenterTrackingOrigin.restype = Result
-libovr.ovr_RecenterTrackingOrigin.argtypes = [Session]
+libovr.prototype("ovr_RecenterTrackingOrigin", Result, [Session])
 def recenterTrackingOrigin(session):
     """
     Re-centers the sensor position and orientation.
@@ -2072,13 +2293,13 @@ def recenterTrackingOrigin(session):
     \see ovrTrackingOrigin, ovr_GetTrackerPose, ovr_SpecifyTrackingOrigin
     """
     result = libovr.ovr_RecenterTrackingOrigin(session)
-    _checkResult(result, "recenterTrackingOrigin")
+    if result < 0:
+        _checkResult(result, "recenterTrackingOrigin")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 1557
-libovr.ovr_SpecifyTrackingOrigin.restype = Result
-libovr.ovr_SpecifyTrackingOrigin.argtypes = [Session, Posef]
+libovr.prototype("ovr_SpecifyTrackingOrigin", Result, [Session, Posef])
 def specifyTrackingOrigin(session, originPose):
     """
     Allows manually tweaking the sensor position and orientation.
@@ -2126,13 +2347,13 @@ def specifyTrackingOrigin(session, originPose):
     \see ovrTrackingOrigin, ovr_GetTrackerPose, ovr_RecenterTrackingOrigin
     """
     result = libovr.ovr_SpecifyTrackingOrigin(session, originPose)
-    _checkResult(result, "specifyTrackingOrigin")
+    if result < 0:
+        _checkResult(result, "specifyTrackingOrigin")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 1603
-libovr.ovr_ClearShouldRecenterFlag.restype = None
-libovr.ovr_ClearShouldRecenterFlag.argtypes = [Session]
+libovr.prototype("ovr_ClearShouldRecenterFlag", None, [Session])
 def clearShouldRecenterFlag(session):
     """
     Clears the ShouldRecenter status bit in ovrSessionStatus.
@@ -2146,9 +2367,8 @@ def clearShouldRecenterFlag(session):
 
 
 # Translated from header file OVR_CAPI.h line 1611
-libovr.ovr_GetTrackingState.restype = TrackingState
-libovr.ovr_GetTrackingState.argtypes = [Session, c_double, Bool]
-def getTrackingState(session, absTime, latencyMarker):
+libovr.prototype("ovr_GetTrackingState", TrackingState, [Session, c_double, Bool])
+def getTrackingState(session, absTime, latencyMarker, outState=None):
     """
     Returns tracking state reading based on the specified absolute system time.
     
@@ -2167,15 +2387,20 @@ def getTrackingState(session, absTime, latencyMarker):
     \return Returns the ovrTrackingState that is predicted for the given absTime.
     
     \see ovrTrackingState, ovr_GetEyePoses, ovr_GetTimeInSeconds
+    
+    Pass a TrackingState, e.g. a slot of a ring of them, as outState to receive the state
+    in it; it is then returned instead of the state returned by the runtime.
     """
     result = libovr.ovr_GetTrackingState(session, absTime, toOvrBool(latencyMarker))
+    if outState is not None:
+        memmove(addressof(outState), addressof(result), sizeof(TrackingState))
+        return outState
     return result
 
 
 # Translated from header file OVR_CAPI.h line 1632
-libovr.ovr_GetDevicePoses.restype = Result
-libovr.ovr_GetDevicePoses.argtypes = [Session, POINTER(TrackedDeviceType), c_int, c_double, POINTER(PoseStatef)]
-def getDevicePoses(session, deviceTypes, absTime):
+libovr.prototype("ovr_GetDevicePoses", Result, [Session, POINTER(TrackedDeviceType), c_int, c_double, POINTER(PoseStatef)])
+def getDevicePoses(session, deviceTypes, absTime, outDevicePoses=None):
     """
     Returns an array of poses, where each pose matches a device type provided by the deviceTypes
     array parameter.
@@ -2190,20 +2415,27 @@ def getDevicePoses(session, deviceTypes, absTime):
     
     \return Returns an ovrResult for which OVR_SUCCESS(result) is false upon error and
             true upon success.
+            Returns None instead of the poses when tracking is lost, or on failures while
+            setRaiseOnError(False).
+    
+    To poll without allocating, pass deviceTypes as an array of TrackedDeviceType, and an array
+    of PoseStatef as outDevicePoses; it is filled in place and returned.
     """
     deviceCount = len(deviceTypes)
-    outDevicePoses = (PoseStatef * deviceCount)()
-    deviceTypes = (TrackedDeviceType * deviceCount)(*[deviceType for deviceType in deviceTypes])
+    if outDevicePoses is None:
+        outDevicePoses = (PoseStatef * deviceCount)()
+    if not isinstance(deviceTypes, Array):
+        deviceTypes = (TrackedDeviceType * deviceCount)(*[deviceType for deviceType in deviceTypes])
     result = libovr.ovr_GetDevicePoses(session, byref(deviceTypes), deviceCount, absTime, byref(outDevicePoses))
-    if result == Error_LostTracking:
+    if result < 0:
+        if result != Error_LostTracking:
+            _checkResult(result, "getDevicePoses")
         return None
-    _checkResult(result, "getDevicePoses")
     return outDevicePoses
 
 
 # Translated from header file OVR_CAPI.h line 1655
-libovr.ovr_GetTrackerPose.restype = TrackerPose
-libovr.ovr_GetTrackerPose.argtypes = [Session, c_uint]
+libovr.prototype("ovr_GetTrackerPose", TrackerPose, [Session, c_uint])
 def getTrackerPose(session, trackerPoseIndex):
     """
     Returns the ovrTrackerPose for the given attached tracker.
@@ -2221,27 +2453,28 @@ def getTrackerPose(session, trackerPoseIndex):
 
 
 # Translated from header file OVR_CAPI.h line 1668
-libovr.ovr_GetInputState.restype = Result
-libovr.ovr_GetInputState.argtypes = [Session, ControllerType, POINTER(InputState)]
-def getInputState(session, controllerType):
+libovr.prototype("ovr_GetInputState", Result, [Session, ControllerType, POINTER(InputState)])
+def getInputState(session, controllerType, outState=None):
     """
     Returns the most recent input state for controllers, without positional tracking info.
     
     \param[out] inputState Input state that will be filled in.
+                Pass an InputState as outState to fill it in place instead of allocating a new one.
     \param[in] ovrControllerType Specifies which controller the input will be returned for.
     \return Returns ovrSuccess if the new state was successfully obtained.
     
     \see ovrControllerType
     """
-    inputState = InputState()
-    result = libovr.ovr_GetInputState(session, controllerType, byref(inputState))
-    _checkResult(result, "getInputState")
-    return inputState
+    if outState is None:
+        outState = InputState()
+    result = libovr.ovr_GetInputState(session, controllerType, byref(outState))
+    if result < 0:
+        _checkResult(result, "getInputState")
+    return outState
 
 
 # Translated from header file OVR_CAPI.h line 1679
-libovr.ovr_GetConnectedControllerTypes.restype = c_uint
-libovr.ovr_GetConnectedControllerTypes.argtypes = [Session]
+libovr.prototype("ovr_GetConnectedControllerTypes", c_uint, [Session])
 def getConnectedControllerTypes(session):
     """
     Returns controller types connected to the system OR'ed together.
@@ -2255,8 +2488,7 @@ def getConnectedControllerTypes(session):
 
 
 # Translated from header file OVR_CAPI.h line 1687
-libovr.ovr_GetTouchHapticsDesc.restype = TouchHapticsDesc
-libovr.ovr_GetTouchHapticsDesc.argtypes = [Session, ControllerType]
+libovr.prototype("ovr_GetTouchHapticsDesc", TouchHapticsDesc, [Session, ControllerType])
 def getTouchHapticsDesc(session, controllerType):
     """
     Gets information about Haptics engine for the specified Touch controller.
@@ -2271,8 +2503,7 @@ def getTouchHapticsDesc(session, controllerType):
 
 
 # Translated from header file OVR_CAPI.h line 1697
-libovr.ovr_SetControllerVibration.restype = Result
-libovr.ovr_SetControllerVibration.argtypes = [Session, ControllerType, c_float, c_float]
+libovr.prototype("ovr_SetControllerVibration", Result, [Session, ControllerType, c_float, c_float])
 def setControllerVibration(session, controllerType, frequency, amplitude):
     """
     Sets constant vibration (with specified frequency and amplitude) to a controller.
@@ -2293,13 +2524,13 @@ def setControllerVibration(session, controllerType, frequency, amplitude):
         controllerType is not available.
     """
     result = libovr.ovr_SetControllerVibration(session, controllerType, frequency, amplitude)
-    _checkResult(result, "setControllerVibration")
+    if result < 0:
+        _checkResult(result, "setControllerVibration")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 1721
-libovr.ovr_SubmitControllerVibration.restype = Result
-libovr.ovr_SubmitControllerVibration.argtypes = [Session, ControllerType, POINTER(HapticsBuffer)]
+libovr.prototype("ovr_SubmitControllerVibration", Result, [Session, ControllerType, POINTER(HapticsBuffer)])
 def submitControllerVibration(session, controllerType, buffer_):
     """
     Submits a Haptics buffer (used for vibration) to Touch (only) controllers.
@@ -2318,13 +2549,13 @@ def submitControllerVibration(session, controllerType, buffer_):
     \see ovrHapticsBuffer
     """
     result = libovr.ovr_SubmitControllerVibration(session, controllerType, byref(buffer_))
-    _checkResult(result, "submitControllerVibration")
+    if result < 0:
+        _checkResult(result, "submitControllerVibration")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 1742
-libovr.ovr_GetControllerVibrationState.restype = Result
-libovr.ovr_GetControllerVibrationState.argtypes = [Session, ControllerType, POINTER(HapticsPlaybackState)]
+libovr.prototype("ovr_GetControllerVibrationState", Result, [Session, ControllerType, POINTER(HapticsPlaybackState)])
 def getControllerVibrationState(session, controllerType, outState):
     """
     Gets the Haptics engine playback state of a specific Touch controller.
@@ -2341,13 +2572,13 @@ def getControllerVibrationState(session, controllerType, outState):
     \see ovrHapticsPlaybackState
     """
     result = libovr.ovr_GetControllerVibrationState(session, controllerType, byref(outState))
-    _checkResult(result, "getControllerVibrationState")
+    if result < 0:
+        _checkResult(result, "getControllerVibrationState")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 1761
-libovr.ovr_TestBoundary.restype = Result
-libovr.ovr_TestBoundary.argtypes = [Session, TrackedDeviceType, BoundaryType, POINTER(BoundaryTestResult)]
+libovr.prototype("ovr_TestBoundary", Result, [Session, TrackedDeviceType, BoundaryType, POINTER(BoundaryTestResult)])
 def testBoundary(session, deviceBitmask, boundaryType):
     """
     Tests collision/proximity of position tracked devices (e.g. HMD and/or Touch) against the
@@ -2372,13 +2603,13 @@ def testBoundary(session, deviceBitmask, boundaryType):
     """
     outTestResult = BoundaryTestResult()
     result = libovr.ovr_TestBoundary(session, deviceBitmask, boundaryType, byref(outTestResult))
-    _checkResult(result, "testBoundary")
+    if result < 0:
+        _checkResult(result, "testBoundary")
     return outTestResult
 
 
 # Translated from header file OVR_CAPI.h line 1788
-libovr.ovr_TestBoundaryPoint.restype = Result
-libovr.ovr_TestBoundaryPoint.argtypes = [Session, POINTER(Vector3f), BoundaryType, POINTER(BoundaryTestResult)]
+libovr.prototype("ovr_TestBoundaryPoint", Result, [Session, POINTER(Vector3f), BoundaryType, POINTER(BoundaryTestResult)])
 def testBoundaryPoint(session, point, singleBoundaryType):
     """
     Tests collision/proximity of a 3D point against the Boundary System.
@@ -2399,13 +2630,13 @@ def testBoundaryPoint(session, point, singleBoundaryType):
     """
     outTestResult = BoundaryTestResult()
     result = libovr.ovr_TestBoundaryPoint(session, byref(point), singleBoundaryType, byref(outTestResult))
-    _checkResult(result, "testBoundaryPoint")
+    if result < 0:
+        _checkResult(result, "testBoundaryPoint")
     return outTestResult
 
 
 # Translated from header file OVR_CAPI.h line 1811
-libovr.ovr_SetBoundaryLookAndFeel.restype = Result
-libovr.ovr_SetBoundaryLookAndFeel.argtypes = [Session, POINTER(BoundaryLookAndFeel)]
+libovr.prototype("ovr_SetBoundaryLookAndFeel", Result, [Session, POINTER(BoundaryLookAndFeel)])
 def setBoundaryLookAndFeel(session, lookAndFeel):
     """
     Sets the look and feel of the Boundary System.
@@ -2416,13 +2647,13 @@ def setBoundaryLookAndFeel(session, lookAndFeel):
     \see ovrBoundaryLookAndFeel
     """
     result = libovr.ovr_SetBoundaryLookAndFeel(session, byref(lookAndFeel))
-    _checkResult(result, "setBoundaryLookAndFeel")
+    if result < 0:
+        _checkResult(result, "setBoundaryLookAndFeel")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 1821
-libovr.ovr_ResetBoundaryLookAndFeel.restype = Result
-libovr.ovr_ResetBoundaryLookAndFeel.argtypes = [Session]
+libovr.prototype("ovr_ResetBoundaryLookAndFeel", Result, [Session])
 def resetBoundaryLookAndFeel(session):
     """
     Resets the look and feel of the Boundary System to its default state.
@@ -2432,14 +2663,14 @@ def resetBoundaryLookAndFeel(session):
     \see ovrBoundaryLookAndFeel
     """
     result = libovr.ovr_ResetBoundaryLookAndFeel(session)
-    _checkResult(result, "resetBoundaryLookAndFeel")
+    if result < 0:
+        _checkResult(result, "resetBoundaryLookAndFeel")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 1829
-libovr.ovr_GetBoundaryGeometry.restype = Result
-libovr.ovr_GetBoundaryGeometry.argtypes = [Session, BoundaryType, POINTER(Vector3f), POINTER(c_int)]
-def getBoundaryGeometry(session, boundaryType):
+libovr.prototype("ovr_GetBoundaryGeometry", Result, [Session, BoundaryType, POINTER(Vector3f), POINTER(c_int)])
+def getBoundaryGeometry(session, boundaryType, outFloorPoints=None):
     """
     Gets the geometry of the Boundary System's "play area" or "outer boundary" as 3D floor points.
     
@@ -2453,17 +2684,26 @@ def getBoundaryGeometry(session, boundaryType):
         - ovrSuccess: The call succeeded and a result was returned.
         - ovrSuccess_BoundaryInvalid: The call succeeded but the result is not a valid boundary due
         to not being set up.
+    
+    Returns (outFloorPoints, outFloorPointsCount). The number of points is queried first, then
+    the points are filled into outFloorPoints, an array of Vector3f that is reused when it is
+    long enough, and else allocated. Without a valid boundary the count is 0.
     """
-    outFloorPoints = Vector3f()
     outFloorPointsCount = c_int()
-    result = libovr.ovr_GetBoundaryGeometry(session, boundaryType, byref(outFloorPoints), byref(outFloorPointsCount))
-    _checkResult(result, "getBoundaryGeometry")
+    result = libovr.ovr_GetBoundaryGeometry(session, boundaryType, None, byref(outFloorPointsCount))
+    if result >= 0 and outFloorPointsCount.value > 0:
+        if outFloorPoints is None or len(outFloorPoints) < outFloorPointsCount.value:
+            outFloorPoints = (Vector3f * outFloorPointsCount.value)()
+        result = libovr.ovr_GetBoundaryGeometry(session, boundaryType, outFloorPoints, byref(outFloorPointsCount))
+    if result < 0:
+        _checkResult(result, "getBoundaryGeometry")
+    if outFloorPoints is None:
+        outFloorPoints = (Vector3f * 0)()
     return outFloorPoints, outFloorPointsCount
 
 
 # Translated from header file OVR_CAPI.h line 1849
-libovr.ovr_GetBoundaryDimensions.restype = Result
-libovr.ovr_GetBoundaryDimensions.argtypes = [Session, BoundaryType, POINTER(Vector3f)]
+libovr.prototype("ovr_GetBoundaryDimensions", Result, [Session, BoundaryType, POINTER(Vector3f)])
 def getBoundaryDimensions(session, boundaryType):
     """
     Gets the dimension of the Boundary System's "play area" or "outer boundary".
@@ -2480,13 +2720,13 @@ def getBoundaryDimensions(session, boundaryType):
     """
     outDimensions = Vector3f()
     result = libovr.ovr_GetBoundaryDimensions(session, boundaryType, byref(outDimensions))
-    _checkResult(result, "getBoundaryDimensions")
+    if result < 0:
+        _checkResult(result, "getBoundaryDimensions")
     return outDimensions
 
 
 # Translated from header file OVR_CAPI.h line 1867
-libovr.ovr_GetBoundaryVisible.restype = Result
-libovr.ovr_GetBoundaryVisible.argtypes = [Session, POINTER(Bool)]
+libovr.prototype("ovr_GetBoundaryVisible", Result, [Session, POINTER(Bool)])
 def getBoundaryVisible(session):
     """
     Returns if the boundary is currently visible.
@@ -2504,13 +2744,13 @@ def getBoundaryVisible(session):
     """
     outIsVisible = Bool()
     result = libovr.ovr_GetBoundaryVisible(session, byref(outIsVisible))
-    _checkResult(result, "getBoundaryVisible")
+    if result < 0:
+        _checkResult(result, "getBoundaryVisible")
     return outIsVisible
 
 
 # Translated from header file OVR_CAPI.h line 1882
-libovr.ovr_RequestBoundaryVisible.restype = Result
-libovr.ovr_RequestBoundaryVisible.argtypes = [Session, Bool]
+libovr.prototype("ovr_RequestBoundaryVisible", Result, [Session, Bool])
 def requestBoundaryVisible(session, visible):
     """
     Requests boundary to be visible.
@@ -2521,7 +2761,8 @@ def requestBoundaryVisible(session, visible):
     \return Returns ovrSuccess upon success.
     """
     result = libovr.ovr_RequestBoundaryVisible(session, toOvrBool(visible))
-    _checkResult(result, "requestBoundaryVisible")
+    if result < 0:
+        _checkResult(result, "requestBoundaryVisible")
     return result
 
 
@@ -2799,8 +3040,7 @@ class Layer_Union(Union):
 
 
 # Translated from header file OVR_CAPI.h line 2128
-libovr.ovr_GetTextureSwapChainLength.restype = Result
-libovr.ovr_GetTextureSwapChainLength.argtypes = [Session, TextureSwapChain, POINTER(c_int)]
+libovr.prototype("ovr_GetTextureSwapChainLength", Result, [Session, TextureSwapChain, POINTER(c_int)])
 def getTextureSwapChainLength(session, chain):
     """
     Gets the number of buffers in an ovrTextureSwapChain.
@@ -2815,13 +3055,13 @@ def getTextureSwapChainLength(session, chain):
     """
     out_Length = c_int()
     result = libovr.ovr_GetTextureSwapChainLength(session, chain, byref(out_Length))
-    _checkResult(result, "getTextureSwapChainLength")
+    if result < 0:
+        _checkResult(result, "getTextureSwapChainLength")
     return out_Length
 
 
 # Translated from header file OVR_CAPI.h line 2141
-libovr.ovr_GetTextureSwapChainCurrentIndex.restype = Result
-libovr.ovr_GetTextureSwapChainCurrentIndex.argtypes = [Session, TextureSwapChain, POINTER(c_int)]
+libovr.prototype("ovr_GetTextureSwapChainCurrentIndex", Result, [Session, TextureSwapChain, POINTER(c_int)])
 def getTextureSwapChainCurrentIndex(session, chain):
     """
     Gets the current index in an ovrTextureSwapChain.
@@ -2836,13 +3076,13 @@ def getTextureSwapChainCurrentIndex(session, chain):
     """
     out_Index = c_int()
     result = libovr.ovr_GetTextureSwapChainCurrentIndex(session, chain, byref(out_Index))
-    _checkResult(result, "getTextureSwapChainCurrentIndex")
+    if result < 0:
+        _checkResult(result, "getTextureSwapChainCurrentIndex")
     return out_Index
 
 
 # Translated from header file OVR_CAPI.h line 2154
-libovr.ovr_GetTextureSwapChainDesc.restype = Result
-libovr.ovr_GetTextureSwapChainDesc.argtypes = [Session, TextureSwapChain, POINTER(TextureSwapChainDesc)]
+libovr.prototype("ovr_GetTextureSwapChainDesc", Result, [Session, TextureSwapChain, POINTER(TextureSwapChainDesc)])
 def getTextureSwapChainDesc(session, chain):
     """
     Gets the description of the buffers in an ovrTextureSwapChain
@@ -2858,13 +3098,13 @@ def getTextureSwapChainDesc(session, chain):
     """
     out_Desc = TextureSwapChainDesc()
     result = libovr.ovr_GetTextureSwapChainDesc(session, chain, byref(out_Desc))
-    _checkResult(result, "getTextureSwapChainDesc")
+    if result < 0:
+        _checkResult(result, "getTextureSwapChainDesc")
     return out_Desc
 
 
 # Translated from header file OVR_CAPI.h line 2171
-libovr.ovr_CommitTextureSwapChain.restype = Result
-libovr.ovr_CommitTextureSwapChain.argtypes = [Session, TextureSwapChain]
+libovr.prototype("ovr_CommitTextureSwapChain", Result, [Session, TextureSwapChain])
 def commitTextureSwapChain(session, chain):
     """
     Commits any pending changes to an ovrTextureSwapChain, and advances its current index
@@ -2886,13 +3126,13 @@ def commitTextureSwapChain(session, chain):
     \see ovr_CreateTextureSwapChainDX, ovr_CreateTextureSwapChainGL
     """
     result = libovr.ovr_CommitTextureSwapChain(session, chain)
-    _checkResult(result, "commitTextureSwapChain")
+    if result < 0:
+        _checkResult(result, "commitTextureSwapChain")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 2192
-libovr.ovr_DestroyTextureSwapChain.restype = None
-libovr.ovr_DestroyTextureSwapChain.argtypes = [Session, TextureSwapChain]
+libovr.prototype("ovr_DestroyTextureSwapChain", None, [Session, TextureSwapChain])
 def destroyTextureSwapChain(session, chain):
     """
     Destroys an ovrTextureSwapChain and frees all the resources associated with it.
@@ -2907,8 +3147,7 @@ def destroyTextureSwapChain(session, chain):
 
 
 # Translated from header file OVR_CAPI.h line 2207
-libovr.ovr_DestroyMirrorTexture.restype = None
-libovr.ovr_DestroyMirrorTexture.argtypes = [Session, MirrorTexture]
+libovr.prototype("ovr_DestroyMirrorTexture", None, [Session, MirrorTexture])
 def destroyMirrorTexture(session, mirrorTexture):
     """
     Destroys a mirror texture previously created by one of the mirror texture creation functions.
@@ -2923,8 +3162,7 @@ def destroyMirrorTexture(session, mirrorTexture):
 
 
 # Translated from header file OVR_CAPI.h line 2218
-libovr.ovr_GetFovTextureSize.restype = Sizei
-libovr.ovr_GetFovTextureSize.argtypes = [Session, EyeType, FovPort, c_float]
+libovr.prototype("ovr_GetFovTextureSize", Sizei, [Session, EyeType, FovPort, c_float])
 def getFovTextureSize(session, eye, fov, pixelsPerDisplayPixel):
     """
     Calculates the recommended viewport size for rendering a given eye within the HMD
@@ -2958,8 +3196,7 @@ def getFovTextureSize(session, eye, fov, pixelsPerDisplayPixel):
 
 
 # Translated from header file OVR_CAPI.h line 2251
-libovr.ovr_GetRenderDesc2.restype = EyeRenderDesc
-libovr.ovr_GetRenderDesc2.argtypes = [Session, EyeType, FovPort]
+libovr.prototype("ovr_GetRenderDesc2", EyeRenderDesc, [Session, EyeType, FovPort])
 def getRenderDesc(session, eyeType, fov):
     """
     Computes the distortion viewport, view adjust, and other rendering parameters for
@@ -2977,8 +3214,7 @@ def getRenderDesc(session, eyeType, fov):
     return result
 
 
-libovr.ovr_WaitToBeginFrame.restype = Result
-libovr.ovr_WaitToBeginFrame.argtypes = [Session, c_longlong]
+libovr.prototype("ovr_WaitToBeginFrame", Result, [Session, c_longlong])
 def waitToBeginFrame(session, frameIndex):
     """
     Waits until surfaces are available and it is time to begin rendering the frame.  Must be
@@ -3005,12 +3241,12 @@ def waitToBeginFrame(session, frameIndex):
     \see ovr_BeginFrame, ovr_EndFrame, ovr_GetSessionStatus
     """
     result = libovr.ovr_WaitToBeginFrame(session, frameIndex)
-    _checkResult(result, "waitToBeginFrame")
+    if result < 0:
+        _checkResult(result, "waitToBeginFrame")
     return result
 
 
-libovr.ovr_BeginFrame.restype = Result
-libovr.ovr_BeginFrame.argtypes = [Session, c_longlong]
+libovr.prototype("ovr_BeginFrame", Result, [Session, c_longlong])
 def beginFrame(session, frameIndex):
     """
     Called from render thread before application begins rendering.  Must be called after
@@ -3037,8 +3273,7 @@ def beginFrame(session, frameIndex):
     return result
 
 
-libovr.ovr_EndFrame.restype = Result
-libovr.ovr_EndFrame.argtypes = [Session, c_longlong, POINTER(ViewScaleDesc), POINTER(POINTER(LayerHeader)), c_uint]
+libovr.prototype("ovr_EndFrame", Result, [Session, c_longlong, POINTER(ViewScaleDesc), POINTER(POINTER(LayerHeader)), c_uint])
 def endFrame(session, frameIndex, viewScaleDesc, layerPtrList):
     """
     Called from render thread after application has finished rendering.  Must be called after
@@ -3100,16 +3335,16 @@ def endFrame(session, frameIndex, viewScaleDesc, layerPtrList):
     \see ovr_WaitToBeginFrame, ovr_BeginFrame, ovrViewScaleDesc, ovrLayerHeader
     """
     layerCount = len(layerPtrList)
-    layerPtrList = (POINTER(LayerHeader) * layerCount)(*[ctypes.pointer(i) for i in layerPtrList])
+    layerPtrList = layerPtrArray(layerPtrList)
     result = libovr.ovr_EndFrame(session, frameIndex, byref(viewScaleDesc), byref(layerPtrList), layerCount)
-    _checkResult(result, "endFrame")
+    if result < 0:
+        _checkResult(result, "endFrame")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 2265
-libovr.ovr_SubmitFrame2.restype = Result
-libovr.ovr_SubmitFrame2.argtypes = [Session, c_longlong, POINTER(ViewScaleDesc), POINTER(POINTER(LayerHeader)), c_uint]
-def submitFrame(session, frameIndex, viewScaleDesc, layerPtrList):
+libovr.prototype("ovr_SubmitFrame2", Result, [Session, c_longlong, POINTER(ViewScaleDesc), POINTER(POINTER(LayerHeader)), c_uint])
+def submitFrame(session, frameIndex, viewScaleDesc, layerPtrList, layerCount=None):
     """
     Submits layers for distortion and display.
     
@@ -3185,10 +3420,12 @@ def submitFrame(session, frameIndex, viewScaleDesc, layerPtrList):
     
     \see ovr_GetPredictedDisplayTime, ovrViewScaleDesc, ovrLayerHeader, ovr_GetSessionStatus
     """
-    layerCount = len(layerPtrList)
-    layerPtrList = (POINTER(LayerHeader) * layerCount)(*[ctypes.pointer(i) for i in layerPtrList])
+    if layerCount is None:
+        layerCount = len(layerPtrList)
+    layerPtrList = layerPtrArray(layerPtrList)
     result = libovr.ovr_SubmitFrame2(session, frameIndex, byref(viewScaleDesc), byref(layerPtrList), layerCount)
-    _checkResult(result, "submitFrame")
+    if result < 0:
+        _checkResult(result, "submitFrame")
     return result
 
 
@@ -3342,9 +3579,8 @@ class PerfStats(Structure):
 
 
 # Translated from header file OVR_CAPI.h line 2512
-libovr.ovr_GetPerfStats.restype = Result
-libovr.ovr_GetPerfStats.argtypes = [Session, POINTER(PerfStats)]
-def getPerfStats(session):
+libovr.prototype("ovr_GetPerfStats", Result, [Session, POINTER(PerfStats)])
+def getPerfStats(session, outStats=None):
     """
     Retrieves performance stats for the VR app as well as the SDK compositor.
     
@@ -3370,21 +3606,23 @@ def getPerfStats(session):
     for CV1), calling it at a higher rate than that would be unnecessary.
     
     \param[in] session Specifies an ovrSession previously returned by ovr_Create.
-    \param[out] outStats Contains the performance stats for the application and SDK compositor
+    \param[out] outStats Contains the performance stats for the application and SDK compositor.
+                Pass a PerfStats to fill it in place instead of allocating a new one.
     \return Returns an ovrResult for which OVR_SUCCESS(result) is false upon error and true
             upon success.
     
     \see ovrPerfStats, ovrPerfStatsPerCompositorFrame, ovr_ResetPerfStats
     """
-    outStats = PerfStats()
+    if outStats is None:
+        outStats = PerfStats()
     result = libovr.ovr_GetPerfStats(session, byref(outStats))
-    _checkResult(result, "getPerfStats")
+    if result < 0:
+        _checkResult(result, "getPerfStats")
     return outStats
 
 
 # Translated from header file OVR_CAPI.h line 2544
-libovr.ovr_ResetPerfStats.restype = Result
-libovr.ovr_ResetPerfStats.argtypes = [Session]
+libovr.prototype("ovr_ResetPerfStats", Result, [Session])
 def resetPerfStats(session):
     """
     Resets the accumulated stats reported in each ovrPerfStatsPerCompositorFrame back to zero.
@@ -3400,13 +3638,13 @@ def resetPerfStats(session):
     \see ovrPerfStats, ovrPerfStatsPerCompositorFrame, ovr_GetPerfStats
     """
     result = libovr.ovr_ResetPerfStats(session)
-    _checkResult(result, "resetPerfStats")
+    if result < 0:
+        _checkResult(result, "resetPerfStats")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 2558
-libovr.ovr_GetPredictedDisplayTime.restype = c_double
-libovr.ovr_GetPredictedDisplayTime.argtypes = [Session, c_longlong]
+libovr.prototype("ovr_GetPredictedDisplayTime", c_double, [Session, c_longlong])
 def getPredictedDisplayTime(session, frameIndex):
     """
     Gets the time of the specified frame midpoint.
@@ -3436,7 +3674,7 @@ def getPredictedDisplayTime(session, frameIndex):
 
 
 # Translated from header file OVR_CAPI.h line 2582
-libovr.ovr_GetTimeInSeconds.restype = c_double
+libovr.prototype("ovr_GetTimeInSeconds", c_double)
 def getTimeInSeconds():
     """
     Returns global, absolute high-resolution time in seconds.
@@ -3517,8 +3755,7 @@ DebugHudStereo_Count = DebugHudStereo_CrosshairAtInfinity + 1
 
 
 # Translated from header file OVR_CAPI.h line 2676
-libovr.ovr_GetExternalCameras.restype = Result
-libovr.ovr_GetExternalCameras.argtypes = [Session, POINTER(ExternalCamera), POINTER(c_uint)]
+libovr.prototype("ovr_GetExternalCameras", Result, [Session, POINTER(ExternalCamera), POINTER(c_uint)])
 def getExternalCameras(session, cameras, inoutCameraCount):
     """
     Returns the number of camera properties of all cameras
@@ -3530,13 +3767,13 @@ def getExternalCameras(session, cameras, inoutCameraCount):
                ovrError_NoExternalCameraInfo if there is not any eternal camera information.
     """
     result = libovr.ovr_GetExternalCameras(session, byref(cameras), byref(inoutCameraCount))
-    _checkResult(result, "getExternalCameras")
+    if result < 0:
+        _checkResult(result, "getExternalCameras")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 2689
-libovr.ovr_SetExternalCameraProperties.restype = Result
-libovr.ovr_SetExternalCameraProperties.argtypes = [Session, c_char_p, POINTER(CameraIntrinsics), POINTER(CameraExtrinsics)]
+libovr.prototype("ovr_SetExternalCameraProperties", Result, [Session, c_char_p, POINTER(CameraIntrinsics), POINTER(CameraExtrinsics)])
 def setExternalCameraProperties(session, name, intrinsics, extrinsics):
     """
     Sets the camera intrinsics and/or extrinsics stored for the cameraName camera
@@ -3549,13 +3786,13 @@ def setExternalCameraProperties(session, name, intrinsics, extrinsics):
     \return Returns ovrSuccess or an ovrError code
     """
     result = libovr.ovr_SetExternalCameraProperties(session, name, byref(intrinsics), byref(extrinsics))
-    _checkResult(result, "setExternalCameraProperties")
+    if result < 0:
+        _checkResult(result, "setExternalCameraProperties")
     return result
 
 
 # Translated from header file OVR_CAPI.h line 2718
-libovr.ovr_GetBool.restype = Bool
-libovr.ovr_GetBool.argtypes = [Session, c_char_p, Bool]
+libovr.prototype("ovr_GetBool", Bool, [Session, c_char_p, Bool])
 def getBool(session, propertyName, defaultVal):
     """
     Reads a boolean property.
@@ -3571,8 +3808,7 @@ def getBool(session, propertyName, defaultVal):
 
 
 # Translated from header file OVR_CAPI.h line 2728
-libovr.ovr_SetBool.restype = Bool
-libovr.ovr_SetBool.argtypes = [Session, c_char_p, Bool]
+libovr.prototype("ovr_SetBool", Bool, [Session, c_char_p, Bool])
 def setBool(session, propertyName, value):
     """
     Writes or creates a boolean property.
@@ -3590,8 +3826,7 @@ def setBool(session, propertyName, value):
 
 
 # Translated from header file OVR_CAPI.h line 2740
-libovr.ovr_GetInt.restype = c_int
-libovr.ovr_GetInt.argtypes = [Session, c_char_p, c_int]
+libovr.prototype("ovr_GetInt", c_int, [Session, c_char_p, c_int])
 def getInt(session, propertyName, defaultVal):
     """
     Reads an integer property.
@@ -3607,8 +3842,7 @@ def getInt(session, propertyName, defaultVal):
 
 
 # Translated from header file OVR_CAPI.h line 2749
-libovr.ovr_SetInt.restype = Bool
-libovr.ovr_SetInt.argtypes = [Session, c_char_p, c_int]
+libovr.prototype("ovr_SetInt", Bool, [Session, c_char_p, c_int])
 def setInt(session, propertyName, value):
     """
     Writes or creates an integer property.
@@ -3626,8 +3860,7 @@ def setInt(session, propertyName, value):
 
 
 # Translated from header file OVR_CAPI.h line 2760
-libovr.ovr_GetFloat.restype = c_float
-libovr.ovr_GetFloat.argtypes = [Session, c_char_p, c_float]
+libovr.prototype("ovr_GetFloat", c_float, [Session, c_char_p, c_float])
 def getFloat(session, propertyName, defaultVal):
     """
     Reads a float property.
@@ -3643,8 +3876,7 @@ def getFloat(session, propertyName, defaultVal):
 
 
 # Translated from header file OVR_CAPI.h line 2770
-libovr.ovr_SetFloat.restype = Bool
-libovr.ovr_SetFloat.argtypes = [Session, c_char_p, c_float]
+libovr.prototype("ovr_SetFloat", Bool, [Session, c_char_p, c_float])
 def setFloat(session, propertyName, value):
     """
     Writes or creates a float property.
@@ -3661,8 +3893,7 @@ def setFloat(session, propertyName, value):
 
 
 # Translated from header file OVR_CAPI.h line 2781
-libovr.ovr_GetFloatArray.restype = c_uint
-libovr.ovr_GetFloatArray.argtypes = [Session, c_char_p, POINTER(c_float), c_uint]
+libovr.prototype("ovr_GetFloatArray", c_uint, [Session, c_char_p, POINTER(c_float), c_uint])
 def getFloatArray(session, propertyName, values, valuesCapacity):
     """
     Reads a float array property.
@@ -3678,8 +3909,7 @@ def getFloatArray(session, propertyName, values, valuesCapacity):
 
 
 # Translated from header file OVR_CAPI.h line 2795
-libovr.ovr_SetFloatArray.restype = Bool
-libovr.ovr_SetFloatArray.argtypes = [Session, c_char_p, POINTER(c_float), c_uint]
+libovr.prototype("ovr_SetFloatArray", Bool, [Session, c_char_p, POINTER(c_float), c_uint])
 def setFloatArray(session, propertyName, values, valuesSize):
     """
     Writes or creates a float array property.
@@ -3696,8 +3926,7 @@ def setFloatArray(session, propertyName, values, valuesSize):
 
 
 # Translated from header file OVR_CAPI.h line 2810
-libovr.ovr_GetString.restype = c_char_p
-libovr.ovr_GetString.argtypes = [Session, c_char_p, c_char_p]
+libovr.prototype("ovr_GetString", c_char_p, [Session, c_char_p, c_char_p])
 def getString(session, propertyName, defaultVal):
     """
     Reads a string property.
@@ -3715,8 +3944,7 @@ def getString(session, propertyName, defaultVal):
 
 
 # Translated from header file OVR_CAPI.h line 2822
-libovr.ovr_SetString.restype = Bool
-libovr.ovr_SetString.argtypes = [Session, c_char_p, c_char_p]
+libovr.prototype("ovr_SetString", Bool, [Session, c_char_p, c_char_p])
 def setString(session, propertyName, value):
     """
     Writes or creates a string property.
@@ -3739,8 +3967,7 @@ def setString(session, propertyName, value):
 
 
 # Translated from header file OVR_CAPI_GL.h line 13
-libovr.ovr_CreateTextureSwapChainGL.restype = Result
-libovr.ovr_CreateTextureSwapChainGL.argtypes = [Session, POINTER(TextureSwapChainDesc), POINTER(TextureSwapChain)]
+libovr.prototype("ovr_CreateTextureSwapChainGL", Result, [Session, POINTER(TextureSwapChainDesc), POINTER(TextureSwapChain)])
 def createTextureSwapChainGL(session, desc):
     """
     Creates a TextureSwapChain suitable for use with OpenGL.
@@ -3776,13 +4003,13 @@ def createTextureSwapChainGL(session, desc):
     """
     out_TextureSwapChain = TextureSwapChain()
     result = libovr.ovr_CreateTextureSwapChainGL(session, byref(desc), byref(out_TextureSwapChain))
-    _checkResult(result, "createTextureSwapChainGL")
+    if result < 0:
+        _checkResult(result, "createTextureSwapChainGL")
     return out_TextureSwapChain
 
 
 # Translated from header file OVR_CAPI_GL.h line 50
-libovr.ovr_GetTextureSwapChainBufferGL.restype = Result
-libovr.ovr_GetTextureSwapChainBufferGL.argtypes = [Session, TextureSwapChain, c_int, POINTER(c_uint)]
+libovr.prototype("ovr_GetTextureSwapChainBufferGL", Result, [Session, TextureSwapChain, c_int, POINTER(c_uint)])
 def getTextureSwapChainBufferGL(session, chain, index):
     """
     Get a specific buffer within the chain as a GL texture name
@@ -3802,13 +4029,13 @@ def getTextureSwapChainBufferGL(session, chain, index):
     """
     out_TexId = c_uint()
     result = libovr.ovr_GetTextureSwapChainBufferGL(session, chain, index, byref(out_TexId))
-    _checkResult(result, "getTextureSwapChainBufferGL")
+    if result < 0:
+        _checkResult(result, "getTextureSwapChainBufferGL")
     return out_TexId
 
 
 # Translated from header file OVR_CAPI_GL.h line 72
-libovr.ovr_CreateMirrorTextureGL.restype = Result
-libovr.ovr_CreateMirrorTextureGL.argtypes = [Session, POINTER(MirrorTextureDesc), POINTER(MirrorTexture)]
+libovr.prototype("ovr_CreateMirrorTextureGL", Result, [Session, POINTER(MirrorTextureDesc), POINTER(MirrorTexture)])
 def createMirrorTextureGL(session, desc):
     """
     Creates a Mirror Texture which is auto-refreshed to mirror Rift contents produced by this
@@ -3840,13 +4067,13 @@ def createMirrorTextureGL(session, desc):
     """
     out_MirrorTexture = MirrorTexture()
     result = libovr.ovr_CreateMirrorTextureGL(session, byref(desc), byref(out_MirrorTexture))
-    _checkResult(result, "createMirrorTextureGL")
+    if result < 0:
+        _checkResult(result, "createMirrorTextureGL")
     return out_MirrorTexture
 
 
 # Translated from header file OVR_CAPI_GL.h line 105
-libovr.ovr_GetMirrorTextureBufferGL.restype = Result
-libovr.ovr_GetMirrorTextureBufferGL.argtypes = [Session, MirrorTexture, POINTER(c_uint)]
+libovr.prototype("ovr_GetMirrorTextureBufferGL", Result, [Session, MirrorTexture, POINTER(c_uint)])
 def getMirrorTextureBufferGL(session, mirrorTexture):
     """
     Get a the underlying buffer as a GL texture name
@@ -3861,7 +4088,8 @@ def getMirrorTextureBufferGL(session, mirrorTexture):
     """
     out_TexId = c_uint()
     result = libovr.ovr_GetMirrorTextureBufferGL(session, mirrorTexture, byref(out_TexId))
-    _checkResult(result, "getMirrorTextureBufferGL")
+    if result < 0:
+        _checkResult(result, "getMirrorTextureBufferGL")
     return out_TexId
 
 
@@ -3974,8 +4202,7 @@ class HapticsClip(Structure):
 
 
 # Translated from header file OVR_CAPI_Util.h line 105
-libovr.ovr_Detect.restype = DetectResult
-libovr.ovr_Detect.argtypes = [c_int]
+libovr.prototype("ovr_Detect", DetectResult, [c_int])
 def detect(timeoutMilliseconds):
     """
     Detects Oculus Runtime and Device Status
@@ -3999,8 +4226,7 @@ HMD_CONNECTED_EVENT_NAME = b"OculusHMDConnected"
 
 
 # Translated from header file OVR_CAPI_Util.h line 125
-libovr.ovrMatrix4f_Projection.restype = Matrix4f
-libovr.ovrMatrix4f_Projection.argtypes = [FovPort, c_float, c_float, c_uint]
+libovr.prototype("ovrMatrix4f_Projection", Matrix4f, [FovPort, c_float, c_float, c_uint])
 def matrix4f_Projection(fov, znear, zfar, projectionModFlags):
     """
     Used to generate projection from ovrEyeDesc::Fov.
@@ -4019,8 +4245,7 @@ def matrix4f_Projection(fov, znear, zfar, projectionModFlags):
 
 
 # Translated from header file OVR_CAPI_Util.h line 139
-libovr.ovrTimewarpProjectionDesc_FromProjection.restype = TimewarpProjectionDesc
-libovr.ovrTimewarpProjectionDesc_FromProjection.argtypes = [Matrix4f, c_uint]
+libovr.prototype("ovrTimewarpProjectionDesc_FromProjection", TimewarpProjectionDesc, [Matrix4f, c_uint])
 def timewarpProjectionDesc_FromProjection(projection, projectionModFlags):
     """
     Extracts the required data from the result of ovrMatrix4f_Projection.
@@ -4036,8 +4261,7 @@ def timewarpProjectionDesc_FromProjection(projection, projectionModFlags):
 
 
 # Translated from header file OVR_CAPI_Util.h line 150
-libovr.ovrMatrix4f_OrthoSubProjection.restype = Matrix4f
-libovr.ovrMatrix4f_OrthoSubProjection.argtypes = [Matrix4f, Vector2f, c_float, c_float]
+libovr.prototype("ovrMatrix4f_OrthoSubProjection", Matrix4f, [Matrix4f, Vector2f, c_float, c_float])
 def matrix4f_OrthoSubProjection(projection, orthoScale, orthoDistance, HmdToEyeOffsetX):
     """
     Generates an orthographic sub-projection.
@@ -4056,9 +4280,8 @@ def matrix4f_OrthoSubProjection(projection, orthoScale, orthoDistance, HmdToEyeO
 
 
 # Translated from header file OVR_CAPI_Util.h line 168
-libovr.ovr_CalcEyePoses.restype = None
-libovr.ovr_CalcEyePoses.argtypes = [Posef, Vector3f * 2, Posef * 2]
-def calcEyePoses(headPose, hmdToEyeOffset):
+libovr.prototype("ovr_CalcEyePoses", None, [Posef, Vector3f * 2, Posef * 2])
+def calcEyePoses(headPose, hmdToEyeOffset, outEyePoses=None):
     """
     Computes offset eye poses based on headPose returned by ovrTrackingState.
     
@@ -4068,15 +4291,16 @@ def calcEyePoses(headPose, hmdToEyeOffset):
                of the two vectors for both eyes.
     \param[out] outEyePoses If outEyePoses are used for rendering, they should be passed to
                 ovr_SubmitFrame in ovrLayerEyeFov::RenderPose or ovrLayerEyeFovDepth::RenderPose.
+                Allocated and returned when omitted.
     """
-    outEyePoses = (Posef * Eye_Count)()
+    if outEyePoses is None:
+        outEyePoses = (Posef * Eye_Count)()
     libovr.ovr_CalcEyePoses(headPose, hmdToEyeOffset, outEyePoses)
     return outEyePoses
 
 
 # Translated from header file OVR_CAPI_Util.h line 180
-libovr.ovr_GetEyePoses.restype = None
-libovr.ovr_GetEyePoses.argtypes = [Session, c_longlong, Bool, Vector3f * 2, Posef * 2, POINTER(c_double)]
+libovr.prototype("ovr_GetEyePoses", None, [Session, c_longlong, Bool, Vector3f * 2, Posef * 2, POINTER(c_double)])
 def getEyePoses(session, frameIndex, latencyMarker, hmdToEyeOffset, outEyePoses):
     """
     Returns the predicted head pose in outHmdTrackingState and offset eye poses in outEyePoses.
@@ -4106,8 +4330,7 @@ def getEyePoses(session, frameIndex, latencyMarker, hmdToEyeOffset, outEyePoses)
 
 
 # Translated from header file OVR_CAPI_Util.h line 210
-libovr.ovrPosef_FlipHandedness.restype = None
-libovr.ovrPosef_FlipHandedness.argtypes = [POINTER(Posef), POINTER(Posef)]
+libovr.prototype("ovrPosef_FlipHandedness", None, [POINTER(Posef), POINTER(Posef)])
 def posef_FlipHandedness(inPose):
     """
     Tracking poses provided by the SDK come in a right-handed coordinate system. If an application
@@ -4127,8 +4350,7 @@ def posef_FlipHandedness(inPose):
 
 
 # Translated from header file OVR_CAPI_Util.h line 223
-libovr.ovr_ReadWavFromBuffer.restype = Result
-libovr.ovr_ReadWavFromBuffer.argtypes = [POINTER(AudioChannelData), c_void_p, c_int, c_int]
+libovr.prototype("ovr_ReadWavFromBuffer", Result, [POINTER(AudioChannelData), c_void_p, c_int, c_int])
 def readWavFromBuffer(inputData, dataSizeInBytes, stereoChannelToUse):
     """
     Reads an audio channel from Wav (Waveform Audio File) data.
@@ -4145,13 +4367,13 @@ def readWavFromBuffer(inputData, dataSizeInBytes, stereoChannelToUse):
     """
     outAudioChannel = AudioChannelData()
     result = libovr.ovr_ReadWavFromBuffer(byref(outAudioChannel), inputData, dataSizeInBytes, stereoChannelToUse)
-    _checkResult(result, "readWavFromBuffer")
+    if result < 0:
+        _checkResult(result, "readWavFromBuffer")
     return outAudioChannel
 
 
 # Translated from header file OVR_CAPI_Util.h line 242
-libovr.ovr_GenHapticsFromAudioData.restype = Result
-libovr.ovr_GenHapticsFromAudioData.argtypes = [POINTER(HapticsClip), POINTER(AudioChannelData), HapticsGenMode]
+libovr.prototype("ovr_GenHapticsFromAudioData", Result, [POINTER(HapticsClip), POINTER(AudioChannelData), HapticsGenMode])
 def genHapticsFromAudioData(audioChannel, genMode):
     """
     Generates playable Touch Haptics data from an audio channel.
@@ -4162,13 +4384,13 @@ def genHapticsFromAudioData(audioChannel, genMode):
     """
     outHapticsClip = HapticsClip()
     result = libovr.ovr_GenHapticsFromAudioData(byref(outHapticsClip), byref(audioChannel), genMode)
-    _checkResult(result, "genHapticsFromAudioData")
+    if result < 0:
+        _checkResult(result, "genHapticsFromAudioData")
     return outHapticsClip
 
 
 # Translated from header file OVR_CAPI_Util.h line 254
-libovr.ovr_ReleaseAudioChannelData.restype = None
-libovr.ovr_ReleaseAudioChannelData.argtypes = [POINTER(AudioChannelData)]
+libovr.prototype("ovr_ReleaseAudioChannelData", None, [POINTER(AudioChannelData)])
 def releaseAudioChannelData(audioChannel):
     """
     Releases memory allocated for ovrAudioChannelData. Must be called to avoid memory leak.
@@ -4178,8 +4400,7 @@ def releaseAudioChannelData(audioChannel):
 
 
 # Translated from header file OVR_CAPI_Util.h line 259
-libovr.ovr_ReleaseHapticsClip.restype = None
-libovr.ovr_ReleaseHapticsClip.argtypes = [POINTER(HapticsClip)]
+libovr.prototype("ovr_ReleaseHapticsClip", None, [POINTER(HapticsClip)])
 def releaseHapticsClip(hapticsClip):
     """
     Releases memory allocated for ovrHapticsClip. Must be called to avoid memory leak.
@@ -4191,6 +4412,293 @@ def releaseHapticsClip(hapticsClip):
 ### END Declarations from C header file OVR_CAPI_Util.h ###
 
 
+### BEGIN Error types ###
+
+_errorTypes.update({
+    Error_InvalidSession: InvalidSessionError,
+    Error_NoHmd: NoHmdError,
+    Error_InvalidParameter: InvalidParameterError,
+    Error_InvalidOperation: InvalidOperationError,
+    Error_InsufficientArraySize: InsufficientArraySizeError,
+    Error_LostTracking: LostTrackingError,
+    Error_ServiceConnection: ServiceConnectionError,
+    Error_DisplayLost: DisplayLostError,
+    Error_TextureSwapChainFull: TextureSwapChainFullError,
+    Error_TextureSwapChainInvalid: TextureSwapChainInvalidError,
+    Error_GraphicsDeviceReset: GraphicsDeviceResetError,
+    Error_DisplayRemoved: DisplayRemovedError,
+})
+
+### END Error types ###
+
+
+### BEGIN SDK version deltas ###
+
+# The declarations above follow the SDK 1.69 headers. Runtimes back to SDK 1.16
+# are supported by requesting their own minor version in initialize() and
+# dispatching the functions below to the variants that speak the older entry
+# points and structure layouts. Older runtimes lack more of the entry points
+# and structures declared above than these variants cover; the modules in
+# _legacyModules keep the complete bindings for them.
+
+OLDEST_MINOR_VERSION = 16
+_legacyModules = [ # (oldest minor version, module of the ovr package) for the SDK 1.x runtimes before OLDEST_MINOR_VERSION
+    (3, "_ovr130"), (6, "_ovr160"), (7, "_ovr170"), (8, "_ovr180"), (9, "_ovr190"),
+    (10, "_ovr1101"), (11, "_ovr1110"), (13, "_ovr1130"),
+]
+_legacyPre1Modules = ["_ovr070", "_ovr080"] # for the SDK 0.7 and 0.8 runtimes
+SDK_MINOR_VERSION = MINOR_VERSION # Minor version negotiated with the runtime by initialize()
+
+
+class EyeRenderDescPre117(Structure):
+    "ovrEyeRenderDesc as returned by ovr_GetRenderDesc before SDK 1.17"
+    _pack_ = 4
+    _fields_ = [
+        ("Eye", EyeType),  #< The eye index to which this instance corresponds.
+        ("Fov", FovPort),  #< The field of view.
+        ("DistortedViewport", Recti),  #< Distortion viewport.
+        ("PixelsPerTanAngleAtCenter", Vector2f),  #< How many display pixels will fit in tan(angle) = 1.
+        ("HmdToEyeOffset", Vector3f),  #< Translation of each eye, in meters.
+    ]
+
+    def __repr__(self):
+        return "ovr.EyeRenderDescPre117(%s, %s, %s, %s, %s)" % (self.Eye, self.Fov, self.DistortedViewport, self.PixelsPerTanAngleAtCenter, self.HmdToEyeOffset)
+
+
+class ViewScaleDescPre117(Structure):
+    "ovrViewScaleDesc as taken by ovr_SubmitFrame before SDK 1.17"
+    _pack_ = 4
+    _fields_ = [
+        ("HmdToEyeOffset", Vector3f * Eye_Count),  #< Translation of each eye.
+        ("HmdSpaceToWorldScaleInMeters", c_float),  #< Ratio of viewer units to meter units.
+    ]
+
+    def __repr__(self):
+        return "ovr.ViewScaleDescPre117(%s, %s)" % (self.HmdToEyeOffset, self.HmdSpaceToWorldScaleInMeters)
+
+
+libovr.prototype("ovr_GetRenderDesc", EyeRenderDescPre117, [Session, EyeType, FovPort])
+def getRenderDescPre117(session, eyeType, fov):
+    """
+    Computes the rendering parameters for the specified eye using the SDK 1.16 and older
+    entry point, which reports the eye position as HmdToEyeOffset.
+    """
+    result = libovr.ovr_GetRenderDesc(session, eyeType, fov)
+    return result
+
+
+libovr.prototype("ovr_SubmitFrame", Result, [Session, c_longlong, POINTER(ViewScaleDescPre117), POINTER(POINTER(LayerHeader)), c_uint])
+def submitFramePre117(session, frameIndex, viewScaleDesc, layerPtrList, layerCount=None):
+    """
+    Submits layers for distortion and display using the SDK 1.16 and older entry point.
+    viewScaleDesc may be a ViewScaleDescPre117 or a ViewScaleDesc, whose HmdToEyePose
+    orientations are dropped.
+    """
+    if isinstance(viewScaleDesc, ViewScaleDesc):
+        oldViewScaleDesc = ViewScaleDescPre117()
+        for eye in range(Eye_Count):
+            oldViewScaleDesc.HmdToEyeOffset[eye] = viewScaleDesc.HmdToEyePose[eye].Position
+        oldViewScaleDesc.HmdSpaceToWorldScaleInMeters = viewScaleDesc.HmdSpaceToWorldScaleInMeters
+        viewScaleDesc = oldViewScaleDesc
+    if layerCount is None:
+        layerCount = len(layerPtrList)
+    layerPtrList = layerPtrArray(layerPtrList)
+    result = libovr.ovr_SubmitFrame(session, frameIndex, byref(viewScaleDesc), byref(layerPtrList), layerCount)
+    if result < 0:
+        _checkResult(result, "submitFrame")
+    return result
+
+
+def _getRenderDescPre117(session, eyeType, fov):
+    "getRenderDesc() for runtimes before SDK 1.17, converting to the current ovrEyeRenderDesc"
+    oldDesc = getRenderDescPre117(session, eyeType, fov)
+    result = EyeRenderDesc(oldDesc.Eye, oldDesc.Fov, oldDesc.DistortedViewport, oldDesc.PixelsPerTanAngleAtCenter)
+    result.HmdToEyePose.Orientation.w = 1.0
+    result.HmdToEyePose.Position = oldDesc.HmdToEyeOffset
+    return result
+
+
+def _getDevicePosesPre117(session, deviceTypes, deviceCount, absTime, outDevicePoses=None):
+    "getDevicePoses() in the form of the SDK 1.16 bindings, which take the number of deviceTypes to query"
+    return _currentBindings["getDevicePoses"](session, deviceTypes[:deviceCount], absTime, outDevicePoses)
+
+
+def _waitToBeginFramePre119(session, frameIndex):
+    "Before SDK 1.19 there is nothing to wait for; ovr_SubmitFrame blocks instead"
+    return Success
+
+
+def _beginFramePre119(session, frameIndex):
+    return Success
+
+
+def _endFramePre119(session, frameIndex, viewScaleDesc, layerPtrList):
+    "endFrame() for runtimes before SDK 1.19, which only have the blocking submitFrame()"
+    return submitFrame(session, frameIndex, viewScaleDesc, layerPtrList)
+
+
+def layerPtrArray(layerPtrList):
+    """
+    Returns the ovrLayerHeader* array that endFrame() and submitFrame() build from their
+    layerPtrList. The array may be passed to them in place of the list, so that a frame loop
+    whose layers do not change need not rebuild it every frame.
+    """
+    if isinstance(layerPtrList, Array):
+        return layerPtrList
+    return (POINTER(LayerHeader) * len(layerPtrList))(*[ctypes.pointer(i) for i in layerPtrList])
+
+
+_layerTypes = {
+    LayerType_Disabled: LayerHeader,
+    LayerType_EyeFov: LayerEyeFov,
+    LayerType_EyeFovDepth: LayerEyeFovDepth,
+    LayerType_Quad: LayerQuad,
+    LayerType_EyeMatrix: LayerEyeMatrix,
+}
+_pre125Layers = {} # id of an array built by _layerPtrArrayPre125() -> (weak reference to it, the layers it copies, or None)
+_pre125Arrays = {} # id of another ovrLayerHeader* array -> (weak reference to it, its pointers, the array of copies)
+
+
+def _arrayEntry(table, array):
+    "The entry of array in table, keyed by id() as ctypes arrays are unhashable, or None"
+    entry = table.get(id(array))
+    return entry if entry is not None and entry[0]() is array else None
+
+
+def _setArrayEntry(table, array, *values):
+    "Sets the entry of array in table, which is removed when array is collected"
+    key = id(array)
+    def remove(reference):
+        if table.get(key, (None,))[0] is reference:
+            del table[key]
+    table[key] = (weakref.ref(array, remove),) + values
+
+
+def _layerPtrArrayPre125(layerPtrList):
+    """
+    layerPtrArray() for runtimes before SDK 1.25, whose ovrLayerHeader has no Reserved
+    block. The array points to copies of the layers without that block, which are
+    refreshed from the layers each time the array is passed to endFrame() or submitFrame().
+    Arrays that point to the layers themselves, e.g. built by a FrameContext before
+    initialize(), are replaced by an array of copies of the layers they point to.
+    """
+    if isinstance(layerPtrList, Array):
+        entry = _arrayEntry(_pre125Layers, layerPtrList)
+        if entry is None:
+            return _layerPtrArrayPre125(_pre125Copies(layerPtrList))
+        layerPtrs, layers = layerPtrList, entry[1]
+    else:
+        # e.g. LayerEyeFov for LayerEyeFov.Header
+        layers = [header if header is None or header._b_base_ is None else header._b_base_ for header in layerPtrList]
+        layerPtrs = (POINTER(LayerHeader) * len(layers))()
+        for i, layer in enumerate(layers):
+            if layer is not None:
+                layerPtrs[i] = cast(create_string_buffer(sizeof(layer) - LayerHeader.Reserved.size), POINTER(LayerHeader))
+        _setArrayEntry(_pre125Layers, layerPtrs, layers)
+    start = LayerHeader.Reserved.offset
+    end = start + LayerHeader.Reserved.size
+    for layerPtr, layer in zip(layerPtrs, layers):
+        if layer is not None:
+            ctypes.memmove(layerPtr, addressof(layer), start)
+            ctypes.memmove(addressof(layerPtr.contents) + start, addressof(layer) + end, sizeof(layer) - end)
+    return layerPtrs
+
+
+def _pre125Copies(layerPtrs):
+    "The _layerPtrArrayPre125() array for the layers that layerPtrs points to, rebuilt when its pointers change"
+    pointers = string_at(addressof(layerPtrs), sizeof(layerPtrs))
+    entry = _arrayEntry(_pre125Arrays, layerPtrs)
+    if entry is not None and entry[1] == pointers:
+        return entry[2]
+    layers = []
+    for address in cast(layerPtrs, POINTER(c_void_p))[:len(layerPtrs)]:
+        if address is None:
+            layers.append(None) # no layer in this slot
+            continue
+        layerType = LayerHeader.from_address(address).Type
+        if layerType not in _layerTypes:
+            raise ValueError("Layer type %d has no SDK 1.%d layout" % (layerType, SDK_MINOR_VERSION))
+        layers.append(_layerTypes[layerType].from_address(address)) # does not keep layerPtrs alive
+    copies = _layerPtrArrayPre125(layers)
+    _setArrayEntry(_pre125Arrays, layerPtrs, pointers, copies)
+    return copies
+
+
+# Functions replaced on runtimes older than the SDK minor version that
+# introduced their current form, oldest first
+_sdkVersionDeltas = [
+    (17, {"getRenderDesc": _getRenderDescPre117, "submitFrame": submitFramePre117, "getDevicePoses": _getDevicePosesPre117}),
+    (19, {"waitToBeginFrame": _waitToBeginFramePre119, "beginFrame": _beginFramePre119, "endFrame": _endFramePre119}),
+    (25, {"layerPtrArray": _layerPtrArrayPre125}),
+]
+_currentBindings = dict((name, globals()[name]) for _, variants in _sdkVersionDeltas for name in variants)
+_selectedBindings = dict(_currentBindings) # name -> the variant selected by selectSdkVersion()
+
+
+def _sdkVersionDispatcher(name):
+    "Returns a function that calls the selected variant of function name"
+    current = _currentBindings[name]
+    def dispatch(*args, **kwargs):
+        return _selectedBindings[name](*args, **kwargs)
+    dispatch.__name__ = current.__name__
+    dispatch.__doc__ = current.__doc__
+    return dispatch
+
+globals().update((name, _sdkVersionDispatcher(name)) for name in _currentBindings)
+
+
+def getRuntimeMinorVersion():
+    """
+    Returns the minor version of the loaded LibOVRRT, parsed from getVersionString().
+    Raises OculusFunctionError if its major version does not match DLL_COMPATIBLE_VERSION.
+    """
+    version = getVersionString().decode("ascii", "replace").split(".")
+    try:
+        major, minor = int(version[0]), int(version[1])
+    except (IndexError, ValueError):
+        return MINOR_VERSION # unrecognized format, assume a current runtime
+    if major != DLL_COMPATIBLE_VERSION % 100:
+        message = "LibOVRRT version %s is not compatible with these bindings (%d.%d)." % (
+            ".".join(version), MAJOR_VERSION, MINOR_VERSION)
+        if major == 0:
+            message += " Use the ovr.%s module instead." % " or ovr.".join(_legacyPre1Modules)
+        raise OculusFunctionError(message)
+    return minor
+
+
+def selectSdkVersion(minorVersion):
+    """
+    Selects the variants for SDK 1.minorVersion of the functions that changed after it.
+    initialize() calls this with the negotiated minor version;
+    selectSdkVersion(MINOR_VERSION) restores the current variants.
+    The functions dispatch to the selected variant on every call, so references to them
+    taken earlier, as by "from ovr import endFrame", follow the selection too.
+    """
+    global SDK_MINOR_VERSION
+    if minorVersion < OLDEST_MINOR_VERSION:
+        raise ValueError("SDK 1.%d is older than the oldest supported version 1.%d; use the ovr.%s module instead" % (
+            minorVersion, OLDEST_MINOR_VERSION, legacyModule(minorVersion)))
+    for firstVersion, variants in _sdkVersionDeltas:
+        for name, variant in variants.items():
+            _selectedBindings[name] = variant if minorVersion < firstVersion else _currentBindings[name]
+    SDK_MINOR_VERSION = minorVersion
+    package = sys.modules.get(__package__ or "")
+    if package is not None:
+        package.SDK_MINOR_VERSION = minorVersion
+    return minorVersion
+
+
+def legacyModule(minorVersion):
+    "Name of the module of the ovr package with the bindings for SDK 1.minorVersion runtimes older than OLDEST_MINOR_VERSION"
+    names = [name for firstVersion, name in _legacyModules if firstVersion <= minorVersion]
+    if minorVersion >= OLDEST_MINOR_VERSION or not names:
+        raise ValueError("No legacy module for SDK 1.%d" % minorVersion)
+    return names[-1]
+
+
+### END SDK version deltas ###
+
+
 # Run test program
 if __name__ == "__main__":
     # Transcribed from initial example at 
@@ -0,0 +1,136 @@
+"""
+asyncio front-end for the blocking ovr calls.
+
+The coroutines below run their ovr function on a single dedicated executor
+thread, so an event loop keeps serving networking and other tasks while the
+runtime blocks, e.g. in waitToBeginFrame() or detect():
+
+    async def main():
+        await aio.initialize(None)
+        session, luid = await aio.create()
+        context = FrameContext(session, [layer], hmdToEyePoses)
+        asyncio.ensure_future(watch(session))
+        async for tick in aio.frames(context):
+            await aio.run(context.begin_frame, tick.index)
+            ... render ...
+            await aio.run(context.end_frame, tick.index)
+
+    async def watch(session):
+        async for change in aio.session_status_changes(session):
+            if change.changed.get("ShouldRecenter"):
+                await aio.recenterTrackingOrigin(session)
+
+Calls made through this module, including the FrameContext calls passed to
+run(), run one at a time and in order, on the same thread, so they never race
+each other inside the runtime.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+
+import ovr
+from ovr.session_status import STATUS_FIELDS, flag
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def executor():
+    "Returns the single-thread executor that runs the ovr calls"
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="ovr.aio")
+        return _executor
+
+
+async def run(function, *args):
+    "Calls function(*args) on the ovr executor thread and returns its result"
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor(), functools.partial(function, *args))
+
+
+def _coroutine(function):
+    async def call(*args):
+        return await run(function, *args)
+    call.__name__ = function.__name__
+    call.__doc__ = "Awaitable ovr.%s(), run on the ovr executor thread" % function.__name__
+    return call
+
+
+initialize = _coroutine(ovr.initialize)
+shutdown = _coroutine(ovr.shutdown)
+detect = _coroutine(ovr.detect)
+create = _coroutine(ovr.create)
+destroy = _coroutine(ovr.destroy)
+getSessionStatus = _coroutine(ovr.getSessionStatus)
+recenterTrackingOrigin = _coroutine(ovr.recenterTrackingOrigin)
+getTrackingState = _coroutine(ovr.getTrackingState)
+getInputState = _coroutine(ovr.getInputState)
+getPerfStats = _coroutine(ovr.getPerfStats)
+waitToBeginFrame = _coroutine(ovr.waitToBeginFrame)
+beginFrame = _coroutine(ovr.beginFrame)
+endFrame = _coroutine(ovr.endFrame)
+
+
+class FrameTick(object):
+    "A frame that the compositor is ready for"
+    __slots__ = ("index", "display_time", "wait_result")
+
+    def __init__(self, index, displayTime, waitResult):
+        self.index = index
+        self.display_time = displayTime
+        self.wait_result = waitResult
+
+    def __repr__(self):
+        return "FrameTick(%d, %s)" % (self.index, self.display_time)
+
+
+async def frames(context):
+    """
+    Yields a FrameTick whenever waitToBeginFrame() returns for the next frame of
+    FrameContext context, i.e. at the compositor's frame rate. The next wait
+    starts when the consumer asks for the next tick, normally after ending the
+    frame, so context.frame_index then names the frame to wait for.
+    """
+    while True:
+        yield await run(_wait_for_frame, context, context.frame_index)
+
+
+def _wait_for_frame(context, index):
+    waitResult = context.wait_to_begin_frame(index)
+    return FrameTick(index, context.get_predicted_display_time(index), waitResult)
+
+
+class SessionStatusChange(object):
+    "The SessionStatus flags that changed, as {name: bool}, and the whole SessionStatus"
+    __slots__ = ("changed", "status")
+
+    def __init__(self, changed, status):
+        self.changed = changed
+        self.status = status
+
+    def __repr__(self):
+        return "SessionStatusChange(%r)" % (self.changed,)
+
+
+async def session_status_changes(session, interval=0.1, fields=STATUS_FIELDS):
+    """
+    Polls getSessionStatus() every interval seconds and yields a SessionStatusChange
+    whenever one of fields changes. The first change reports all fields.
+    """
+    previous = {}
+    while True:
+        status = await getSessionStatus(session)
+        changed = {}
+        for name in fields:
+            value = flag(getattr(status, name))
+            if previous.get(name) != value:
+                changed[name] = value
+        if changed:
+            previous.update(changed)
+            yield SessionStatusChange(changed, status)
+        await asyncio.sleep(interval)
@@ -0,0 +1,136 @@
+"""
+Play area and outer boundary queries for many positions at once.
+
+ovr.testBoundaryPoint() tests one point per call into the runtime. Boundary
+reads the floor polygon of a boundary with ovr.getBoundaryGeometry() into a
+NumPy array, and answers inside/outside and distance queries for thousands
+of positions per call with array operations:
+
+    playArea = Boundary(session, ovr.Boundary_PlayArea)
+    while running:
+        positions = agents.positions() # (N, 3), in tracking space
+        inside = playArea.contains(positions)
+        margin = playArea.signed_distance(positions) # > 0 inside
+        ...
+
+The polygon is re-read at most every interval seconds of runtime time, and
+on the next query after invalidate(), e.g. after ovr.recenterTrackingOrigin()
+moved it in tracking space; the arrays derived from it are only rebuilt when
+its points changed. Queries use the x and z coordinates of the positions,
+i.e. their projection on the floor. Requires NumPy.
+"""
+
+import ctypes
+
+import numpy
+
+import ovr
+from ovr import pose_math
+
+
+class Boundary(object):
+    """
+    Cached floor polygon of boundaryType, ovr.Boundary_PlayArea or
+    ovr.Boundary_Outer. Positions are processed chunkSize at a time, which
+    bounds the temporary arrays to chunkSize times the number of edges.
+    """
+
+    def __init__(self, session, boundaryType=ovr.Boundary_PlayArea, interval=1.0, chunkSize=4096):
+        self.session = session
+        self.boundary_type = boundaryType
+        self.interval = interval
+        self.chunk_size = chunkSize
+        self.points = numpy.empty((0, 3), numpy.float32) # floor points, clockwise
+        self.version = 0 # incremented whenever the points change
+        self._floor_points = None # Vector3f array reused by getBoundaryGeometry()
+        self._raw = b"" # bytes of the points, to detect changes
+        self._read_time = None
+        self._set_edges(numpy.empty((0, 2)))
+
+    @property
+    def valid(self):
+        "Whether the boundary is set up, as of the latest read"
+        return len(self.points) >= 3
+
+    def invalidate(self):
+        "Makes the next query re-read the boundary"
+        self._read_time = None
+
+    def update(self, force=False):
+        "Re-reads the boundary if it is due, or if force; returns whether its points changed"
+        now = ovr.getTimeInSeconds()
+        if not force and self._read_time is not None and now - self._read_time < self.interval:
+            return False
+        self._read_time = now
+        floorPoints, count = ovr.getBoundaryGeometry(self.session, self.boundary_type, self._floor_points)
+        self._floor_points = floorPoints
+        raw = ctypes.string_at(ctypes.addressof(floorPoints), count.value * ctypes.sizeof(ovr.Vector3f))
+        if raw == self._raw:
+            return False
+        self._raw = raw
+        self.points = pose_math.as_array(floorPoints)[:count.value].copy()
+        self._set_edges(self.points[:, (0, 2)].astype(numpy.float64))
+        self.version += 1
+        return True
+
+    def _set_edges(self, xz):
+        "Edge i runs from start[i] by edge[i], on the floor plane"
+        self._start_x, self._start_z = xz[:, 0], xz[:, 1]
+        edge = numpy.roll(xz, -1, axis=0) - xz
+        self._edge_x, self._edge_z = edge[:, 0], edge[:, 1]
+        length2 = self._edge_x ** 2 + self._edge_z ** 2
+        self._edge_length2 = numpy.where(length2 > 0.0, length2, 1.0) # repeated points
+
+    def _chunks(self, positions):
+        "Yields (slice, x, z) of the positions, as columns, chunk_size at a time"
+        positions = numpy.asarray(positions, dtype=numpy.float64)
+        x = positions[..., 0].reshape(-1, 1)
+        z = positions[..., 2].reshape(-1, 1)
+        for begin in range(0, len(x), self.chunk_size):
+            end = begin + self.chunk_size
+            yield slice(begin, end), x[begin:end], z[begin:end]
+
+    def _inside(self, x, z):
+        "Even-odd rule: whether a ray from each position towards +x crosses an odd number of edges"
+        endZ = self._start_z + self._edge_z
+        crosses = (self._start_z > z) != (endZ > z)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            crossX = self._start_x + (z - self._start_z) * self._edge_x / self._edge_z
+        return numpy.count_nonzero(crosses & (x < crossX), axis=1) % 2 == 1
+
+    def _distance(self, x, z):
+        t = ((x - self._start_x) * self._edge_x + (z - self._start_z) * self._edge_z) / self._edge_length2
+        numpy.clip(t, 0.0, 1.0, out=t)
+        dx = x - (self._start_x + t * self._edge_x)
+        dz = z - (self._start_z + t * self._edge_z)
+        return numpy.sqrt(numpy.min(dx * dx + dz * dz, axis=1))
+
+    def contains(self, positions):
+        "Whether each of positions, an (..., 3) array, is inside the boundary; all False when it is not set up"
+        self.update()
+        shape = numpy.shape(positions)[:-1]
+        inside = numpy.zeros(int(numpy.prod(shape)), dtype=bool)
+        if self.valid:
+            for chunk, x, z in self._chunks(positions):
+                inside[chunk] = self._inside(x, z)
+        return inside.reshape(shape)
+
+    def distance(self, positions):
+        "Distance from each of positions to the nearest edge of the boundary; NaN when it is not set up"
+        self.update()
+        shape = numpy.shape(positions)[:-1]
+        distance = numpy.full(int(numpy.prod(shape)), numpy.nan)
+        if self.valid:
+            for chunk, x, z in self._chunks(positions):
+                distance[chunk] = self._distance(x, z)
+        return distance.reshape(shape)
+
+    def signed_distance(self, positions):
+        "Like distance(), positive inside the boundary and negative outside"
+        self.update()
+        shape = numpy.shape(positions)[:-1]
+        distance = numpy.full(int(numpy.prod(shape)), numpy.nan)
+        if self.valid:
+            for chunk, x, z in self._chunks(positions):
+                distance[chunk] = numpy.where(self._inside(x, z), 1.0, -1.0) * self._distance(x, z)
+        return distance.reshape(shape)
@@ -0,0 +1,113 @@
+"""
+Allocation-free per-frame submission for ovr sessions.
+
+FrameContext owns the ctypes objects that a frame loop hands to LibOVR
+every frame -- the ViewScaleDesc, the ovrLayerHeader* array and the
+HmdToEyeOffset array for calcEyePoses() -- and reuses them from frame to
+frame instead of building new ones, which keeps ctypes allocations and
+garbage collection out of the per-frame CPU time.
+
+    context = rift.frame_loop([layer], hmdToEyePoses)
+    while running:
+        context.wait_to_begin_frame()
+        context.begin_frame()
+        context.calc_eye_poses(headPose, layer.RenderPose)
+        ... render ...
+        context.end_frame()
+"""
+
+import ctypes
+
+import ovr
+
+
+class FrameContext(object):
+    """
+    Reusable ctypes buffers and frame index for one session's frame loop.
+    The layer pointer array is only rebuilt when set_layers() is given a
+    different list of layers; changes to the contents of the layers
+    themselves (RenderPose, SensorSampleTime, ...) need no call at all.
+    """
+
+    def __init__(self, session, layers=(), hmdToEyePoses=None, worldScale=1.0):
+        self.session = session
+        self.frame_index = 0
+        self.viewScaleDesc = ovr.ViewScaleDesc()
+        self.viewScaleDesc.HmdSpaceToWorldScaleInMeters = worldScale
+        self.viewScaleDesc.HmdToEyePose[0].Orientation.w = 1.0
+        self.viewScaleDesc.HmdToEyePose[1].Orientation.w = 1.0
+        self.hmdToEyeOffset = (ovr.Vector3f * ovr.Eye_Count)()
+        self.layerPtrs = None
+        self.noLayerPtrs = ovr.layerPtrArray([]) # for end_empty_frame()
+        self._layers = None
+        self._layerAddresses = None
+        if hmdToEyePoses is not None:
+            self.set_eye_poses(hmdToEyePoses)
+        self.set_layers(layers)
+
+    def set_eye_poses(self, hmdToEyePoses):
+        "Sets the HmdToEyePose of each eye, e.g. from getRenderDesc()"
+        for eye in range(ovr.Eye_Count):
+            self.viewScaleDesc.HmdToEyePose[eye] = hmdToEyePoses[eye]
+            self.hmdToEyeOffset[eye] = hmdToEyePoses[eye].Position
+
+    def set_layers(self, layers):
+        """
+        Sets the layers submitted by end_frame(), given as layer structures or their
+        LayerHeader fields. Returns True if the layer pointer array had to be rebuilt.
+        """
+        headers = [getattr(layer, "Header", layer) for layer in layers]
+        addresses = [ctypes.addressof(header) for header in headers]
+        if addresses == self._layerAddresses:
+            return False
+        self.layerPtrs = ovr.layerPtrArray(headers)
+        self._layers = list(layers) # the array does not keep the layers alive
+        self._layerAddresses = addresses
+        return True
+
+    def calc_eye_poses(self, headPose, outEyePoses):
+        "Computes the eye poses for headPose into outEyePoses, e.g. a layer's RenderPose"
+        ovr.calcEyePoses(headPose, self.hmdToEyeOffset, outEyePoses)
+        return outEyePoses
+
+    def get_predicted_display_time(self, frameIndex=None):
+        if frameIndex is None:
+            frameIndex = self.frame_index
+        return ovr.getPredictedDisplayTime(self.session, frameIndex)
+
+    def wait_to_begin_frame(self, frameIndex=None):
+        if frameIndex is None:
+            frameIndex = self.frame_index
+        return ovr.waitToBeginFrame(self.session, frameIndex)
+
+    def begin_frame(self, frameIndex=None):
+        if frameIndex is None:
+            frameIndex = self.frame_index
+        return ovr.beginFrame(self.session, frameIndex)
+
+    def end_frame(self, frameIndex=None):
+        "Submits the layers for frameIndex (default frame_index) and advances frame_index past it"
+        if frameIndex is None:
+            frameIndex = self.frame_index
+        result = ovr.endFrame(self.session, frameIndex, self.viewScaleDesc, self.layerPtrs)
+        self.frame_index = frameIndex + 1
+        return result
+
+    def end_empty_frame(self, frameIndex=None):
+        """
+        Like end_frame(), without any layers, to keep the frame loop going without
+        rendering, e.g. while end_frame() returns ovr.Success_NotVisible
+        """
+        if frameIndex is None:
+            frameIndex = self.frame_index
+        result = ovr.endFrame(self.session, frameIndex, self.viewScaleDesc, self.noLayerPtrs)
+        self.frame_index = frameIndex + 1
+        return result
+
+    def submit_frame(self, frameIndex=None):
+        "Like end_frame(), through the single-call submitFrame()"
+        if frameIndex is None:
+            frameIndex = self.frame_index
+        result = ovr.submitFrame(self.session, frameIndex, self.viewScaleDesc, self.layerPtrs)
+        self.frame_index = frameIndex + 1
+        return result
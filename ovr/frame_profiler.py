@@ -0,0 +1,188 @@
+"""
+Per-frame CPU profiling of the render loop.
+
+FrameProfiler records named, nested scopes with time.perf_counter_ns()
+timestamps into ctypes arrays allocated once, so profiling a frame does not
+allocate. A disabled profiler hands out a shared no-op scope:
+
+    profiler = FrameProfiler()
+    while running:
+        profiler.begin_frame(frameIndex)
+        with profiler.scope("render"):
+            with profiler.scope("eye"):
+                ...
+    profiler.breakdown(frameIndex)  # {"render": 0.004, "render/eye": 0.003}
+    profiler.write_chrome_trace("frames.json")  # open in chrome://tracing or Perfetto
+
+A profiler records the scopes of one thread; give each thread its own.
+"""
+
+import collections
+import ctypes
+import json
+import os
+import threading
+import time
+
+
+class _NullScope(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope(object):
+
+    def __init__(self, profiler, nameIndex):
+        self.profiler = profiler
+        self.name_index = nameIndex
+
+    def __enter__(self):
+        self.profiler.begin(self.name_index)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.profiler.end()
+
+
+class FrameProfiler(object):
+    """
+    Ring of the last capacity scopes entered. Scope i lives in slot i % capacity;
+    a scope that has not ended yet has an end time of 0. The ring is allocated
+    when the profiler is first enabled, so a disabled one costs no memory.
+    """
+
+    def __init__(self, capacity=16384, enabled=True):
+        self.capacity = capacity
+        self.starts = None
+        self.ends = None
+        self.names = None
+        self.parents = None # scope number, or -1 at the top level
+        self.frames = None
+        self._enabled = False
+        self.enabled = enabled
+        self.count = 0 # total scopes entered
+        self.frame_index = 0
+        self.thread_id = threading.current_thread().ident
+        self._scopes = {}
+        self._scope_names = []
+        self._stack = []
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled):
+        if enabled and self.starts is None:
+            capacity = self.capacity
+            self.starts = (ctypes.c_int64 * capacity)()
+            self.ends = (ctypes.c_int64 * capacity)()
+            self.names = (ctypes.c_int32 * capacity)()
+            self.parents = (ctypes.c_int64 * capacity)()
+            self.frames = (ctypes.c_int64 * capacity)()
+        self._enabled = bool(enabled)
+
+    def scope(self, name):
+        "Returns a context manager timing the enclosed code as scope name"
+        if not self.enabled:
+            return _NULL_SCOPE
+        try:
+            return self._scopes[name]
+        except KeyError:
+            scope = self._scopes[name] = _Scope(self, len(self._scope_names))
+            self._scope_names.append(name)
+            return scope
+
+    def begin_frame(self, frameIndex):
+        "Tags the scopes entered from now on with frameIndex"
+        self.frame_index = frameIndex
+
+    def begin(self, nameIndex):
+        slot = self.count % self.capacity
+        self.names[slot] = nameIndex
+        self.parents[slot] = self._stack[-1] if self._stack else -1
+        self.frames[slot] = self.frame_index
+        self.ends[slot] = 0
+        self._stack.append(self.count)
+        self.count += 1
+        self.starts[slot] = time.perf_counter_ns()
+
+    def end(self):
+        now = time.perf_counter_ns()
+        self.ends[self._stack.pop() % self.capacity] = now
+
+    def clear(self):
+        self.count = 0
+        del self._stack[:]
+
+    def _first(self):
+        return max(0, self.count - self.capacity)
+
+    def _path(self, i):
+        "Returns 'outer/inner' names of scope i, as far as its ancestors are still buffered"
+        first = self._first()
+        names = []
+        while i >= first:
+            slot = i % self.capacity
+            names.append(self._scope_names[self.names[slot]])
+            i = self.parents[slot]
+        return "/".join(reversed(names))
+
+    def scopes(self, frameIndex=None):
+        """
+        Yields (path, frameIndex, start, duration) of the buffered scopes that have
+        ended, oldest first, in seconds of time.perf_counter()
+        """
+        for i in range(self._first(), self.count):
+            slot = i % self.capacity
+            if self.ends[slot] == 0 or (frameIndex is not None and self.frames[slot] != frameIndex):
+                continue
+            yield self._path(i), self.frames[slot], self.starts[slot] * 1e-9, (self.ends[slot] - self.starts[slot]) * 1e-9
+
+    def breakdown(self, frameIndex):
+        "Returns an OrderedDict of the total seconds spent in each scope path during frame frameIndex"
+        result = collections.OrderedDict()
+        for path, frame, start, duration in self.scopes(frameIndex):
+            result[path] = result.get(path, 0.0) + duration
+        return result
+
+    def chrome_trace(self, perfStats=None, frameOffset=1):
+        """
+        Returns the buffered scopes as a Chrome trace-event object. With perfStats,
+        a PerfStatsCollector, each frame's compositor stats are attached to its
+        outermost scopes, matching AppFrameIndex == frameIndex + frameOffset
+        (AppFrameIndex counts the frames ended, so it is one ahead of a frame
+        index counted from 0).
+        """
+        compositorFrames = perfStats.by_app_frame_index() if perfStats is not None else {}
+        pid = os.getpid()
+        events = []
+        for i in range(self._first(), self.count):
+            slot = i % self.capacity
+            if self.ends[slot] == 0:
+                continue
+            frame = self.frames[slot]
+            args = {"frame": frame}
+            if self.parents[slot] < 0 and frame + frameOffset in compositorFrames:
+                args.update(compositorFrames[frame + frameOffset])
+            events.append({
+                "name": self._scope_names[self.names[slot]],
+                "ph": "X",
+                "ts": self.starts[slot] / 1000.0,
+                "dur": (self.ends[slot] - self.starts[slot]) / 1000.0,
+                "pid": pid,
+                "tid": self.thread_id,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path, perfStats=None, frameOffset=1):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(perfStats, frameOffset), f)
@@ -0,0 +1,85 @@
+"""
+Bounded hand-off of captured frames from the render thread.
+
+FrameQueue takes frames from a producer that must never block, such as the
+render thread reading back the mirror texture in MirrorCapture, and either
+hands them to sink(frameIndex, pixels) on a worker thread, or keeps them for
+get():
+
+    frames = FrameQueue(sink=encoder.write)
+    while running:
+        frames.put(frameIndex, pixels)
+    frames.close()
+
+With a sink, frames that arrive while its queue is full are dropped, so a slow
+sink loses the newest frames; without one, the oldest kept frames make room,
+so get() returns the latest queueSize frames. If the sink raises, the frames
+after are dropped, and close() raises the error.
+"""
+
+import queue
+import threading
+
+
+class FrameQueue(object):
+    "At most queueSize (frameIndex, pixels) pairs on their way to sink, or to get()"
+
+    def __init__(self, sink=None, queueSize=8):
+        self.sink = sink
+        self.dropped = 0 # frames not kept, for lack of queue space or after an error of the sink
+        self.error = None # exception raised by the sink
+        self._queue = queue.Queue(maxsize=queueSize)
+        self._lock = threading.Lock() # dropped is counted by both threads
+        self._thread = None
+        if sink is not None:
+            self._thread = threading.Thread(target=self._run, name="ovr.FrameQueue")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def put(self, frameIndex, pixels):
+        "Queues frame frameIndex without blocking, dropping a frame if the queue is full"
+        try:
+            self._queue.put_nowait((frameIndex, pixels))
+        except queue.Full:
+            if self.sink is not None:
+                self._drop()
+                return
+            try:
+                self._queue.get_nowait() # without a sink, keep the newest frames
+                self.dropped += 1
+            except queue.Empty:
+                pass # get() took it meanwhile
+            self._queue.put_nowait((frameIndex, pixels))
+
+    def _drop(self):
+        with self._lock:
+            self.dropped += 1
+
+    def get(self, timeout=0):
+        "Without a sink, returns the oldest kept (frameIndex, pixels), or None"
+        try:
+            return self._queue.get(timeout is None or timeout > 0, timeout)
+        except queue.Empty:
+            return None
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self.error is not None:
+                self._drop() # keep draining, so that put() and close() never block
+                continue
+            try:
+                self.sink(*item)
+            except Exception as e:
+                self.error = e
+
+    def close(self):
+        "Waits for the sink to consume the queued frames, and raises its error, if any"
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,145 @@
+"""
+Pipelined frame submission with ovr.waitToBeginFrame/beginFrame/endFrame.
+
+FrameScheduler runs the start of each frame -- waiting for the compositor,
+predicting the display time and head pose, and an optional application
+prepare() step such as simulation -- on a worker thread, one frame ahead of
+the render thread that draws and ends the previous frame:
+
+    worker thread:  wait(N+1) predict(N+1) prepare(N+1) | wait(N+2) ...
+    render thread:  begin(N)  render(N)    end(N)       | begin(N+1) ...
+
+ctypes releases the GIL for the duration of every call into LibOVR, so the
+worker's compositor wait overlaps with Python work on the render thread
+and vice versa. The worker only waits for frame N+1 once frame N-1 has been
+ended, so at most one frame is in flight past the last ended frame, as
+LibOVR requires.
+
+    with FrameScheduler(rift.frame_loop([layer], hmdToEyePoses), prepare=simulate) as scheduler:
+        while running:
+            frame = scheduler.next_frame()
+            ... render frame.tracking_state / frame.data ...
+            scheduler.end_frame(frame)
+"""
+
+import queue
+import threading
+
+import ovr
+
+
+class ScheduledFrame(object):
+    "One frame in flight: its index, predicted display time and tracking state"
+    __slots__ = ("index", "display_time", "tracking_state", "wait_result", "data")
+
+    def __init__(self):
+        self.index = -1
+        self.display_time = 0.0
+        self.tracking_state = None
+        self.wait_result = ovr.Success
+        self.data = None
+
+    def __repr__(self):
+        return "ScheduledFrame(%d, %s)" % (self.index, self.display_time)
+
+
+class FrameScheduler(object):
+    """
+    Prepares frames on a worker thread for a render thread that calls next_frame()
+    and end_frame(). One frame is prepared ahead of the one being rendered.
+    The frame index sequence starts at context.frame_index and stays consecutive:
+    every prepared frame must be ended, in order, by the render thread.
+    """
+
+    def __init__(self, context, prepare=None, latencyMarker=True):
+        self.context = context
+        self.prepare = prepare # called as prepare(frame) on the worker thread, result stored as frame.data
+        self.latency_marker = latencyMarker
+        self._frames = queue.Queue(maxsize=1)
+        # Frames the worker may wait for before the render thread ends one: the one
+        # being rendered and the next; end_frame() releases one per ended frame
+        self._unended = threading.Semaphore(2)
+        self._slots = [ScheduledFrame() for i in range(3)]
+        self._stop = threading.Event()
+        self._thread = None
+        self._error = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        if self._thread is not None:
+            raise RuntimeError("FrameScheduler is already running")
+        self._stop.clear()
+        self._error = None
+        self._unended = threading.Semaphore(2)
+        self._thread = threading.Thread(target=self._run, name="ovr.FrameScheduler")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        "Stops the worker thread; frames prepared but not yet rendered are discarded"
+        if self._thread is None:
+            return
+        self._stop.set()
+        try:
+            while True: # unblock a worker waiting for queue space
+                self._frames.get_nowait()
+        except queue.Empty:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+
+    def next_frame(self, timeout=None):
+        """
+        Returns the next prepared frame, after calling beginFrame() for it.
+        Re-raises any exception raised on the worker thread.
+        """
+        frame = self._frames.get(True, timeout)
+        if frame is None:
+            self._frames.put(None) # keep failing on later calls
+            raise self._error
+        self.context.begin_frame(frame.index)
+        return frame
+
+    def end_frame(self, frame):
+        "Submits the context's layers for frame, and lets the worker wait for another one"
+        result = self.context.end_frame(frame.index)
+        self._unended.release()
+        return result
+
+    def _run(self):
+        frameIndex = self.context.frame_index
+        try:
+            while self._acquire():
+                frame = self._slots[frameIndex % len(self._slots)]
+                frame.index = frameIndex
+                frame.wait_result = self.context.wait_to_begin_frame(frameIndex)
+                frame.display_time = self.context.get_predicted_display_time(frameIndex)
+                frame.tracking_state = ovr.getTrackingState(self.context.session, frame.display_time, self.latency_marker)
+                if self.prepare is not None:
+                    frame.data = self.prepare(frame)
+                self._put(frame)
+                frameIndex += 1
+        except Exception as e:
+            self._error = e
+            self._put(None)
+
+    def _acquire(self):
+        "Blocks until the worker may wait for another frame; False once stopped"
+        while not self._stop.is_set():
+            if self._unended.acquire(True, 0.1):
+                return True
+        return False
+
+    def _put(self, frame):
+        while not self._stop.is_set():
+            try:
+                self._frames.put(frame, True, 0.1)
+                return
+            except queue.Full:
+                pass
@@ -0,0 +1,240 @@
+"""
+Streaming haptics for Touch controllers.
+
+ovr.submitControllerVibration() only enqueues one buffer of samples, and the
+controller falls silent once its queue runs dry. HapticsEngine mixes the
+effects playing on each controller into a sample stream, and on its own
+thread keeps the queue of each controller topped up to lead seconds of
+samples beyond the runtime's QueueMinSizeToAvoidStarvation, submitted in
+chunks of its SubmitOptimalSamples. Stalls of less than lead seconds, of the
+render thread or of the engine thread itself, therefore never starve the
+controllers:
+
+    engine = HapticsEngine(session, lead=0.05)
+    with engine:
+        engine.play(ovr.ControllerType_RTouch, ConstantEffect(0.8, duration=0.1))
+        engine.play(ovr.ControllerType_LTouch, ClipEffect(clip.samples(), loop=True))
+        ...
+
+Effects are mixed by adding their amplitudes, clipped to [0, 1]. An effect
+object plays on one controller at a time. Requires NumPy.
+"""
+
+import abc
+import ctypes
+import math
+import threading
+
+import numpy
+
+import ovr
+
+
+class HapticsEffect(abc.ABC):
+    "Base of the effects mixed by HapticsEngine"
+
+    def start(self, sampleRate):
+        "Called by HapticsEngine.play() with the sample rate of the controller"
+        pass
+
+    @abc.abstractmethod
+    def render(self, out):
+        """
+        Adds the next len(out) amplitudes of the effect, in [0, 1], to the float32
+        array out, and returns whether the effect continues after them
+        """
+
+
+class ConstantEffect(HapticsEffect):
+    "Vibrates at amplitude for duration seconds, or until cancelled"
+
+    def __init__(self, amplitude, duration=None):
+        self.amplitude = amplitude
+        self.duration = duration
+        self.remaining = None # samples left to play; None plays until cancelled
+
+    def start(self, sampleRate):
+        if self.duration is not None:
+            self.remaining = int(round(self.duration * sampleRate))
+
+    def render(self, out):
+        if self.remaining is None:
+            out += self.amplitude
+            return True
+        count = min(len(out), self.remaining)
+        out[:count] += self.amplitude
+        self.remaining -= count
+        return self.remaining > 0
+
+
+class ClipEffect(HapticsEffect):
+    """
+    Plays amplitudes samples, at the sample rate of the controller, once or looped.
+    Integer samples are scaled from the range of their type, e.g. 0-255 for uint8.
+    """
+
+    def __init__(self, samples, gain=1.0, loop=False):
+        samples = numpy.asarray(samples)
+        if samples.dtype.kind in "ui":
+            samples = samples / float(numpy.iinfo(samples.dtype).max)
+        self.samples = numpy.asarray(samples, dtype=numpy.float32) * gain
+        self.loop = loop
+        self.position = 0
+
+    def render(self, out):
+        samples = self.samples
+        done = 0
+        while done < len(out) and len(samples):
+            if self.position == len(samples):
+                if not self.loop:
+                    break
+                self.position = 0
+            count = min(len(out) - done, len(samples) - self.position)
+            out[done:done + count] += samples[self.position:self.position + count]
+            self.position += count
+            done += count
+        return self.loop or self.position < len(samples)
+
+
+class _Channel(object):
+    "Mixing and submission state of one controller, allocated once"
+
+    def __init__(self, controllerType, desc, lead):
+        self.controller_type = controllerType
+        self.desc = desc
+        self.target = desc.QueueMinSizeToAvoidStarvation + int(math.ceil(lead * desc.SampleRateHz))
+        self.effects = []
+        self.feeding = False # submitted while effects were playing, so the queue should not run low
+        self.mix = numpy.zeros(desc.SubmitMaxSamples, dtype=numpy.float32)
+        sampleType = numpy.uint8 if desc.SampleSizeInBytes == 1 else numpy.uint16
+        self.scale = float(numpy.iinfo(sampleType).max)
+        self.samples = (ctypes.c_ubyte * (desc.SubmitMaxSamples * desc.SampleSizeInBytes))()
+        self.samples_view = numpy.frombuffer(self.samples, dtype=sampleType)
+        self.buffer = ovr.HapticsBuffer()
+        self.buffer.Samples = ctypes.addressof(self.samples)
+        self.buffer.SubmitMode = ovr.HapticsBufferSubmit_Enqueue
+        self.state = ovr.HapticsPlaybackState()
+
+
+class HapticsEngine(object):
+    """
+    Mixes the effects playing on each of controllerTypes and keeps lead seconds
+    of samples queued on the controller beyond the starvation minimum, topped
+    up every interval seconds by pump(), which the engine thread calls.
+    Controller types without a haptics engine are ignored.
+    """
+
+    def __init__(self, session, controllerTypes=(ovr.ControllerType_LTouch, ovr.ControllerType_RTouch), lead=0.05, interval=None):
+        self.session = session
+        self.lead = lead
+        self.interval = lead / 4.0 if interval is None else interval
+        self.channels = {}
+        for controllerType in controllerTypes:
+            desc = ovr.getTouchHapticsDesc(session, controllerType)
+            if desc.SampleRateHz > 0:
+                self.channels[controllerType] = _Channel(controllerType, desc, lead)
+        self.submitted = 0 # samples submitted
+        self.starved = 0 # pumps that found a fed queue below QueueMinSizeToAvoidStarvation
+        self.error = None # exception that stopped the engine thread
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _channel(self, controllerType):
+        try:
+            return self.channels[controllerType]
+        except KeyError:
+            raise ValueError("No haptics engine for controller type %#x" % controllerType)
+
+    def play(self, controllerType, effect):
+        "Starts mixing effect into the samples of controllerType, and returns it"
+        channel = self._channel(controllerType)
+        effect.start(channel.desc.SampleRateHz)
+        with self._lock:
+            channel.effects = channel.effects + [effect]
+        return effect
+
+    def cancel(self, effect):
+        "Stops effect, after the samples of it that are already queued"
+        with self._lock:
+            for channel in self.channels.values():
+                channel.effects = [e for e in channel.effects if e is not effect]
+
+    def cancel_all(self, controllerType=None):
+        with self._lock:
+            for channel in self.channels.values():
+                if controllerType is None or channel.controller_type == controllerType:
+                    channel.effects = []
+
+    def playing(self, controllerType):
+        return list(self._channel(controllerType).effects)
+
+    def pump(self):
+        "Tops up the queue of every controller with effects playing; returns the samples submitted"
+        submitted = 0
+        for channel in self.channels.values():
+            if not channel.effects:
+                channel.feeding = False
+                continue # let the queue drain into silence
+            desc = channel.desc
+            state = channel.state
+            ovr.getControllerVibrationState(self.session, channel.controller_type, state)
+            if channel.feeding and state.SamplesQueued < desc.QueueMinSizeToAvoidStarvation:
+                self.starved += 1
+            queued = state.SamplesQueued
+            space = state.RemainingQueueSpace
+            while channel.effects and queued < channel.target and space >= desc.SubmitMinSamples:
+                count = min(desc.SubmitOptimalSamples, space, desc.SubmitMaxSamples)
+                self._submit(channel, count)
+                queued += count
+                space -= count
+                submitted += count
+            channel.feeding = bool(channel.effects)
+        self.submitted += submitted
+        return submitted
+
+    def _submit(self, channel, count):
+        mix = channel.mix[:count]
+        mix.fill(0.0)
+        ended = [effect for effect in channel.effects if not effect.render(mix)]
+        if ended:
+            with self._lock:
+                channel.effects = [e for e in channel.effects if not any(e is f for f in ended)]
+        numpy.clip(mix, 0.0, 1.0, out=mix)
+        mix *= channel.scale
+        numpy.rint(mix, out=mix)
+        channel.samples_view[:count] = mix
+        channel.buffer.SamplesCount = count
+        ovr.submitControllerVibration(self.session, channel.controller_type, channel.buffer)
+
+    def start(self):
+        if self._thread is not None:
+            raise RuntimeError("HapticsEngine is already running")
+        self._stop.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="ovr.HapticsEngine")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        "Stops the engine thread; samples already queued still play"
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        try:
+            self.pump()
+            while not self._stop.wait(self.interval):
+                self.pump()
+        except Exception as e:
+            self.error = e
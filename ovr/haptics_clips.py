@@ -0,0 +1,237 @@
+"""
+A cache of haptics clips converted from Wav data.
+
+ovr.readWavFromBuffer() and ovr.genHapticsFromAudioData() take milliseconds
+per effect, and return buffers allocated by the runtime that stay allocated
+until they are released. HapticsClipCache converts each Wav once, keeps the
+clips by key with least recently used eviction within a memory budget, and
+owns their buffers, releasing them on eviction:
+
+    cache = HapticsClipCache(budget=256 * 1024)
+    if os.path.exists("effects.ovrhap"):
+        cache.load("effects.ovrhap") # one memory-mapped read, no conversion
+    clip = cache.load_wav_file("sounds/impact.wav")
+    engine.play(ovr.ControllerType_RTouch, clip.effect(gain=0.8))
+    ...
+    cache.save("effects.ovrhap")
+
+A CachedClip is only valid while it stays in the cache; effects made from it
+copy its samples, and keep playing after it is evicted. Samples are one byte
+per sample, as for Touch. Requires NumPy.
+"""
+
+import collections
+import ctypes
+import mmap
+import threading
+
+import numpy
+
+import ovr
+from ovr.haptics import ClipEffect
+
+
+MAGIC = b"PYOVRHAP"
+VERSION = 1
+
+
+class _FileHeader(ctypes.Structure):
+    "Followed by Count _ClipEntry structures, least recently used first"
+    _fields_ = [
+        ("Magic", ctypes.c_char * 8),
+        ("Version", ctypes.c_uint32),
+        ("Count", ctypes.c_uint32),
+    ]
+
+
+class _ClipEntry(ctypes.Structure):
+    _fields_ = [
+        ("KeyOffset", ctypes.c_uint64), # of the UTF-8 key
+        ("SamplesOffset", ctypes.c_uint64),
+        ("KeySize", ctypes.c_uint32),
+        ("SamplesCount", ctypes.c_uint32),
+    ]
+
+
+def _padded(size):
+    return (size + 7) & ~7
+
+
+class CachedClip(object):
+    """
+    An ovr.HapticsClip held by HapticsClipCache, whose samples were allocated by
+    the runtime or are mapped from a file written by HapticsClipCache.save()
+    """
+    __slots__ = ("key", "clip", "size", "_buffer", "_native")
+
+    def __init__(self, key, clip, buffer, native):
+        self.key = key
+        self.clip = clip
+        self.size = clip.SamplesCount # bytes
+        self._buffer = buffer
+        self._native = native
+
+    def __repr__(self):
+        return "CachedClip(%r, %d samples)" % (self.key, self.size)
+
+    def samples(self):
+        "The samples as a uint8 NumPy array, valid until the clip is evicted"
+        return numpy.frombuffer(self._buffer, dtype=numpy.uint8)
+
+    def effect(self, gain=1.0, loop=False):
+        "A ClipEffect playing a copy of the samples, for HapticsEngine.play()"
+        return ClipEffect(self.samples(), gain, loop)
+
+    def _release(self):
+        self._buffer = None
+        if self._native:
+            self._native = False
+            ovr.releaseHapticsClip(self.clip)
+        else:
+            self.clip.Samples = None
+            self.clip.SamplesCount = 0
+
+
+class HapticsClipCache(object):
+    """
+    Haptics clips by key, at most budget bytes of them; the least recently used
+    clips are evicted first, except that the newest clip is always kept.
+    """
+
+    def __init__(self, budget=1 << 20, genMode=ovr.HapticsGenMode_PointSample):
+        self.budget = budget
+        self.gen_mode = genMode
+        self.size = 0 # bytes of the clips held
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clips = collections.OrderedDict() # key -> CachedClip, least recently used first
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.clear()
+
+    def __len__(self):
+        return len(self._clips)
+
+    def __contains__(self, key):
+        return key in self._clips
+
+    def keys(self):
+        "Keys of the clips held, least recently used first"
+        with self._lock:
+            return list(self._clips)
+
+    def get(self, key):
+        "Returns the clip of key, now the most recently used, or None"
+        with self._lock:
+            cached = self._clips.get(key)
+            if cached is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._clips.move_to_end(key)
+            return cached
+
+    def put(self, key, clip):
+        "Takes ownership of ovr.HapticsClip clip, allocated by the runtime, and returns its CachedClip"
+        buffer = (ctypes.c_ubyte * clip.SamplesCount).from_address(clip.Samples) if clip.Samples else bytearray()
+        return self._insert(CachedClip(key, clip, buffer, True))
+
+    def _insert(self, cached):
+        with self._lock:
+            self.evict(cached.key)
+            self._clips[cached.key] = cached
+            self.size += cached.size
+            while self.size > self.budget and len(self._clips) > 1:
+                self.evict(next(iter(self._clips)))
+                self.evictions += 1
+        return cached
+
+    def evict(self, key):
+        "Removes the clip of key and releases its samples; returns whether it was held"
+        with self._lock:
+            cached = self._clips.pop(key, None)
+            if cached is None:
+                return False
+            self.size -= cached.size
+        cached._release()
+        return True
+
+    def clear(self):
+        "Evicts every clip"
+        for key in self.keys():
+            self.evict(key)
+
+    def load_wav(self, key, data, stereoChannelToUse=0):
+        "Returns the clip of key, converting Wav file contents data into it if it is not held"
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        return self._convert(key, data, stereoChannelToUse)
+
+    def _convert(self, key, data, stereoChannelToUse):
+        audio = ovr.readWavFromBuffer(data, len(data), stereoChannelToUse)
+        try:
+            clip = ovr.genHapticsFromAudioData(audio, self.gen_mode)
+        finally:
+            ovr.releaseAudioChannelData(audio)
+        return self.put(key, clip)
+
+    def load_wav_file(self, path, key=None, stereoChannelToUse=0):
+        "Like load_wav(), reading the Wav file at path only if its clip, keyed by path by default, is not held"
+        key = path if key is None else key
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        with open(path, "rb") as f:
+            data = f.read()
+        return self._convert(key, data, stereoChannelToUse)
+
+    def save(self, path):
+        "Writes the clips held, which must have str keys, to path, to be read back with load()"
+        with self._lock:
+            clips = list(self._clips.values())
+            keys = [cached.key.encode("utf-8") for cached in clips]
+            entries = (_ClipEntry * len(clips))()
+            offset = ctypes.sizeof(_FileHeader) + ctypes.sizeof(entries)
+            for entry, key, cached in zip(entries, keys, clips):
+                entry.KeyOffset = offset
+                entry.KeySize = len(key)
+                entry.SamplesOffset = offset + _padded(len(key))
+                entry.SamplesCount = cached.size
+                offset = entry.SamplesOffset + _padded(cached.size)
+            with open(path, "wb") as f:
+                f.write(_FileHeader(MAGIC, VERSION, len(clips)))
+                f.write(entries)
+                for key, cached in zip(keys, clips):
+                    f.write(key + b"\0" * (_padded(len(key)) - len(key)))
+                    f.write(cached._buffer)
+                    f.write(b"\0" * (_padded(cached.size) - cached.size))
+
+    def load(self, path):
+        """
+        Maps a file written by save() and adds its clips, without copying or
+        converting their samples; clips of keys already held are kept. The file
+        stays mapped until its last clip is evicted. Returns the clips added.
+        """
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if len(data) < ctypes.sizeof(_FileHeader):
+            raise ValueError("%s is not a version %d haptics clip file" % (path, VERSION))
+        header = _FileHeader.from_buffer(data)
+        if header.Magic != MAGIC or header.Version != VERSION:
+            raise ValueError("%s is not a version %d haptics clip file" % (path, VERSION))
+        entries = (_ClipEntry * header.Count).from_buffer(data, ctypes.sizeof(_FileHeader))
+        added = []
+        for entry in entries:
+            key = data[entry.KeyOffset:entry.KeyOffset + entry.KeySize].decode("utf-8")
+            if key in self._clips:
+                continue
+            buffer = (ctypes.c_ubyte * entry.SamplesCount).from_buffer(data, entry.SamplesOffset)
+            clip = ovr.HapticsClip(ctypes.addressof(buffer), entry.SamplesCount)
+            added.append(self._insert(CachedClip(key, clip, buffer, False)))
+        return added
@@ -0,0 +1,219 @@
+"""
+Input state history of all connected controllers, with vectorized queries.
+
+InputHistory polls ovr.getInputState() for every controller type that
+ovr.getConnectedControllerTypes() reports, on its own thread at a fixed rate,
+filling InputState structures preallocated in one ring per controller type.
+Each ring is also viewed as a NumPy structured array, so that button and
+touch edges and analog values are computed over a time window with array
+operations instead of per-sample attribute lookups:
+
+    history = InputHistory(session, rate=250.0)
+    with history:
+        while running:
+            now = ovr.getTimeInSeconds()
+            if history.pressed(ovr.ControllerType_Touch, since=lastFrame) & ovr.Button_A:
+                fire()
+            trigger = history.analog(ovr.ControllerType_Touch, "IndexTrigger", since=now - 0.05)
+            lastFrame = now
+
+Edges are found between consecutive samples, starting from the last sample
+taken at or before since, so a press is reported by the first query whose
+window covers it. If polling fails on the polling thread, the thread stops,
+and the queries and stop() raise the error. Requires NumPy.
+"""
+
+import ctypes
+import threading
+import time
+
+import numpy
+
+import ovr
+
+
+# Controller types polled separately; the left and right Touch share one state
+CONTROLLER_TYPES = (
+    ovr.ControllerType_Touch,
+    ovr.ControllerType_Remote,
+    ovr.ControllerType_XBox,
+    ovr.ControllerType_Object0,
+    ovr.ControllerType_Object1,
+    ovr.ControllerType_Object2,
+    ovr.ControllerType_Object3,
+)
+
+ANALOG_FIELDS = ("IndexTrigger", "HandTrigger", "Thumbstick")
+
+
+def _input_dtype():
+    "The fields of InputState used here, as a NumPy dtype laid over the InputState structure"
+    names = ("TimeInSeconds", "Buttons", "Touches") + ANALOG_FIELDS
+    formats = (numpy.float64, numpy.uint32, numpy.uint32, (numpy.float32, 2), (numpy.float32, 2), (numpy.float32, (2, 2)))
+    return numpy.dtype({
+        "names": names,
+        "formats": formats,
+        "offsets": [getattr(ovr.InputState, name).offset for name in names],
+        "itemsize": ctypes.sizeof(ovr.InputState),
+    })
+
+INPUT_DTYPE = _input_dtype()
+
+
+class _Ring(object):
+
+    def __init__(self, capacity):
+        self.states = (ovr.InputState * capacity)()
+        self.times = (ctypes.c_double * capacity)() # ovr.getTimeInSeconds() of each poll
+        self.samples = numpy.frombuffer(self.states, dtype=INPUT_DTYPE)
+        self.poll_times = numpy.frombuffer(self.times, dtype=numpy.float64)
+        self.count = 0 # total samples; sample i lives in slot i % capacity
+
+
+class InputHistory(object):
+    """
+    Rings of the last capacity input states of each connected controller type.
+
+    There is a single writer, the polling thread or whoever calls poll(); the
+    queries copy the samples they need and retry if the copied slots were
+    rewritten meanwhile, so readers never block the poller.
+    """
+
+    def __init__(self, session, rate=250.0, capacity=512, controllerTypes=CONTROLLER_TYPES):
+        self.session = session
+        self.rate = rate
+        self.capacity = capacity
+        self.controller_types = tuple(controllerTypes)
+        self.rings = {} # controller type -> _Ring, created when the type is first connected
+        self.connected = 0 # latest ovr.getConnectedControllerTypes()
+        self.overruns = 0 # polls taken late because the previous one took longer than 1/rate
+        self.error = None # exception that stopped the polling thread
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            raise RuntimeError("InputHistory is already running")
+        self._stop.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="ovr.InputHistory")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        "Stops the polling thread; raises the exception that stopped it, if any"
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self._raise_error()
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def poll(self):
+        "Takes one sample of every connected controller type; called at rate Hz by the polling thread"
+        now = ovr.getTimeInSeconds()
+        connected = ovr.getConnectedControllerTypes(self.session)
+        self.connected = connected
+        for controllerType in self.controller_types:
+            if not connected & controllerType:
+                continue
+            ring = self.rings.get(controllerType)
+            if ring is None:
+                ring = self.rings[controllerType] = _Ring(self.capacity)
+            slot = ring.count % self.capacity
+            ring.times[slot] = now
+            ovr.getInputState(self.session, controllerType, ring.states[slot])
+            ring.count += 1 # publish
+
+    def window(self, controllerType, since=None):
+        """
+        Returns (pollTimes, samples), NumPy arrays of the buffered samples of
+        controllerType, oldest first, starting with the last one polled at or
+        before since (or the oldest buffered one); samples has dtype INPUT_DTYPE.
+        """
+        self._raise_error()
+        ring = self.rings.get(controllerType)
+        if ring is None:
+            return numpy.empty(0, numpy.float64), numpy.empty(0, INPUT_DTYPE)
+        while True:
+            count = ring.count
+            first = max(0, count - self.capacity + 1) # leave out the slot being written
+            slots = numpy.arange(first, count) % self.capacity
+            times = ring.poll_times[slots]
+            samples = ring.samples[slots]
+            if ring.count - first < self.capacity: # none of the copied slots was rewritten
+                break
+        if since is not None:
+            start = max(0, int(numpy.searchsorted(times, since, "right")) - 1)
+            times = times[start:]
+            samples = samples[start:]
+        return times, samples
+
+    def _bits(self, controllerType, since, field):
+        return self.window(controllerType, since)[1][field]
+
+    def edges(self, controllerType, since=None, field="Buttons"):
+        """
+        Returns (pollTimes, pressed, released): per sample after the first of the
+        window, the bits of field (Buttons or Touches) that turned on and off
+        """
+        times, samples = self.window(controllerType, since)
+        bits = samples[field]
+        return times[1:], bits[1:] & ~bits[:-1], bits[:-1] & ~bits[1:]
+
+    def pressed(self, controllerType, since=None, field="Buttons"):
+        "The bits of field that turned on at some sample of the window"
+        bits = self._bits(controllerType, since, field)
+        return int(numpy.bitwise_or.reduce(bits[1:] & ~bits[:-1])) if len(bits) > 1 else 0
+
+    def released(self, controllerType, since=None, field="Buttons"):
+        "The bits of field that turned off at some sample of the window"
+        bits = self._bits(controllerType, since, field)
+        return int(numpy.bitwise_or.reduce(bits[:-1] & ~bits[1:])) if len(bits) > 1 else 0
+
+    def held(self, controllerType, since=None, field="Buttons"):
+        "The bits of field that are on in every sample of the window"
+        bits = self._bits(controllerType, since, field)
+        return int(numpy.bitwise_and.reduce(bits)) if len(bits) else 0
+
+    def analog(self, controllerType, field, since=None, reduce=numpy.mean):
+        """
+        Filters analog field (IndexTrigger, HandTrigger or Thumbstick) over the
+        window with reduce, e.g. numpy.mean, numpy.median or numpy.max; returns
+        one value per hand, or an x, y pair per hand for Thumbstick.
+        Returns None without samples.
+        """
+        if field not in ANALOG_FIELDS:
+            raise ValueError("%s is not one of %s" % (field, ", ".join(ANALOG_FIELDS)))
+        values = self.window(controllerType, since)[1][field]
+        if not len(values):
+            return None
+        return reduce(values, axis=0)
+
+    def _run(self):
+        period = 1.0 / self.rate
+        deadline = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                self.poll()
+                deadline += period
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    self.overruns += 1
+                    deadline = time.perf_counter() # don't try to catch up with a burst
+        except Exception as e:
+            self.error = e
+            self._stop.set()
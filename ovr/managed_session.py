@@ -0,0 +1,158 @@
+"""
+A session that can be re-created after ovrError_DisplayLost.
+
+When the display is lost, e.g. because the HMD was unplugged, the frame calls
+fail with ovrError_DisplayLost and the application has to destroy its swap
+chains, mirror textures and session, create a new session, and create its
+textures again. ManagedSession keeps track of every swap chain and mirror
+texture created through it, so that recover() can do all of that in one call:
+
+    managed = ManagedSession()
+    session, luid = managed.create()
+    chain = managed.create_swap_chain(desc)
+    while running:
+        try:
+            ... render and end the frame ...
+        except ovr.OculusFunctionError as e:
+            if not is_display_lost(e):
+                raise
+            sameAdapter = managed.recover()
+
+recover() re-creates every handle in place: the session and texture handles
+returned earlier stay valid and refer to the new objects, so FrameContexts and
+other holders of the handles keep working. Structures that copied a handle by
+value, such as the ColorTexture of a layer, must be assigned it again, and
+anything built from the old textures, such as framebuffers attached to their
+GL texture names, rebuilt. When recover() returns False the new session is on
+a different graphics adapter, and all graphics resources must be re-created.
+"""
+
+import time
+
+import ovr
+
+
+def is_display_lost(error):
+    "Whether exception error reports ovrError_DisplayLost"
+    return getattr(error, "result", None) == ovr.Error_DisplayLost
+
+
+class ManagedSession(object):
+    "An ovr session and the swap chains and mirror textures created through it"
+
+    def __init__(self):
+        self.session = None
+        self.luid = None
+        self.hmdDesc = None
+        self.swap_chains = [] # (TextureSwapChain, TextureSwapChainDesc)
+        self.mirror_textures = [] # (MirrorTexture, MirrorTextureDesc)
+        self.recoveries = 0
+        self._created = False # whether session and textures exist in the runtime
+
+    def create(self):
+        "Creates the session; returns (session, luid) like ovr.create()"
+        self.session, self.luid = ovr.create()
+        self.hmdDesc = ovr.getHmdDesc(self.session)
+        self._created = True
+        return self.session, self.luid
+
+    def create_swap_chain(self, desc):
+        chain = ovr.createTextureSwapChainGL(self.session, desc)
+        self.swap_chains.append((chain, type(desc).from_buffer_copy(desc)))
+        return chain
+
+    def destroy_swap_chain(self, chain):
+        self.swap_chains = [entry for entry in self.swap_chains if entry[0] is not chain]
+        ovr.destroyTextureSwapChain(self.session, chain)
+
+    def supports_texture_arrays(self):
+        """
+        Whether the runtime creates texture swap chains with an ArraySize of 2, by
+        creating and destroying a small one; the PC runtime rejects them at this time
+        """
+        desc = ovr.TextureSwapChainDesc()
+        desc.Type = ovr.Texture_2D
+        desc.ArraySize = 2
+        desc.Format = ovr.OVR_FORMAT_R8G8B8A8_UNORM_SRGB
+        desc.Width = desc.Height = 16
+        desc.MipLevels = desc.SampleCount = 1
+        with ovr.noRaise():
+            chain = ovr.createTextureSwapChainGL(self.session, desc)
+            failure = ovr.getLastFailure()
+        if failure is not None:
+            if failure.result != ovr.Error_InvalidParameter:
+                raise failure
+            return False
+        ovr.destroyTextureSwapChain(self.session, chain)
+        return True
+
+    def create_mirror_texture(self, desc):
+        mirrorTexture = ovr.createMirrorTextureGL(self.session, desc)
+        self.mirror_textures.append((mirrorTexture, type(desc).from_buffer_copy(desc)))
+        return mirrorTexture
+
+    def destroy_mirror_texture(self, mirrorTexture):
+        self.mirror_textures = [entry for entry in self.mirror_textures if entry[0] is not mirrorTexture]
+        ovr.destroyMirrorTexture(self.session, mirrorTexture)
+
+    def destroy(self):
+        "Destroys the textures and the session"
+        self._destroy_session()
+        self.swap_chains = []
+        self.mirror_textures = []
+        self.session = None
+        self.luid = None
+        self.hmdDesc = None
+
+    def _destroy_session(self):
+        if not self._created:
+            return
+        self._created = False
+        for chain, desc in self.swap_chains:
+            ovr.destroyTextureSwapChain(self.session, chain)
+        for mirrorTexture, desc in self.mirror_textures:
+            ovr.destroyMirrorTexture(self.session, mirrorTexture)
+        ovr.destroy(self.session)
+
+    def recover(self, timeout=None, retryInterval=1.0):
+        """
+        Destroys the session and its textures, then creates them again, retrying
+        every retryInterval seconds while no HMD is available, for at most timeout
+        seconds (None waits indefinitely), else re-raising the error of ovr.create();
+        recover() may then be called again. Returns whether the new session uses the
+        graphics adapter of the old one, given by its GraphicsLuid.
+        Failures raise even while ovr.setRaiseOnError(False) is in effect, so that
+        recover() never leaves a NULL session or texture behind.
+        """
+        previous = ovr.setRaiseOnError(True)
+        try:
+            return self._recover(timeout, retryInterval)
+        finally:
+            ovr.setRaiseOnError(previous)
+
+    def _recover(self, timeout, retryInterval):
+        self._destroy_session()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                session, luid = ovr.create()
+                break
+            except ovr.OculusFunctionError:
+                if deadline is not None and time.monotonic() + retryInterval > deadline:
+                    raise
+                time.sleep(retryInterval)
+        # Without an old session, as after destroy(), there is no adapter to compare with
+        sameAdapter = self.luid is not None and bytes(luid) == bytes(self.luid)
+        if self.session is None:
+            self.session = session
+        else:
+            self.session.contents = session.contents # existing references now name the new session
+        self.luid = luid
+        self.hmdDesc = ovr.getHmdDesc(self.session)
+        for chain, desc in self.swap_chains:
+            chain.contents = ovr.createTextureSwapChainGL(self.session, desc).contents
+        for mirrorTexture, desc in self.mirror_textures:
+            mirrorTexture.contents = ovr.createMirrorTextureGL(self.session, desc).contents
+        self._created = True
+        self.recoveries += 1
+        return sameAdapter
@@ -0,0 +1,122 @@
+"""
+Asynchronous readback of the mirror texture for recording and spectating.
+
+Reading the mirror texture with glReadPixels into client memory stalls the
+render thread until the GPU has finished the frame. MirrorCapture instead
+reads each captured frame into one of a ring of pixel buffer objects and
+fences it; the buffer is mapped depth captures later, when the GPU has long
+finished with it, and copied into a NumPy array:
+
+    capture = MirrorCapture(session, mirrorTexture, windowSize, every=2, sink=encoder.write)
+    while running:
+        ... render and submit the frame ...
+        capture.capture(frameIndex)
+    capture.close()
+
+Without a sink, captured frames are kept for get(). With one, sink(frameIndex,
+pixels) is called on a worker thread; frames that arrive while the sink is
+busy and its queue is full are dropped rather than stalling the render thread,
+see FrameQueue.
+Pixels are (height, width, 4) RGBA uint8 arrays, top row first.
+Requires a current OpenGL context, on the thread that calls capture(), and NumPy.
+"""
+
+import collections
+import ctypes
+
+import numpy
+from OpenGL.GL import *
+
+import ovr
+from ovr.frame_queue import FrameQueue
+
+
+class MirrorCapture(object):
+    "Ring of depth pixel buffer objects reading back every every-th mirror frame"
+
+    def __init__(self, session, mirrorTexture, size, depth=3, every=1, sink=None, queueSize=8):
+        self.width = size.w
+        self.height = size.h
+        self.depth = depth
+        self.every = every
+        self.sink = sink
+        self.captured = 0 # frames read back
+        self._calls = 0
+        self._frame_bytes = self.width * self.height * 4
+        self._fbo = glGenFramebuffers(1)
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self._fbo)
+        glFramebufferTexture2D(GL_READ_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D,
+                ovr.getMirrorTextureBufferGL(session, mirrorTexture), 0)
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, 0)
+        self._pbos = list(glGenBuffers(depth)) if depth > 1 else [glGenBuffers(1)]
+        for pbo in self._pbos:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self._frame_bytes, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._pending = collections.deque() # (slot, fence, frameIndex), oldest first
+        self._next_slot = 0
+        self._frames = FrameQueue(sink, queueSize)
+
+    @property
+    def dropped(self):
+        "Frames read back but not kept, for lack of queue space or after an error of the sink"
+        return self._frames.dropped
+
+    def capture(self, frameIndex):
+        """
+        Starts reading back the current mirror image as frame frameIndex, unless
+        decimation skips it, and collects the readbacks the GPU has completed
+        """
+        self._collect(False)
+        self._calls += 1
+        if (self._calls - 1) % self.every:
+            return
+        if len(self._pending) == len(self._pbos):
+            self._finish(*self._pending.popleft()) # ring full: the oldest readback has to complete now
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % len(self._pbos)
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self._fbo)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self._pbos[slot])
+        glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, 0)
+        self._pending.append((slot, glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0), frameIndex))
+
+    def _collect(self, wait):
+        "Finishes the pending readbacks whose fences have signaled, or all of them if wait"
+        while self._pending:
+            slot, fence, frameIndex = self._pending[0]
+            if not wait:
+                status = glClientWaitSync(fence, 0, 0)
+                if status not in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED):
+                    return
+            self._pending.popleft()
+            self._finish(slot, fence, frameIndex)
+
+    def _finish(self, slot, fence, frameIndex):
+        glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, 1000000000)
+        glDeleteSync(fence)
+        pixels = numpy.empty((self.height, self.width, 4), dtype=numpy.uint8)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self._pbos[slot])
+        address = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, self._frame_bytes, GL_MAP_READ_BIT)
+        ctypes.memmove(pixels.ctypes.data, address, self._frame_bytes)
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.captured += 1
+        self._frames.put(frameIndex, pixels[::-1]) # GL rows are bottom row first
+
+    def get(self, timeout=0):
+        "Without a sink, returns the oldest kept (frameIndex, pixels), or None"
+        return self._frames.get(timeout)
+
+    def close(self):
+        """
+        Finishes the pending readbacks, waits for the sink to consume them, and frees
+        the GL objects; raises the error of the sink, if any
+        """
+        self._collect(True)
+        try:
+            self._frames.close()
+        finally:
+            glDeleteBuffers(len(self._pbos), self._pbos)
+            glDeleteFramebuffers(1, [self._fbo])
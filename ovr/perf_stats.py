@@ -0,0 +1,154 @@
+"""
+Accumulation of compositor performance stats.
+
+ovr.getPerfStats() only returns the few PerfStatsPerCompositorFrame entries
+produced since the previous call. PerfStatsCollector polls it once per frame,
+keeps one entry per HmdVsyncIndex in fixed-size ctypes arrays, and reports
+rolling percentiles over them:
+
+    stats = PerfStatsCollector(session, budgets={"AppMotionToPhotonLatency": 0.020})
+    stats.add_callback(lambda name, value, budget, frame: log.warning("%s over budget: %s", name, value))
+    while running:
+        ... render and submit a frame ...
+        stats.poll()
+    p50, p95, p99 = stats.percentiles("AppGpuElapsedTime")
+
+Dropped frame counts are reported by the runtime as running totals; the
+collector stores the number of frames dropped since the previous entry, so
+that budgets and percentiles apply per compositor frame.
+"""
+
+import ctypes
+import math
+
+import ovr
+
+
+DEFAULT_FIELDS = (
+    "AppDroppedFrameCount",
+    "AppMotionToPhotonLatency",
+    "AppCpuElapsedTime",
+    "AppGpuElapsedTime",
+    "CompositorDroppedFrameCount",
+    "CompositorLatency",
+)
+
+# Running totals, stored as per-frame increments
+COUNTER_FIELDS = frozenset(["AppDroppedFrameCount", "CompositorDroppedFrameCount", "AswFailedFrameCount"])
+
+
+class PerfStatsCollector(object):
+    """
+    Ring of the last capacity compositor frames of perf stats.
+
+    budgets maps field names to the largest acceptable value per compositor
+    frame; every recorded frame that exceeds one calls each callback with
+    (name, value, budget, frame), frame being the PerfStatsPerCompositorFrame.
+    The default budget allows no dropped application frames.
+    """
+
+    def __init__(self, session, capacity=1024, fields=DEFAULT_FIELDS, budgets=None):
+        self.session = session
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self.vsync_index = (ctypes.c_int * capacity)()
+        self.app_frame_index = (ctypes.c_int * capacity)()
+        self.series = {}
+        for name in self.fields:
+            self.series[name] = (self._ctype(name) * capacity)()
+        self.budgets = {"AppDroppedFrameCount": 0} if budgets is None else dict(budgets)
+        for name in self.budgets:
+            if name not in self.series:
+                raise ValueError("%s is not one of the collected fields" % name)
+        self.callbacks = []
+        self.count = 0 # total frames recorded; frame i lives in slot i % capacity
+        self.stats_dropped = 0 # polls that found frames missing since the previous poll
+        self._stats = ovr.PerfStats()
+        self._last_vsync_index = -1
+        self._last_totals = dict.fromkeys(COUNTER_FIELDS.intersection(self.fields))
+
+    @staticmethod
+    def _ctype(name):
+        try:
+            return dict(ovr.PerfStatsPerCompositorFrame._fields_)[name]
+        except KeyError:
+            raise ValueError("PerfStatsPerCompositorFrame has no field %s" % name)
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def reset(self):
+        "Resets the runtime's counters along with the collected frames"
+        ovr.resetPerfStats(self.session)
+        self.count = 0
+        self._last_vsync_index = -1
+        self._last_totals = dict.fromkeys(self._last_totals)
+
+    def poll(self):
+        "Records the compositor frames completed since the previous poll; returns how many"
+        stats = ovr.getPerfStats(self.session, self._stats)
+        if stats.AnyFrameStatsDropped:
+            self.stats_dropped += 1
+        added = 0
+        for i in range(stats.FrameStatsCount - 1, -1, -1): # oldest first
+            frame = stats.FrameStats[i]
+            if frame.HmdVsyncIndex <= self._last_vsync_index:
+                continue # reported by an earlier poll
+            self._last_vsync_index = frame.HmdVsyncIndex
+            self._record(frame)
+            added += 1
+        return added
+
+    def _record(self, frame):
+        slot = self.count % self.capacity
+        self.vsync_index[slot] = frame.HmdVsyncIndex
+        self.app_frame_index[slot] = frame.AppFrameIndex
+        for name in self.fields:
+            value = getattr(frame, name)
+            if name in self._last_totals:
+                last = self._last_totals[name]
+                self._last_totals[name] = value
+                value = 0 if last is None else max(0, value - last)
+            self.series[name][slot] = value
+        self.count += 1
+        for name, budget in self.budgets.items():
+            value = self.series[name][slot]
+            if value > budget:
+                for callback in self.callbacks:
+                    callback(name, value, budget, frame)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def values(self, name, window=None):
+        "Returns the last window (by default all buffered) values of field name, oldest first"
+        n = len(self) if window is None else min(window, len(self))
+        ring = self.series[name]
+        first = self.count - n
+        return [ring[i % self.capacity] for i in range(first, self.count)]
+
+    def percentiles(self, name, percents=(50, 95, 99), window=None):
+        """
+        Returns the nearest-rank percentiles of field name over the last window
+        frames, or Nones before the first frame
+        """
+        values = sorted(self.values(name, window))
+        if not values:
+            return tuple(None for p in percents)
+        last = len(values) - 1
+        return tuple(values[min(last, max(0, int(math.ceil(p * len(values) / 100.0)) - 1))] for p in percents)
+
+    def by_app_frame_index(self):
+        "Returns {AppFrameIndex: {field: value}} for the buffered frames"
+        result = {}
+        for i in range(self.count - len(self), self.count):
+            slot = i % self.capacity
+            result[self.app_frame_index[slot]] = dict((name, self.series[name][slot]) for name in self.fields)
+        return result
+
+    def summary(self, window=None):
+        "Returns {field: (p50, p95, p99)} for all collected fields"
+        result = {}
+        for name in self.fields:
+            result[name] = self.percentiles(name, window=window)
+        return result
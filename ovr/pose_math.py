@@ -0,0 +1,215 @@
+"""
+Batched pose math with NumPy.
+
+as_array() views a ctypes ovr structure, or an array of them such as
+(ovr.Posef * N)() or the HandPoses of a TrackingState, as a NumPy
+structured array without copying. In these views vectors and quaternions
+are float32 subarrays, so poses['Orientation'] is an (N, 4) array of
+(x, y, z, w) quaternions and poses['Position'] an (N, 3) array:
+
+    poses = pose_math.as_array(ovr.calcEyePoses(headPose, hmdToEyeOffset))
+    views = pose_math.pose_to_matrix(*pose_math.pose_inverse(poses['Orientation'], poses['Position']))
+
+The functions below operate on the last axis and broadcast over all others,
+so one call handles any number of poses. Quaternions use the LibOVR (x, y, z, w)
+component order and matrices the ovr.Matrix4f row-major convention.
+Recorded poses can be viewed the same way, e.g.
+numpy.frombuffer(data, pose_math.dtype(ovr.PoseStatef)).
+
+Requires NumPy, which the rest of ovr does not.
+"""
+
+import ctypes
+
+import numpy
+
+import ovr
+
+
+_VECTOR_DTYPES = {
+    ovr.Vector2i: numpy.dtype((numpy.int32, 2)),
+    ovr.Sizei: numpy.dtype((numpy.int32, 2)),
+    ovr.Vector2f: numpy.dtype((numpy.float32, 2)),
+    ovr.Vector3f: numpy.dtype((numpy.float32, 3)),
+    ovr.Quatf: numpy.dtype((numpy.float32, 4)),
+    ovr.Matrix4f: numpy.dtype((numpy.float32, (4, 4))),
+}
+_dtypes = {}
+
+
+def dtype(ctype):
+    """
+    Returns the NumPy dtype with the memory layout of ctypes type ctype, in which
+    vectors, quaternions and matrices are plain subarrays.
+    """
+    try:
+        return _dtypes[ctype]
+    except KeyError:
+        pass
+    if ctype in _VECTOR_DTYPES:
+        result = _VECTOR_DTYPES[ctype]
+    elif issubclass(ctype, ctypes.Array):
+        result = numpy.dtype((dtype(ctype._type_), (ctype._length_,)))
+    elif issubclass(ctype, ctypes.Structure):
+        names = [field[0] for field in ctype._fields_]
+        result = numpy.dtype({
+            "names": names,
+            "formats": [dtype(field[1]) for field in ctype._fields_],
+            "offsets": [getattr(ctype, name).offset for name in names],
+            "itemsize": ctypes.sizeof(ctype),
+        })
+    else:
+        try:
+            result = numpy.dtype(ctype)
+        except (TypeError, ValueError, NotImplementedError): # e.g. pointers
+            result = numpy.dtype((numpy.void, ctypes.sizeof(ctype)))
+    _dtypes[ctype] = result
+    return result
+
+
+def as_array(obj):
+    """
+    Returns a NumPy view of ctypes structure obj, or of an array of structures.
+    Writing to the view writes to obj, which must outlive it.
+    """
+    ctype = type(obj)
+    shape = ()
+    while issubclass(ctype, ctypes.Array) and ctype not in _VECTOR_DTYPES:
+        shape += (ctype._length_,)
+        ctype = ctype._type_
+    return numpy.ndarray(shape, dtype(ctype), buffer=obj)
+
+
+def quat_multiply(a, b):
+    "Hamilton product a * b, i.e. rotation b followed by rotation a"
+    a = numpy.asarray(a)
+    b = numpy.asarray(b)
+    ax, ay, az, aw = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bx, by, bz, bw = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+    return numpy.stack([
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+        aw * bw - ax * bx - ay * by - az * bz,
+    ], axis=-1)
+
+
+def quat_conjugate(q):
+    q = numpy.asarray(q)
+    return q * numpy.array([-1, -1, -1, 1], dtype=q.dtype)
+
+
+def quat_inverse(q):
+    "Inverse rotation; equal to quat_conjugate() for unit quaternions"
+    q = numpy.asarray(q)
+    return quat_conjugate(q) / numpy.sum(q * q, axis=-1, keepdims=True)
+
+
+def quat_normalize(q):
+    q = numpy.asarray(q)
+    return q / numpy.sqrt(numpy.sum(q * q, axis=-1, keepdims=True))
+
+
+def quat_rotate(q, v):
+    "Rotates vectors v by unit quaternions q"
+    q = numpy.asarray(q)
+    v = numpy.asarray(v)
+    u = q[..., :3]
+    t = 2.0 * numpy.cross(u, v)
+    return v + q[..., 3:] * t + numpy.cross(u, t)
+
+
+def quat_slerp(a, b, t):
+    "Spherical linear interpolation from unit quaternions a to b, along the shorter arc"
+    a = numpy.asarray(a)
+    b = numpy.asarray(b)
+    t = numpy.asarray(t, dtype=a.dtype)[..., numpy.newaxis]
+    dot = numpy.sum(a * b, axis=-1, keepdims=True)
+    b = numpy.where(dot < 0.0, -b, b)
+    dot = numpy.abs(dot)
+    theta = numpy.arccos(numpy.clip(dot, -1.0, 1.0))
+    sin_theta = numpy.sin(theta)
+    close = sin_theta < 1e-6 # nearly parallel: lerp, then normalize below
+    safe_sin = numpy.where(close, 1.0, sin_theta)
+    wa = numpy.where(close, 1.0 - t, numpy.sin((1.0 - t) * theta) / safe_sin)
+    wb = numpy.where(close, t, numpy.sin(t * theta) / safe_sin)
+    return quat_normalize(wa * a + wb * b)
+
+
+def euler_angles(q, axis1=0, axis2=1, axis3=2, rotate_direction=1, handedness=1):
+    """
+    Batched ovr.Quatf.getEulerAngles(): returns an array of (a, b, c) angles
+    in radians, with the same axis and sign conventions.
+    """
+    assert(axis1 != axis2)
+    assert(axis1 != axis3)
+    assert(axis2 != axis3)
+    q = numpy.asarray(q)
+    w = q[..., 3]
+    q1, q2, q3 = q[..., axis1], q[..., axis2], q[..., axis3]
+    ww, q11, q22, q33 = w * w, q1 * q1, q2 * q2, q3 * q3
+    psign = -1.0
+    # Determine whether even permutation
+    if ((axis1 + 1) % 3 == axis2) and ((axis2 + 1) % 3 == axis3):
+        psign = 1.0
+    s2 = psign * 2.0 * (psign * w * q2 + q1 * q3)
+    SingularityRadius = 1e-10
+    SD = handedness * rotate_direction
+    pole = numpy.abs(s2) > 1.0 - SingularityRadius
+    pole_c = SD * numpy.arctan2(2.0 * (psign * q1 * q2 + w * q3), ww + q22 - q11 - q33)
+    a = numpy.where(pole, 0.0, -SD * numpy.arctan2(-2.0 * (w * q1 - psign * q2 * q3), ww + q33 - q11 - q22))
+    b = numpy.where(pole, numpy.sign(s2) * SD * numpy.pi / 2, SD * numpy.arcsin(numpy.clip(s2, -1.0, 1.0)))
+    c = numpy.where(pole, pole_c, SD * numpy.arctan2(2.0 * (w * q3 - psign * q1 * q2), ww + q11 - q22 - q33))
+    return numpy.stack([a, b, c], axis=-1)
+
+
+def quat_to_matrix(q):
+    "Returns the 3x3 rotation matrices of unit quaternions q"
+    q = numpy.asarray(q)
+    x, y, z, w = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+    m = numpy.stack([
+        1.0 - 2.0 * (yy + zz), 2.0 * (xy - wz), 2.0 * (xz + wy),
+        2.0 * (xy + wz), 1.0 - 2.0 * (xx + zz), 2.0 * (yz - wx),
+        2.0 * (xz - wy), 2.0 * (yz + wx), 1.0 - 2.0 * (xx + yy),
+    ], axis=-1)
+    return m.reshape(q.shape[:-1] + (3, 3))
+
+
+def pose_to_matrix(orientation, position=None):
+    """
+    Returns the row-major 4x4 transforms of poses, given as orientations and positions
+    or as a single structured array of ovr.Posef
+    """
+    if position is None:
+        orientation, position = orientation["Orientation"], orientation["Position"]
+    rotation = quat_to_matrix(orientation)
+    position = numpy.asarray(position)
+    shape = numpy.broadcast_shapes(rotation.shape[:-2], position.shape[:-1])
+    m = numpy.zeros(shape + (4, 4), dtype=numpy.result_type(rotation, position))
+    m[..., :3, :3] = rotation
+    m[..., :3, 3] = position
+    m[..., 3, 3] = 1.0
+    return m
+
+
+def pose_inverse(orientation, position):
+    "Returns the (orientation, position) of the inverse poses"
+    inverse = quat_conjugate(orientation)
+    return inverse, -quat_rotate(inverse, position)
+
+
+def pose_transform(orientation, position, points):
+    "Transforms points from pose space to the parent space"
+    return quat_rotate(orientation, points) + numpy.asarray(position)
+
+
+def view_projection(projections, orientation, position, out=None):
+    """
+    Returns the row-major view-projection matrices of eyes at poses (orientation,
+    position), given their projections, such as ovr.Matrix4f.as_numpy() of each eye
+    """
+    views = pose_to_matrix(*pose_inverse(orientation, position))
+    return numpy.matmul(projections, views, out=out)
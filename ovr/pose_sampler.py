@@ -0,0 +1,193 @@
+"""
+Background sampling of tracking state at rates above the frame rate.
+
+PoseSampler polls ovr.getTrackingState() (and optionally ovr.getDevicePoses())
+on its own thread, e.g. at 1000 Hz for input or physics code, and stores
+the results in a ring buffer allocated once as ctypes arrays. Readers on
+other threads take the latest sample or the samples of a time window without
+taking a lock, so they never block the sampler:
+
+    sampler = PoseSampler(session, rate=1000.0, capacity=2048)
+    sampler.start()
+    ...
+    state = sampler.latest()
+    times, states = sampler.window(now - 0.05, now)
+    ...
+    sampler.stop()
+
+If sampling fails on the sampler thread, e.g. because the session was lost,
+the thread stops, and latest(), window() and stop() raise the error.
+"""
+
+import ctypes
+import threading
+import time
+
+import ovr
+
+
+class PoseSampler(object):
+    """
+    Fixed-capacity ring of TrackingState samples, each stamped with the
+    ovr.getTimeInSeconds() at which it was taken.
+
+    There is a single writer, the sampler thread or whoever calls sample().
+    Each sample is copied into its slot before the sample count is published,
+    and readers retry a copy whose slot was overwritten while they read it.
+    """
+
+    def __init__(self, session, rate=1000.0, capacity=1024, deviceTypes=None, latencyMarker=False):
+        self.session = session
+        self.rate = rate
+        self.capacity = capacity
+        self.latency_marker = latencyMarker
+        self.times = (ctypes.c_double * capacity)()
+        self.states = (ovr.TrackingState * capacity)()
+        self.device_types = list(deviceTypes or [])
+        if self.device_types:
+            self.device_poses = ((ovr.PoseStatef * len(self.device_types)) * capacity)()
+            self._device_types = (ovr.TrackedDeviceType * len(self.device_types))(*self.device_types)
+        else:
+            self.device_poses = None
+        # Views of the slots, made once so that sampling fills them in place without allocating
+        self._state_slots = [self.states[i] for i in range(capacity)]
+        self._pose_slots = [self.device_poses[i] for i in range(capacity)] if self.device_types else None
+        self.count = 0 # total samples taken; sample i lives in slot i % capacity
+        self.overruns = 0 # samples taken late because the previous one took longer than 1/rate
+        self.error = None # exception that stopped the sampler thread
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            raise RuntimeError("PoseSampler is already running")
+        self._stop.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="ovr.PoseSampler")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        "Stops the sampler thread; raises the exception that stopped it, if any"
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self._raise_error()
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def sample(self):
+        "Takes one sample now; called at rate Hz by the sampler thread"
+        slot = self.count % self.capacity
+        self.times[slot] = ovr.getTimeInSeconds()
+        ovr.getTrackingState(self.session, 0, self.latency_marker, self._state_slots[slot])
+        if self.device_poses is not None:
+            poses = self._pose_slots[slot]
+            if self._get_device_poses(poses) is None and self.count > 0:
+                previous = self._pose_slots[(self.count - 1) % self.capacity] # tracking is lost; keep the previous poses
+                ctypes.memmove(ctypes.addressof(poses), ctypes.addressof(previous), ctypes.sizeof(previous))
+        self.count += 1 # publish
+
+    def _get_device_poses(self, poses):
+        if ovr.SDK_MINOR_VERSION < 17: # the SDK 1.16 form takes the number of device types
+            return ovr.getDevicePoses(self.session, self._device_types, len(self._device_types), 0, poses)
+        return ovr.getDevicePoses(self.session, self._device_types, 0, poses)
+
+    def latest(self, out=None):
+        """
+        Copies the most recent TrackingState into out, or a new TrackingState,
+        and returns it; returns None before the first sample.
+        """
+        self._raise_error()
+        if out is None:
+            out = ovr.TrackingState()
+        size = ctypes.sizeof(ovr.TrackingState)
+        while True:
+            count = self.count
+            if count == 0:
+                return None
+            slot = (count - 1) % self.capacity
+            ctypes.memmove(ctypes.addressof(out), ctypes.addressof(self.states) + slot * size, size)
+            if self.count - count < self.capacity - 1: # the slot was not rewritten meanwhile
+                return out
+
+    def latest_time(self):
+        count = self.count
+        if count == 0:
+            return None
+        return self.times[(count - 1) % self.capacity]
+
+    def window(self, start, end=None):
+        """
+        Returns (times, states), new ctypes arrays holding the buffered samples taken
+        at start <= time <= end, oldest first. With deviceTypes, returns
+        (times, states, devicePoses).
+        """
+        self._raise_error()
+        while True:
+            count = self.count
+            first = max(0, count - self.capacity + 1) # leave out the slot being written
+            lo = self._search(first, count, start, False)
+            hi = count if end is None else self._search(lo, count, end, True)
+            result = tuple(self._copy(ring, lo, hi) for ring in self._rings())
+            if self.count - first < self.capacity: # none of the copied slots was rewritten
+                return result
+
+    def _rings(self):
+        if self.device_poses is None:
+            return (self.times, self.states)
+        return (self.times, self.states, self.device_poses)
+
+    def _search(self, lo, hi, t, after):
+        "First sample index in [lo, hi) taken after (or at, unless after) time t"
+        times = self.times
+        capacity = self.capacity
+        while lo < hi:
+            mid = (lo + hi) // 2
+            sampleTime = times[mid % capacity]
+            if sampleTime < t or (after and sampleTime == t):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _copy(self, ring, lo, hi):
+        "Copies samples [lo, hi) of ring into a new array, in at most two moves"
+        itemType = type(ring)._type_
+        size = ctypes.sizeof(itemType)
+        result = (itemType * (hi - lo))()
+        done = 0
+        while lo + done < hi:
+            slot = (lo + done) % self.capacity
+            n = min(hi - lo - done, self.capacity - slot)
+            ctypes.memmove(ctypes.addressof(result) + done * size, ctypes.addressof(ring) + slot * size, n * size)
+            done += n
+        return result
+
+    def _run(self):
+        period = 1.0 / self.rate
+        deadline = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                self.sample()
+                deadline += period
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    self.overruns += 1
+                    deadline = time.perf_counter() # don't try to catch up with a burst
+        except Exception as e:
+            self.error = e
+            self._stop.set()
@@ -0,0 +1,159 @@
+"""
+Cached reads of session properties.
+
+ovr.getFloat(), getInt(), getBool(), getString() and getFloatArray() call
+into the runtime every time, and applications read values like
+ovr.KEY_EYE_HEIGHT or "VsyncToNextVsync" every frame. PropertyCache keeps
+the values it read for a time to live, which can be set per property, and
+updates them when they are written through it:
+
+    properties = PropertyCache(session, ttl=1.0, ttls={ovr.KEY_PLAYER_HEIGHT: None})
+    properties.watch(statusMonitor)
+    while running:
+        eyeHeight = properties.get_float(ovr.KEY_EYE_HEIGHT, ovr.DEFAULT_EYE_HEIGHT)
+        ...
+    print("%.1f%% of the reads were cached" % (100 * properties.hit_rate))
+
+A ttl of None keeps a value until the cache is invalidated, either by
+invalidate(), or, once watch() was called, by a recenter request or a lost
+display reported by a SessionStatusMonitor. Rift offers a PropertyCache as
+rift.properties, for the reads that opt in to caching, and invalidates it
+when it re-creates the session.
+"""
+
+import ctypes
+import time
+
+import ovr
+from ovr.session_status import DisplayLostChanged, RecenterRequested, flag
+
+
+_BOOL, _INT, _FLOAT, _STRING, _FLOAT_ARRAY = range(5)
+_KINDS = (_BOOL, _INT, _FLOAT, _STRING, _FLOAT_ARRAY)
+
+_WRITTEN = object() # default of the entries of values written through the cache, which exist
+
+
+class PropertyCache(object):
+    """
+    Property values of session, each kept for ttls.get(propertyName, ttl)
+    seconds of clock(). Values read with a default are only reused for reads
+    with the same default.
+    """
+
+    def __init__(self, session, ttl=1.0, ttls=None, clock=time.monotonic):
+        self.session = session
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._values = {} # (kind, propertyName) -> (value, default, expiry time or None)
+        self._float_array = (ctypes.c_float * 0)()
+
+    @property
+    def hit_rate(self):
+        "Fraction of the reads answered from the cache, 0.0 before the first read"
+        reads = self.hits + self.misses
+        return self.hits / float(reads) if reads else 0.0
+
+    def invalidate(self, propertyName=None):
+        "Forgets the values of propertyName, or of all properties"
+        if propertyName is None:
+            self._values = {} # a read in flight stores its value in the forgotten dict
+            return
+        for kind in _KINDS:
+            self._values.pop((kind, propertyName), None)
+
+    def _expiry(self, propertyName, now):
+        ttl = self.ttls.get(propertyName, self.ttl)
+        return None if ttl is None else now + ttl
+
+    def _lookup(self, kind, propertyName, default):
+        "Returns the entry of propertyName if it is fresh and was read with default, else None"
+        entry = self._values.get((kind, propertyName))
+        if entry is not None and (entry[1] is _WRITTEN or entry[1] == default):
+            if entry[2] is None or self.clock() < entry[2]:
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def _read(self, kind, getter, propertyName, default):
+        entry = self._lookup(kind, propertyName, default)
+        if entry is not None:
+            return entry[0]
+        values = self._values
+        value = getter(self.session, propertyName, default)
+        values[(kind, propertyName)] = (value, default, self._expiry(propertyName, self.clock()))
+        return value
+
+    def _write(self, kind, setter, propertyName, value, cached):
+        "Calls setter, then caches value as cached if the runtime accepted it; returns whether it did"
+        self.invalidate(propertyName) # the property may change type
+        written = flag(setter(self.session, propertyName, value))
+        if written:
+            self._values[(kind, propertyName)] = (cached, _WRITTEN, self._expiry(propertyName, self.clock()))
+        return written
+
+    def get_bool(self, propertyName, default):
+        return self._read(_BOOL, _getBool, propertyName, bool(default))
+
+    def get_int(self, propertyName, default):
+        return self._read(_INT, ovr.getInt, propertyName, default)
+
+    def get_float(self, propertyName, default):
+        return self._read(_FLOAT, ovr.getFloat, propertyName, default)
+
+    def get_string(self, propertyName, default):
+        return self._read(_STRING, ovr.getString, propertyName, default)
+
+    def get_float_array(self, propertyName, capacity):
+        "Returns a tuple of at most capacity floats"
+        entry = self._lookup(_FLOAT_ARRAY, propertyName, capacity)
+        if entry is not None:
+            return entry[0][:capacity]
+        values = self._values
+        if len(self._float_array) < capacity:
+            self._float_array = (ctypes.c_float * capacity)()
+        count = ovr.getFloatArray(self.session, propertyName, self._float_array, capacity)
+        value = tuple(self._float_array[:count])
+        values[(_FLOAT_ARRAY, propertyName)] = (value, capacity, self._expiry(propertyName, self.clock()))
+        return value
+
+    def set_bool(self, propertyName, value):
+        "Writes through to ovr.setBool(); returns whether the runtime accepted the value"
+        return self._write(_BOOL, ovr.setBool, propertyName, value, bool(value))
+
+    def set_int(self, propertyName, value):
+        return self._write(_INT, ovr.setInt, propertyName, value, int(value))
+
+    def set_float(self, propertyName, value):
+        return self._write(_FLOAT, ovr.setFloat, propertyName, value, ctypes.c_float(value).value)
+
+    def set_string(self, propertyName, value):
+        return self._write(_STRING, ovr.setString, propertyName, value, value)
+
+    def set_float_array(self, propertyName, values):
+        values = (ctypes.c_float * len(values))(*values)
+        return self._write(_FLOAT_ARRAY, _setFloatArray, propertyName, values, tuple(values))
+
+    def watch(self, monitor):
+        "Invalidates the cache whenever SessionStatusMonitor monitor reports a recenter request or a lost display"
+        monitor.add_listener(self._on_status, RecenterRequested)
+        monitor.add_listener(self._on_status, DisplayLostChanged)
+
+    def unwatch(self, monitor):
+        monitor.remove_listener(self._on_status)
+
+    def _on_status(self, event):
+        if event.value:
+            self.invalidate()
+
+
+def _getBool(session, propertyName, default):
+    return flag(ovr.getBool(session, propertyName, default))
+
+
+def _setFloatArray(session, propertyName, values):
+    return ovr.setFloatArray(session, propertyName, values, len(values))
@@ -0,0 +1,296 @@
+"""
+Recording and deterministic replay of the tracking, input and session state
+an application saw.
+
+A log file holds the raw ctypes bytes of every TrackingState, InputState and
+SessionStatus returned by the runtime, each stamped with the runtime time
+(ovr.getTimeInSeconds()) at which it was queried, followed by a time index
+written when the log is closed. PoseLog reads a log through mmap without
+loading it into memory.
+
+Record a session by setting PYOVR_RECORD, and replay it, without a headset,
+through the "replay:" backend:
+
+    PYOVR_RECORD=session.ovrlog python my_app.py
+    PYOVR_BACKEND=replay:session.ovrlog python my_app.py
+
+ReplayRuntime is a SimulatedRuntime driven by a VirtualClock that starts at
+the first recorded time. ovr.getTrackingState(), getInputState() and
+getSessionStatus() return the last record taken at or before the current
+replay time, so the same frame loop sees the same states on every run.
+"""
+
+import bisect
+import ctypes
+import mmap
+import os
+import threading
+
+from .simulated_runtime import SimulatedRuntime, VirtualClock, _deref, _value
+
+
+MAGIC = b"PYOVRLOG"
+VERSION = 1
+
+# Record kinds, by the name of the ctypes structure they hold
+TRACKING_STATE = 1
+INPUT_STATE = 2
+SESSION_STATUS = 3
+_KINDS = {"TrackingState": TRACKING_STATE, "InputState": INPUT_STATE, "SessionStatus": SESSION_STATUS}
+
+
+class _FileHeader(ctypes.Structure):
+    _fields_ = [
+        ("Magic", ctypes.c_char * 8),
+        ("Version", ctypes.c_uint32),
+        ("Reserved", ctypes.c_uint32),
+    ]
+
+
+class _RecordHeader(ctypes.Structure):
+    "Precedes the payload, which is padded to a multiple of 8 bytes"
+    _fields_ = [
+        ("Time", ctypes.c_double),
+        ("Kind", ctypes.c_uint32),
+        ("Arg", ctypes.c_uint32), # controller type of an InputState
+        ("Size", ctypes.c_uint32),
+        ("Reserved", ctypes.c_uint32),
+    ]
+
+
+class _IndexEntry(ctypes.Structure):
+    _fields_ = [
+        ("Time", ctypes.c_double),
+        ("Offset", ctypes.c_uint64), # of the _RecordHeader
+        ("Kind", ctypes.c_uint32),
+        ("Arg", ctypes.c_uint32),
+    ]
+
+
+class _Footer(ctypes.Structure):
+    "Last bytes of a closed log"
+    _fields_ = [
+        ("IndexOffset", ctypes.c_uint64),
+        ("IndexCount", ctypes.c_uint64),
+        ("Magic", ctypes.c_char * 8),
+    ]
+
+
+def _padded(size):
+    return (size + 7) & ~7
+
+
+class Recorder(object):
+    """
+    Appends records to a log file. close() writes the time index; a log whose
+    recorder did not get to close it is still readable, just slower to open.
+    Records may be appended from any thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(_FileHeader(MAGIC, VERSION))
+        self._offset = ctypes.sizeof(_FileHeader)
+        self._index = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def record(self, time, state, arg=0):
+        "Appends state, a TrackingState, InputState or SessionStatus, taken at time"
+        size = ctypes.sizeof(state)
+        header = _RecordHeader(time, _KINDS[type(state).__name__], arg, size)
+        padding = _padded(size) - size
+        with self._lock:
+            if self._file is None:
+                return # closed, e.g. at exit while another thread still polls
+            self._file.write(header)
+            self._file.write(state)
+            if padding:
+                self._file.write(b"\0" * padding)
+            self._index.append((time, self._offset, header.Kind, arg))
+            self._offset += ctypes.sizeof(_RecordHeader) + size + padding
+
+    def close(self):
+        with self._lock:
+            if self._file is None:
+                return
+            index = (_IndexEntry * len(self._index))(*self._index)
+            self._file.write(index)
+            self._file.write(_Footer(self._offset, len(self._index), MAGIC))
+            self._file.close()
+            self._file = None
+
+
+class PoseLog(object):
+    "Read-only, memory-mapped view of a log written by Recorder"
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        header = _FileHeader.from_buffer(self._map)
+        if header.Magic != MAGIC or header.Version != VERSION:
+            raise ValueError("%s is not a version %d pose log" % (path, VERSION))
+        self._streams = {} # (kind, arg) -> ([times], [offsets])
+        for time, offset, kind, arg in self._entries():
+            times, offsets = self._streams.setdefault((kind, arg), ([], []))
+            times.append(time)
+            offsets.append(offset)
+
+    def close(self):
+        self._map.close()
+
+    def _entries(self):
+        footerOffset = len(self._map) - ctypes.sizeof(_Footer)
+        if footerOffset >= ctypes.sizeof(_FileHeader):
+            footer = _Footer.from_buffer(self._map, footerOffset)
+            if footer.Magic == MAGIC:
+                index = (_IndexEntry * footer.IndexCount).from_buffer(self._map, footer.IndexOffset)
+                return [(e.Time, e.Offset, e.Kind, e.Arg) for e in index]
+        return self._scan()
+
+    def _scan(self):
+        "Rebuilds the index of a log that was not closed"
+        entries = []
+        offset = ctypes.sizeof(_FileHeader)
+        while offset + ctypes.sizeof(_RecordHeader) <= len(self._map):
+            header = _RecordHeader.from_buffer(self._map, offset)
+            end = offset + ctypes.sizeof(_RecordHeader) + _padded(header.Size)
+            if header.Kind not in _KINDS.values() or end > len(self._map):
+                break # truncated record
+            entries.append((header.Time, offset, header.Kind, header.Arg))
+            offset = end
+        return entries
+
+    def __len__(self):
+        return sum(len(times) for times, offsets in self._streams.values())
+
+    def times(self, kind, arg=0):
+        "Record times of one stream, oldest first"
+        return self._streams.get((kind, arg), ([], []))[0]
+
+    def start_time(self):
+        starts = [times[0] for times, offsets in self._streams.values() if times]
+        return min(starts) if starts else 0.0
+
+    def find(self, kind, time, arg=0):
+        "Returns the offset of the last record of the stream taken at or before time, or None"
+        times, offsets = self._streams.get((kind, arg), ([], []))
+        i = bisect.bisect_right(times, time)
+        if i == 0:
+            return None
+        return offsets[i - 1]
+
+    def read(self, offset, out):
+        "Copies the payload of the record at offset into ctypes structure out and returns it"
+        header = _RecordHeader.from_buffer(self._map, offset)
+        if header.Size != ctypes.sizeof(out):
+            raise ValueError("Record of %d bytes does not fit %s" % (header.Size, type(out).__name__))
+        ctypes.memmove(ctypes.addressof(out), ctypes.addressof(header) + ctypes.sizeof(header), header.Size)
+        return out
+
+    def lookup(self, time, out, arg=0):
+        "Fills out with the record of its type taken at or before time; returns None if there is none"
+        offset = self.find(_KINDS[type(out).__name__], time, arg)
+        if offset is None:
+            return None
+        return self.read(offset, out)
+
+
+class _RecordingFunction(object):
+    "Forwards to a library function and hands its result to RecordingRuntime"
+
+    def __init__(self, function, record):
+        self.function = function
+        self.record = record
+
+    restype = property(lambda self: self.function.restype,
+                       lambda self, restype: setattr(self.function, "restype", restype))
+    argtypes = property(lambda self: self.function.argtypes,
+                        lambda self, argtypes: setattr(self.function, "argtypes", argtypes))
+
+    def __call__(self, *args):
+        result = self.function(*args)
+        self.record(result, *args)
+        return result
+
+
+class RecordingRuntime(object):
+    """
+    Library object that forwards every call to library, recording the results
+    of ovr_GetTrackingState, ovr_GetInputState and ovr_GetSessionStatus
+    """
+
+    def __init__(self, library, path):
+        self.library = library
+        self.recorder = Recorder(path)
+        self._time = library.ovr_GetTimeInSeconds
+        self._time.restype = ctypes.c_double
+
+    def __getattr__(self, name):
+        function = getattr(self.library, name)
+        record = getattr(self, "_record" + name[4:], None) if name.startswith("ovr_") else None
+        if record is not None:
+            function = _RecordingFunction(function, record)
+        setattr(self, name, function)
+        return function
+
+    def close(self):
+        self.recorder.close()
+
+    def _recordGetTrackingState(self, result, session, absTime, latencyMarker):
+        self.recorder.record(self._time(), result)
+
+    def _recordGetInputState(self, result, session, controllerType, inputState):
+        if result >= 0:
+            self.recorder.record(self._time(), _deref(inputState), _value(controllerType))
+
+    def _recordGetSessionStatus(self, result, session, sessionStatus):
+        if result >= 0:
+            self.recorder.record(self._time(), _deref(sessionStatus))
+
+
+class ReplayRuntime(SimulatedRuntime):
+    """
+    SimulatedRuntime that answers tracking, input and session status queries
+    from a log, by replay time. Before the first record of a stream, the
+    simulated values are returned.
+    """
+
+    def __init__(self, path, refresh_rate=90.0, clock=None):
+        self.log = PoseLog(path)
+        SimulatedRuntime.__init__(self, refresh_rate, clock=clock or VirtualClock(self.log.start_time()))
+
+    def _ovr_GetTrackingState(self, session, absTime, latencyMarker):
+        state = SimulatedRuntime._ovr_GetTrackingState(self, session, absTime, latencyMarker)
+        self.log.lookup(self._now(), state)
+        return state
+
+    def _ovr_GetInputState(self, session, controllerType, inputState):
+        result = SimulatedRuntime._ovr_GetInputState(self, session, controllerType, inputState)
+        if result >= 0:
+            self.log.lookup(self._now(), _deref(inputState), _value(controllerType))
+        return result
+
+    def _ovr_GetSessionStatus(self, session, sessionStatus):
+        result = SimulatedRuntime._ovr_GetSessionStatus(self, session, sessionStatus)
+        if result >= 0:
+            self.log.lookup(self._now(), _deref(sessionStatus))
+        return result
+
+
+def _closeOnExit(runtime):
+    import atexit
+    atexit.register(runtime.close)
+    return runtime
+
+
+def recordingBackend(library, path=None):
+    "Wraps library in a RecordingRuntime writing to path, by default $PYOVR_RECORD, closed at exit"
+    return _closeOnExit(RecordingRuntime(library, path or os.environ["PYOVR_RECORD"]))
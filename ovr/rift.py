@@ -3,6 +3,10 @@ import ctypes
 from OpenGL.GL import GL_RGBA8
 
 import ovr
+from ovr.frame_context import FrameContext
+from ovr.managed_session import ManagedSession
+from ovr.property_cache import PropertyCache
+from ovr.session_status import SessionStatusMonitor
 
 class Rift():
 
@@ -38,6 +42,9 @@ class Rift():
       self.session = None
       self.luid = None
       self.hmdDesc = None
+      self.status_monitor = None
+      self.properties = None # PropertyCache of the session, for reads that may be served from a cache
+      self.managed_session = ManagedSession() # tracks the textures to re-create after DisplayLost
 
     def __enter__(self):
       self.init()
@@ -58,13 +65,19 @@ class Rift():
       mirrorTextureDesc.MirrorOptions = ctypes.c_uint(0)
       # print self.session
       # print mirrorTextureDesc
-      result = ovr.createMirrorTextureGL(self.session, mirrorTextureDesc)
+      result = self.managed_session.create_mirror_texture(mirrorTextureDesc)
       return result
 
-    def create_swap_texture(self, size, format_ = ovr.OVR_FORMAT_R8G8B8A8_UNORM_SRGB):
+    def create_swap_texture(self, size, format_ = ovr.OVR_FORMAT_R8G8B8A8_UNORM_SRGB, arraySize = 1):
+      """
+      With arraySize = 2, returns a texture array chain holding the left eye in layer 0
+      and the right eye in layer 1, where supports_texture_arrays(); the PC runtime
+      rejects such chains at this time. LayerEyeFov has no array slice field, so a
+      compositor that accepts them may still show layer 0 to both eyes.
+      """
       textureSwapChainDesc = ovr.TextureSwapChainDesc()
       textureSwapChainDesc.Type = ovr.Texture_2D
-      textureSwapChainDesc.ArraySize = ctypes.c_int(1)
+      textureSwapChainDesc.ArraySize = ctypes.c_int(arraySize)
       textureSwapChainDesc.Format = format_
       textureSwapChainDesc.Width = size.w
       textureSwapChainDesc.Height = size.h
@@ -75,18 +88,30 @@ class Rift():
       textureSwapChainDesc.BindFlags = ctypes.c_uint(0)
       # print self.session
       # print textureSwapChainDesc
-      result = ovr.createTextureSwapChainGL(self.session, textureSwapChainDesc)
+      result = self.managed_session.create_swap_chain(textureSwapChainDesc)
       return result
 
+    def supports_texture_arrays(self):
+      "Whether create_swap_texture() accepts an arraySize of 2 with this runtime"
+      return self.managed_session.supports_texture_arrays()
+
     def destroy(self):
-      if self.session is not None:
-        ovr.destroy(self.session)
+      self.unwatch_session_status()
+      self.managed_session.destroy()
       self.session = None
+      self.properties = None
       self.luid = None
       self.hmdDesc = None
 
+    def destroy_mirror_texture(self, mirrorTexture):
+      return self.managed_session.destroy_mirror_texture(mirrorTexture)
+
     def destroy_swap_texture(self, textureSwapChain):
-      return ovr.destroyTextureSwapChain(self.session, textureSwapChain)
+      return self.managed_session.destroy_swap_chain(textureSwapChain)
+
+    def frame_loop(self, layers=(), hmdToEyePoses=None, worldScale=1.0):
+      "Returns a FrameContext, which reuses its ctypes buffers for every frame it submits"
+      return FrameContext(self.session, layers, hmdToEyePoses, worldScale)
 
     def get_current_texture_id_GL(self, textureSwapChain):
       return ovr.getTextureSwapChainBufferGL(self.session, textureSwapChain, -1)
@@ -122,8 +147,38 @@ class Rift():
       return ovr.getTrackingState(self.session, absTime, latencyMarker)
 
     def init(self):
-      self.session, self.luid = ovr.create()
-      self.hmdDesc = ovr.getHmdDesc(self.session)
+      self.session, self.luid = self.managed_session.create()
+      self.hmdDesc = self.managed_session.hmdDesc
+      self.properties = PropertyCache(self.session)
+
+    def recover_display_lost(self, timeout=None):
+      """
+      Re-creates the session, swap chains and mirror textures in place after
+      ovrError_DisplayLost; returns whether the graphics adapter is unchanged
+      """
+      monitor = self.status_monitor
+      self.unwatch_session_status()
+      sameAdapter = self.managed_session.recover(timeout)
+      self.luid = self.managed_session.luid
+      self.hmdDesc = self.managed_session.hmdDesc
+      self.properties.invalidate()
+      if monitor is not None:
+        self.watch_session_status(monitor.interval)
+      return sameAdapter
+
+    def watch_session_status(self, interval=0.1):
+      "Starts a SessionStatusMonitor polling every interval seconds, and returns it"
+      self.unwatch_session_status()
+      self.status_monitor = SessionStatusMonitor(self.session, interval)
+      if self.properties is not None:
+        self.properties.watch(self.status_monitor)
+      self.status_monitor.start()
+      return self.status_monitor
+
+    def unwatch_session_status(self):
+      if self.status_monitor is not None:
+        self.status_monitor.stop()
+        self.status_monitor = None
 
     def submit_frame(self, frameIndex, viewScaleDesc, layerPtrList):
       return ovr.submitFrame(self.session, frameIndex, viewScaleDesc, layerPtrList)
@@ -4,20 +4,30 @@ import math
 import ctypes
 from OpenGL.GL import *
 from ovr.rift import Rift
+from ovr.frame_profiler import FrameProfiler
+from ovr.managed_session import is_display_lost
+from ovr.mirror_capture import MirrorCapture
+from ovr.swap_chain_framebuffers import SwapChainFramebuffers
 import ovr
 
 class RiftGLRendererCompatibility(list):
     "Class RiftGLRenderer is a list of OpenGL actors"
 
-    def __init__(self, initParams = None):
+    def __init__(self, initParams = None, watchSessionStatus = False):
         self.layers = list()
         self.width = 100
         self.height = 100
         self.frame_index = 0
         self.textureSwapChain = None
+        self.mirror_capture = None
+        self.profiler = FrameProfiler(enabled=False) # set profiler.enabled to time the phases of each frame
+        self.skip_invisible_frames = True # don't render while the HMD shows another application, or nothing
+        self.visible = True # whether the last frame ended was visible in the HMD
         self.rift = Rift()
         Rift.initialize(initParams)
         self.rift.init()
+        if watchSessionStatus:
+            self.rift.watch_session_status() # session status events, see rift.status_monitor
 
     def display_gl(self):
         self.display_rift_gl()
@@ -41,54 +51,89 @@ class RiftGLRendererCompatibility(list):
             displayMidpointSeconds = self.rift.get_predicted_display_time(self.frame_index)
         return self.rift.get_tracking_state(displayMidpointSeconds, True), displayMidpointSeconds
 
-    def display_rift_gl(self, width, height):
-        frameHmdState, sensorSampleTime = self.get_frame_state()
-        # 2) Rift pass
-        texId, depthId, mirrorId = self._update_layer(frameHmdState.HeadPose.ThePose, sensorSampleTime)
-        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
-        glFramebufferTexture2D(GL_FRAMEBUFFER, 
-                GL_COLOR_ATTACHMENT0, 
-                GL_TEXTURE_2D,
-                texId,
-                0)
-        glFramebufferTexture2D(GL_FRAMEBUFFER, 
-                GL_DEPTH_ATTACHMENT, 
-                GL_TEXTURE_2D,
-                depthId,
-                0)
-        # print format(glCheckFramebufferStatus(GL_FRAMEBUFFER), '#X'), GL_FRAMEBUFFER_COMPLETE
-        glViewport(0, 0, self.texSize.w, self.texSize.h);
-        glDisable(GL_SCISSOR_TEST)
-        glDisable(GL_BLEND)
-        glEnable(GL_DEPTH_TEST)
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        glEnable(GL_FRAMEBUFFER_SRGB);
-        for eye in range(2):
-            # Set up eye viewport
-            v = self.layer.Viewport[eye]
-            glViewport(v.Pos.x, v.Pos.y, v.Size.w, v.Size.h)                
-            # Get projection matrix for the Rift camera
-            glMatrixMode(GL_PROJECTION)
-            glLoadIdentity()
-            proj = Rift.get_perspective(self.layer.Fov[eye], 0.2, 100.0, )
-            self.layer.ProjectionDesc = Rift.get_timewarp_projection_desc(proj)
-            glMultTransposeMatrixf(proj.M)
-            # Get view matrix for the Rift camera
-            glMatrixMode(GL_MODELVIEW)
-            glLoadIdentity()
-            p = self.layer.RenderPose[eye].Position
-            q = self.layer.RenderPose[eye].Orientation
-            pitch, yaw, roll = q.getEulerAngles()
-            glRotatef(-roll*180/math.pi, 0, 0, 1)
-            glRotatef(-yaw*180/math.pi, 0, 1, 0)
-            glRotatef(-pitch*180/math.pi, 1, 0, 0)
-            glTranslatef(-p.x, -p.y, -p.z)
-            # Render the scene for this eye.
-            for actor in self:
-                actor.display_gl()
-        self.commit()
-        self.submit_frame()
-        self.blit_mirror(width, height)
+    def display_rift_gl(self, width=None, height=None):
+        """
+        Renders and submits one frame, then blits the mirror texture to a window of
+        width x height, by default the size given to init_gl() or resize_gl()
+        """
+        if width is None:
+            width, height = self.width, self.height
+        try:
+            if not self._skip_frame():
+                self._display_rift_frame(width, height)
+        except ovr.OculusFunctionError as e:
+            if not is_display_lost(e):
+                raise
+            self.recover_display_lost()
+
+    def _display_rift_frame(self, width, height):
+        profiler = self.profiler
+        profiler.begin_frame(self.frame_context.frame_index)
+        with profiler.scope("display_rift_gl"):
+            with profiler.scope("wait_to_begin_frame"):
+                self.frame_context.wait_to_begin_frame()
+            with profiler.scope("begin_frame"):
+                self.frame_context.begin_frame()
+            with profiler.scope("get_frame_state"):
+                frameHmdState, sensorSampleTime = self.get_frame_state()
+            # 2) Rift pass
+            with profiler.scope("_update_layer"):
+                self._update_layer(frameHmdState.HeadPose.ThePose, sensorSampleTime)
+            # Bind the prebuilt framebuffer of the current swap chain images
+            self.framebuffers.bind()
+            glViewport(0, 0, self.texSize.w, self.texSize.h);
+            glDisable(GL_SCISSOR_TEST)
+            glDisable(GL_BLEND)
+            glEnable(GL_DEPTH_TEST)
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            glEnable(GL_FRAMEBUFFER_SRGB);
+            for eye in range(2):
+                with profiler.scope("eye"):
+                    self._draw_eye(eye)
+            with profiler.scope("commit"):
+                self.commit()
+            with profiler.scope("submit_frame"):
+                self.submit_frame()
+            with profiler.scope("blit_mirror"):
+                self.blit_mirror(width, height)
+
+    def _skip_frame(self):
+        """
+        Ends a frame without layers, instead of rendering one, while the application is
+        not visible in the HMD, so that the runtime keeps pacing the frame loop
+        """
+        if not self.skip_invisible_frames or self.visible:
+            return False
+        context = self.frame_context
+        context.wait_to_begin_frame()
+        context.begin_frame()
+        self.visible = context.end_empty_frame() != ovr.Success_NotVisible
+        self.frame_index = context.frame_index
+        return True
+
+    def _draw_eye(self, eye):
+        # Set up eye viewport
+        v = self.layer.Viewport[eye]
+        glViewport(v.Pos.x, v.Pos.y, v.Size.w, v.Size.h)                
+        # Get projection matrix for the Rift camera
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        proj = Rift.get_perspective(self.layer.Fov[eye], 0.2, 100.0, )
+        self.layer.ProjectionDesc = Rift.get_timewarp_projection_desc(proj)
+        glMultTransposeMatrixf(proj.as_numpy())
+        # Get view matrix for the Rift camera
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        p = self.layer.RenderPose[eye].Position
+        q = self.layer.RenderPose[eye].Orientation
+        pitch, yaw, roll = q.getEulerAngles()
+        glRotatef(-roll*180/math.pi, 0, 0, 1)
+        glRotatef(-yaw*180/math.pi, 0, 1, 0)
+        glRotatef(-pitch*180/math.pi, 1, 0, 0)
+        glTranslatef(-p.x, -p.y, -p.z)
+        # Render the scene for this eye.
+        for actor in self:
+            actor.display_gl()
 
     def blit_mirror(self, width, height):
         glBindFramebuffer(GL_READ_FRAMEBUFFER, self.mirrorFBO)
@@ -99,6 +144,8 @@ class RiftGLRendererCompatibility(list):
     def dispose_gl(self):
         for actor in self:
             actor.dispose_gl()
+        self.stop_mirror_capture()
+        self.framebuffers.destroy()
         if self.textureSwapChain is not None:
             self.rift.destroy_swap_texture(self.textureSwapChain)       
         if self.depthSwapChain is not None:
@@ -109,7 +156,6 @@ class RiftGLRendererCompatibility(list):
     def init_gl(self, windowSize):
         glClearColor(0, 0, 1, 0)
         self._init_rift_render_layer(windowSize)
-        self.fbo = glGenFramebuffers(1)
         self._set_up_desktop_projection()
         for actor in self:
             actor.init_gl()
@@ -121,22 +167,36 @@ class RiftGLRendererCompatibility(list):
         self._set_up_desktop_projection()
 
     def commit(self):
+        # 2d) Advance CurrentIndex within each used texture set to target the next consecutive texture buffer for the following frame.
         self.rift.commit_texture_swap_chain(self.textureSwapChain)
         self.rift.commit_texture_swap_chain(self.depthSwapChain)
 
     def submit_frame(self):
-        # 2c) Call ovr_SubmitFrame, passing swap texture set(s) from the previous step within a ovrLayerEyeFov structure. Although a single layer is required to submit a frame, you can use multiple layers and layer types for advanced rendering. ovr_SubmitFrame passes layer textures to the compositor which handles distortion, timewarp, and GPU synchronization before presenting it to the headset. 
-        layers = [self.layer.Header]
-        viewScale = ovr.ViewScaleDesc()
-        viewScale.HmdSpaceToWorldScaleInMeters = 1.0
-        viewScale.HmdToEyePose[0] = self.hmdToEyePose[0]
-        viewScale.HmdToEyePose[1] = self.hmdToEyePose[1]
-        result = self.rift.submit_frame(self.frame_index, viewScale, layers)
-        self.frame_index += 1
-
-    def _init_rift_render_layer(self, windowSize):
+        # 2c) Call ovr_EndFrame, passing swap texture set(s) from the previous step within a ovrLayerEyeFov structure. Although a single layer is required to submit a frame, you can use multiple layers and layer types for advanced rendering. ovr_EndFrame passes layer textures to the compositor which handles distortion, timewarp, and GPU synchronization before presenting it to the headset. 
+        self.visible = self.frame_context.end_frame() != ovr.Success_NotVisible
+        self.frame_index = self.frame_context.frame_index
+        if self.mirror_capture is not None:
+            self.mirror_capture.capture(self.frame_index - 1)
+
+    def start_mirror_capture(self, every=1, sink=None, depth=3):
+        """
+        Reads back every every-th mirror frame without stalling, see MirrorCapture;
+        frames go to sink(frameIndex, pixels), or are kept for mirror_capture.get()
+        """
+        self.stop_mirror_capture()
+        self.mirror_capture = MirrorCapture(self.rift.session, self.mirrorTexture, self.mirrorSize, depth, every, sink)
+        return self.mirror_capture
+
+    def stop_mirror_capture(self):
+        if self.mirror_capture is not None:
+            self.mirror_capture.close()
+            self.mirror_capture = None
+
+    def _init_rift_render_layer(self, windowSize, arraySize=1):
         """
         NOTE: Initialize OpenGL first (elsewhere), before getting Rift textures here.
+        With arraySize = 2, each eye gets a full layer of texture array swap chains
+        instead of half of a shared texture.
         """
         # Configure Stereo settings.
         # Use a single shared texture for simplicity
@@ -145,23 +205,25 @@ class RiftGLRendererCompatibility(list):
         recommenedTex0Size = self.rift.get_fov_texture_size(ovr.Eye_Left, hmdDesc.DefaultEyeFov[0])
         recommenedTex1Size = self.rift.get_fov_texture_size(ovr.Eye_Right, hmdDesc.DefaultEyeFov[1])
         bufferSize = ovr.Sizei()
-        bufferSize.w  = recommenedTex0Size.w + recommenedTex1Size.w
+        if arraySize == 2:
+            bufferSize.w = max ( recommenedTex0Size.w, recommenedTex1Size.w )
+        else:
+            bufferSize.w  = recommenedTex0Size.w + recommenedTex1Size.w
         bufferSize.h = max ( recommenedTex0Size.h, recommenedTex1Size.h )
         self.texSize = bufferSize
         # print("Recommended buffer size = ", bufferSize)
         # NOTE: We need to have set up OpenGL context before this point...
         # 1c) Allocate SwapTextureSets
-        self.textureSwapChain = self.rift.create_swap_texture(bufferSize)
-        self.depthSwapChain = self.rift.create_swap_texture(bufferSize, ovr.OVR_FORMAT_D32_FLOAT)
+        self.textureSwapChain = self.rift.create_swap_texture(bufferSize, arraySize=arraySize)
+        self.depthSwapChain = self.rift.create_swap_texture(bufferSize, ovr.OVR_FORMAT_D32_FLOAT, arraySize)
         self.mirrorTexture = self.rift.create_mirror_texture(windowSize)
-
-        mirrorId = ovr.getMirrorTextureBufferGL(self.rift.session, self.mirrorTexture)
+        self.mirrorSize = windowSize
+        self.width, self.height = windowSize.w, windowSize.h
+        # 1d) Build one framebuffer per swap chain image, instead of re-attaching textures every frame
+        self.framebuffers = SwapChainFramebuffers(self.rift.session, self.textureSwapChain, self.depthSwapChain)
 
         self.mirrorFBO = glGenFramebuffers(1)
-        glBindFramebuffer(GL_READ_FRAMEBUFFER, self.mirrorFBO)
-        glFramebufferTexture2D(GL_READ_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, mirrorId, 0)
-        glFramebufferRenderbuffer(GL_READ_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, 0)
-        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        self._attach_mirror_texture()
 
         # Initialize VR structures, filling out description.
         # 1ba) Compute FOV
@@ -178,15 +240,54 @@ class RiftGLRendererCompatibility(list):
         layer.Header.Flags     = ovr.LayerFlag_TextureOriginAtBottomLeft # OpenGL convention
         if ovr.MINOR_VERSION >= 25:
             ctypes.memset(layer.Header.Reserved, 0, len(layer.Header.Reserved))
+        self._assign_layer_textures(layer)
+        layer.Fov[0]           = eyeRenderDesc[0].Fov
+        layer.Fov[1]           = eyeRenderDesc[1].Fov
+        if arraySize == 2:
+            # Each eye covers the whole of its array layer
+            layer.Viewport[0]  = ovr.Recti(ovr.Vector2i(0, 0), bufferSize)
+            layer.Viewport[1]  = ovr.Recti(ovr.Vector2i(0, 0), bufferSize)
+        else:
+            layer.Viewport[0]  = ovr.Recti(ovr.Vector2i(0, 0),                     ovr.Sizei(int(bufferSize.w / 2), bufferSize.h))
+            layer.Viewport[1]  = ovr.Recti(ovr.Vector2i(int(bufferSize.w / 2), 0), ovr.Sizei(int(bufferSize.w / 2), bufferSize.h))
+        self.layer = layer
+        self.frame_context = self.rift.frame_loop([layer], hmdToEyePose)
+
+    def _attach_mirror_texture(self):
+        mirrorId = ovr.getMirrorTextureBufferGL(self.rift.session, self.mirrorTexture)
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self.mirrorFBO)
+        glFramebufferTexture2D(GL_READ_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, mirrorId, 0)
+        glFramebufferRenderbuffer(GL_READ_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, 0)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+    def _assign_layer_textures(self, layer):
         layer.ColorTexture[0]  = self.textureSwapChain # single texture for both eyes
         layer.ColorTexture[1]  = self.textureSwapChain # single texture for both eyes
         layer.DepthTexture[0]  = self.depthSwapChain
         layer.DepthTexture[1]  = self.depthSwapChain
-        layer.Fov[0]           = eyeRenderDesc[0].Fov
-        layer.Fov[1]           = eyeRenderDesc[1].Fov
-        layer.Viewport[0]      = ovr.Recti(ovr.Vector2i(0, 0),                     ovr.Sizei(int(bufferSize.w / 2), bufferSize.h))
-        layer.Viewport[1]      = ovr.Recti(ovr.Vector2i(int(bufferSize.w / 2), 0), ovr.Sizei(int(bufferSize.w / 2), bufferSize.h))
-        self.layer = layer
+
+    def recover_display_lost(self, timeout=None):
+        """
+        Re-creates the session and swap chains after ovrError_DisplayLost, and the
+        GL objects that refer to their textures. The actors keep their GL resources
+        if the new session is on the same graphics adapter, else they are re-created.
+        """
+        capture = self.mirror_capture
+        self.stop_mirror_capture()
+        self.framebuffers.destroy()
+        sameAdapter = self.rift.recover_display_lost(timeout)
+        if not sameAdapter:
+            for actor in self:
+                actor.dispose_gl()
+        self.framebuffers = SwapChainFramebuffers(self.rift.session, self.textureSwapChain, self.depthSwapChain)
+        self._attach_mirror_texture()
+        self._assign_layer_textures(self.layer) # the layer holds copies of the old handles
+        if not sameAdapter:
+            for actor in self:
+                actor.init_gl()
+        if capture is not None:
+            self.start_mirror_capture(capture.every, capture.sink, capture.depth)
+        return sameAdapter
 
     def _set_up_desktop_projection(self):
         # TODO: non-fixed-function pathway
@@ -204,15 +305,6 @@ class RiftGLRendererCompatibility(list):
         glMatrixMode(GL_MODELVIEW)
 
     def _update_layer(self, pose, sensorSampleTime):
-        hmdToEyeOffset = (ovr.Vector3f * 2)()
-        hmdToEyeOffset[0] = self.hmdToEyePose[0].Position
-        hmdToEyeOffset[1] = self.hmdToEyePose[1].Position
-        Rift.calc_eye_poses(pose, hmdToEyeOffset, self.layer.RenderPose)
+        self.frame_context.calc_eye_poses(pose, self.layer.RenderPose)
         self.layer.SensorSampleTime = sensorSampleTime
-        # Increment to use next texture, just before writing
-        # 2d) Advance CurrentIndex within each used texture set to target the next consecutive texture buffer for the following frame.
-        textureId = self.rift.get_current_texture_id_GL(self.textureSwapChain)
-        depthId = self.rift.get_current_texture_id_GL(self.depthSwapChain)
-        mirrorTextureId = ovr.getMirrorTextureBufferGL(self.rift.session, self.mirrorTexture)
-        return textureId, depthId, mirrorTextureId
 
@@ -0,0 +1,182 @@
+#!/bin/env python
+"""
+Core-profile OpenGL renderer for the Rift.
+
+Where RiftGLRendererCompatibility sets up fixed-function matrices and redraws
+every actor once per eye, RiftGLRendererCore uploads the view-projection
+matrices of both eyes to one uniform buffer per frame and has each actor
+draw both eyes in a single instanced draw call. Actors follow the same
+init_gl() / display_gl() / dispose_gl() protocol, with shaders built by
+link_stereo_program():
+
+    vertex = STEREO_VERTEX_SHADER_HEADER + '''
+    in vec3 position;
+    void main() { gl_Position = stereoPosition(vec4(position, 1.0)); }
+    '''
+    program = link_stereo_program(vertex, fragment)
+    ...
+    glDrawArraysInstanced(GL_TRIANGLES, 0, vertexCount, STEREO_INSTANCES)
+
+Instance 2 * i + eye draws instance i of the actor for that eye; stereoPosition()
+projects it into the half of the shared eye texture that belongs to the eye.
+With layered=True, the eyes instead render to the two layers of texture array
+swap chains, selected with gl_Layer from the vertex shader, so each eye gets a
+full-size texture while geometry is still submitted once per frame; this
+needs the GL_ARB_shader_viewport_layer_array extension and a runtime that
+accepts texture array swap chains. The PC runtime does not at this time, and
+LayerEyeFov has no field selecting the array slice of each eye, so without
+either the renderer falls back to the two halves of one texture, and sets
+layered to False.
+Requires an OpenGL 3.3 core profile context and NumPy.
+"""
+
+import numpy
+from OpenGL.GL import *
+from OpenGL.GL import shaders
+
+import ovr
+from ovr import pose_math
+from ovr.rift import Rift
+from ovr.rift_gl_renderer_compatibility import RiftGLRendererCompatibility
+
+
+EYE_MATRICES_BINDING = 0 # uniform buffer binding point of the EyeMatrices block
+STEREO_INSTANCES = 2 # instances per draw of a single object, one per eye
+
+LAYERED_EXTENSION = "GL_ARB_shader_viewport_layer_array"
+
+STEREO_VERTEX_SHADER_HEADER = """#version 330 core
+#extension GL_ARB_shader_viewport_layer_array : enable
+layout(std140, row_major) uniform EyeMatrices {
+    mat4 ViewProjection[2];
+    int Layered; // eyes are layers of texture arrays rather than halves of one texture
+};
+
+int stereoEye() {
+    return gl_InstanceID % 2;
+}
+
+int stereoInstance() {
+    return gl_InstanceID / 2;
+}
+
+// Projects worldPosition for the eye of this instance, into the layer of the eye,
+// or into the left or right half of the viewport, clipped at the middle
+vec4 stereoPosition(vec4 worldPosition) {
+    int eye = stereoEye();
+    vec4 p = ViewProjection[eye] * worldPosition;
+#ifdef GL_ARB_shader_viewport_layer_array
+    if (Layered != 0) {
+        gl_Layer = eye;
+        gl_ClipDistance[0] = 1.0;
+        return p;
+    }
+#endif
+    float side = float(eye) * 2.0 - 1.0;
+    p.x = 0.5 * p.x + 0.5 * side * p.w;
+    gl_ClipDistance[0] = side * p.x;
+    return p;
+}
+"""
+
+
+def link_stereo_program(vertexSource, fragmentSource):
+    "Compiles and links a program whose vertex shader starts with STEREO_VERTEX_SHADER_HEADER"
+    program = shaders.compileProgram(
+        shaders.compileShader(vertexSource, GL_VERTEX_SHADER),
+        shaders.compileShader(fragmentSource, GL_FRAGMENT_SHADER))
+    glUniformBlockBinding(program, glGetUniformBlockIndex(program, "EyeMatrices"), EYE_MATRICES_BINDING)
+    return program
+
+
+def has_extension(name):
+    "Whether the current OpenGL context supports extension name"
+    for i in range(glGetIntegerv(GL_NUM_EXTENSIONS)):
+        if glGetStringi(GL_EXTENSIONS, i) == name.encode("ascii"):
+            return True
+    return False
+
+
+class RiftGLRendererCore(RiftGLRendererCompatibility):
+    "Class RiftGLRendererCore is a list of core-profile OpenGL actors, drawn for both eyes at once"
+
+    def __init__(self, initParams = None, zNear = 0.2, zFar = 100.0, layered = False, watchSessionStatus = False):
+        self.zNear = zNear
+        self.zFar = zFar
+        self.layered = layered
+        self.eye_matrices = numpy.zeros((2, 4, 4), dtype=numpy.float32) # row-major view-projection per eye
+        self.ubo = None
+        super(RiftGLRendererCore, self).__init__(initParams, watchSessionStatus)
+
+    def display_gl(self):
+        self.display_rift_gl()
+
+    def _display_rift_frame(self, width, height):
+        profiler = self.profiler
+        profiler.begin_frame(self.frame_context.frame_index)
+        with profiler.scope("display_rift_gl"):
+            with profiler.scope("wait_to_begin_frame"):
+                self.frame_context.wait_to_begin_frame()
+            with profiler.scope("begin_frame"):
+                self.frame_context.begin_frame()
+            with profiler.scope("get_frame_state"):
+                frameHmdState, sensorSampleTime = self.get_frame_state()
+            with profiler.scope("_update_layer"):
+                self._update_layer(frameHmdState.HeadPose.ThePose, sensorSampleTime)
+                self._update_eye_matrices()
+            self.framebuffers.bind()
+            glViewport(0, 0, self.texSize.w, self.texSize.h)
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            with profiler.scope("draw"):
+                for actor in self:
+                    actor.display_gl()
+            with profiler.scope("commit"):
+                self.commit()
+            with profiler.scope("submit_frame"):
+                self.submit_frame()
+            with profiler.scope("blit_mirror"):
+                self.blit_mirror(width, height)
+
+    def _update_eye_matrices(self):
+        "Uploads the view-projection matrices of both eyes in one buffer update"
+        poses = pose_math.as_array(self.layer.RenderPose)
+        pose_math.view_projection(self.projections, poses["Orientation"], poses["Position"], out=self.eye_matrices)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, self.eye_matrices.nbytes, self.eye_matrices)
+
+    def dispose_gl(self):
+        if self.ubo is not None:
+            glDeleteBuffers(1, [self.ubo])
+            self.ubo = None
+        super(RiftGLRendererCore, self).dispose_gl()
+
+    def init_gl(self, windowSize):
+        glClearColor(0, 0, 1, 0)
+        if self.layered and not (has_extension(LAYERED_EXTENSION) and self.rift.supports_texture_arrays()):
+            self.layered = False # render both eyes side by side into one texture instead
+        self._init_rift_render_layer(windowSize, 2 if self.layered else 1)
+        # The eye FOVs are fixed, so the projections are computed once
+        projectionFlags = ovr.Projection_ClipRangeOpenGL
+        self.projections = numpy.empty((2, 4, 4), dtype=numpy.float32)
+        for eye in range(2):
+            proj = Rift.get_perspective(self.layer.Fov[eye], self.zNear, self.zFar, projectionFlags)
+            self.projections[eye] = proj.as_numpy()
+        self.layer.ProjectionDesc = Rift.get_timewarp_projection_desc(proj, projectionFlags)
+        # State that stays the same for every frame
+        self.ubo = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        layered = numpy.array([self.layered, 0, 0, 0], dtype=numpy.int32) # padded to a std140 vec4
+        glBufferData(GL_UNIFORM_BUFFER, self.eye_matrices.nbytes + layered.nbytes, None, GL_DYNAMIC_DRAW)
+        glBufferSubData(GL_UNIFORM_BUFFER, self.eye_matrices.nbytes, layered.nbytes, layered)
+        glBindBufferBase(GL_UNIFORM_BUFFER, EYE_MATRICES_BINDING, self.ubo)
+        glEnable(GL_CLIP_DISTANCE0)
+        glEnable(GL_DEPTH_TEST)
+        glEnable(GL_FRAMEBUFFER_SRGB)
+        glDisable(GL_SCISSOR_TEST)
+        glDisable(GL_BLEND)
+        for actor in self:
+            actor.init_gl()
+
+    def resize_gl(self, width, height):
+        self.width = width
+        self.height = height
@@ -0,0 +1,185 @@
+"""
+Session status change events.
+
+Rather than calling ovr.getSessionStatus() every frame and comparing its
+fields by hand, start a SessionStatusMonitor; it polls the status at a low
+rate on a worker thread, compares each result with the previous one as raw
+bytes, and only when they differ emits one event per changed flag:
+
+    monitor = SessionStatusMonitor(session, interval=0.1)
+    monitor.add_listener(on_quit, QuitRequested)
+    monitor.add_listener(on_display_lost, DisplayLostChanged)
+    with monitor:
+        while running:
+            if not monitor.visible:
+                context.wait_to_begin_frame() # nothing would be shown, so don't render,
+                context.begin_frame()         # but keep the runtime pacing the loop
+                context.end_empty_frame()
+                continue
+            ... render and submit the frame ...
+
+Listeners are called as listener(event) on the monitor thread, and must not
+block it for long. Rift.watch_session_status() starts a monitor for a Rift.
+"""
+
+import ctypes
+import threading
+
+import ovr
+
+
+STATUS_FIELDS = ("IsVisible", "HmdPresent", "HmdMounted", "DisplayLost", "ShouldQuit", "ShouldRecenter")
+
+
+def flag(value):
+    "The bool of an ovr.Bool field, which ctypes reads as bytes"
+    return value not in (b"\x00", 0, False)
+
+
+class SessionStatusEvent(object):
+    "Flag field of SessionStatus changed to value; status is the whole SessionStatus at that time"
+    __slots__ = ("field", "value", "status")
+
+    def __init__(self, field, value, status):
+        self.field = field
+        self.value = value
+        self.status = status
+
+    def __repr__(self):
+        return "%s(%s=%s)" % (type(self).__name__, self.field, self.value)
+
+
+class VisibilityChanged(SessionStatusEvent):
+    "The application gained (value True) or lost VR focus"
+    __slots__ = ()
+
+
+class HmdPresenceChanged(SessionStatusEvent):
+    "An HMD was connected (value True) or disconnected"
+    __slots__ = ()
+
+
+class HmdMountChanged(SessionStatusEvent):
+    "The HMD was put on (value True) or taken off"
+    __slots__ = ()
+
+
+class DisplayLostChanged(SessionStatusEvent):
+    "The session entered (value True) or left the display-lost state"
+    __slots__ = ()
+
+
+class QuitRequested(SessionStatusEvent):
+    "The runtime asks the application to shut down (value True)"
+    __slots__ = ()
+
+
+class RecenterRequested(SessionStatusEvent):
+    "The user asked to recenter (value True), or the request was handled"
+    __slots__ = ()
+
+
+EVENT_TYPES = {
+    "IsVisible": VisibilityChanged,
+    "HmdPresent": HmdPresenceChanged,
+    "HmdMounted": HmdMountChanged,
+    "DisplayLost": DisplayLostChanged,
+    "ShouldQuit": QuitRequested,
+    "ShouldRecenter": RecenterRequested,
+}
+
+
+class SessionStatusMonitor(object):
+    """
+    Polls the SessionStatus of session every interval seconds and dispatches a
+    SessionStatusEvent for every flag that changed. The first poll reports the
+    flags that are set.
+    """
+
+    def __init__(self, session, interval=0.1):
+        self.session = session
+        self.interval = interval
+        self.status = ovr.SessionStatus() # as of the latest poll
+        self.error = None # exception that stopped the monitor thread
+        self._current = ovr.SessionStatus()
+        self._size = ctypes.sizeof(ovr.SessionStatus)
+        self._listeners = [] # (listener, event type)
+        self._lock = threading.Lock()
+        self._visible = threading.Event()
+        self._visible.set() # until the first poll says otherwise
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def add_listener(self, listener, eventType=SessionStatusEvent):
+        "Calls listener(event) for every event that is an instance of eventType"
+        with self._lock:
+            self._listeners = self._listeners + [(listener, eventType)]
+
+    def remove_listener(self, listener):
+        with self._lock:
+            self._listeners = [entry for entry in self._listeners if entry[0] != listener]
+
+    @property
+    def visible(self):
+        "Whether the application is visible in the HMD, as of the latest poll"
+        return self._visible.is_set()
+
+    def wait_until_visible(self, timeout=None):
+        "Blocks until the application is visible or timeout seconds passed; returns visible"
+        return self._visible.wait(timeout)
+
+    def poll(self):
+        "Reads the session status once, dispatches the events of its changes, and returns them"
+        current = ovr.getSessionStatus(self.session, self._current)
+        if ctypes.string_at(ctypes.addressof(current), self._size) == ctypes.string_at(ctypes.addressof(self.status), self._size):
+            return []
+        snapshot = ovr.SessionStatus.from_buffer_copy(current)
+        events = []
+        for name in STATUS_FIELDS:
+            value = flag(getattr(current, name))
+            if value != flag(getattr(self.status, name)):
+                events.append(EVENT_TYPES[name](name, value, snapshot))
+        ctypes.memmove(ctypes.addressof(self.status), ctypes.addressof(current), self._size)
+        if flag(current.IsVisible):
+            self._visible.set()
+        else:
+            self._visible.clear()
+        listeners = self._listeners
+        for event in events:
+            for listener, eventType in listeners:
+                if isinstance(event, eventType):
+                    listener(event)
+        return events
+
+    def start(self):
+        "Polls once on the calling thread, then keeps polling on a worker thread"
+        if self._thread is not None:
+            raise RuntimeError("SessionStatusMonitor is already running")
+        self.poll()
+        self._stop.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="ovr.SessionStatusMonitor")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                self.poll()
+        except Exception as e:
+            self.error = e
+            self._visible.set() # don't leave a frame loop waiting on a dead monitor
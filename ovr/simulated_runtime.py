@@ -0,0 +1,987 @@
+"""
+Pure-Python stand-in for the LibOVRRT shared library.
+
+SimulatedRuntime answers the same ovr_* entry points that the ctypes bindings
+call on the real runtime, so "import ovr" and a complete frame loop work on
+machines without an Oculus runtime or headset (e.g. Linux build servers).
+Select it before importing ovr:
+
+    PYOVR_BACKEND=sim python my_app.py
+
+The simulated HMD runs a vsync clock at refresh_rate Hz and follows the
+head_motion callable, which maps a time in seconds to an orientation
+quaternion (x, y, z, w) and a position (x, y, z). Use a VirtualClock to make
+frame pacing deterministic and independent of wall-clock time. Once ovr is
+imported, the SimulatedRuntime instance in use is ovr.libovr.library.
+
+Entry points without a simulation return a zero-initialized value of their
+restype, i.e. ovrSuccess for functions returning an ovrResult. Set
+version_string (e.g. to b"1.16.0") to impersonate an older runtime; its
+ovr_Initialize then rejects newer requested minor versions.
+"""
+
+import collections
+import ctypes
+import io
+import math
+import os
+import struct
+import threading
+import time
+import wave
+
+
+# Result codes from OVR_ErrorCode.h
+_Success = 0
+_Success_NotVisible = 1000
+_Success_BoundaryInvalid = 1001
+_Success_DeviceUnavailable = 1002
+_Error_InvalidSession = -1002
+_Error_NotInitialized = -1004
+_Error_NoHmd = -1007
+_Error_InvalidParameter = -1005
+_Error_InvalidOperation = -1015
+_Error_LibVersion = -3002
+_Error_DisplayLost = -6000
+_Error_TextureSwapChainFull = -6001
+
+_Init_RequestVersion = 0x0004
+_Status_Tracked = 0x0003 # ovrStatus_OrientationTracked | ovrStatus_PositionTracked
+_TrackedDevice_HMD = 0x0001
+_TrackedDevice_LTouch = 0x0002
+_TrackedDevice_RTouch = 0x0004
+_ControllerType_LTouch = 0x0001
+_ControllerType_RTouch = 0x0002
+_ControllerType_Touch = 0x0003
+_Boundary_Outer = 0x0001
+_Boundary_PlayArea = 0x0100
+_Projection_LeftHanded = 0x01
+_Projection_FarLessThanNear = 0x02
+_Projection_FarClipAtInfinity = 0x04
+_Projection_ClipRangeOpenGL = 0x08
+_MaxProvidedFrameStats = 5
+
+# Rift CV1-like display parameters
+_RESOLUTION = (2160, 1200)
+_DEFAULT_EYE_FOV = ((1.3292, 1.3292, 1.0586, 1.0924), # Up, Down, Left, Right tangents
+                    (1.3292, 1.3292, 1.0924, 1.0586))
+_PIXELS_PER_TAN_ANGLE = (625.0, 602.0)
+_IPD = 0.064
+
+# Floor points, clockwise seen from above, of a 2 x 1.5 m play area inside a larger outer boundary
+_PLAY_AREA = [(-1.0, 0.0, -0.75), (1.0, 0.0, -0.75), (1.0, 0.0, 0.75), (-1.0, 0.0, 0.75)]
+_OUTER_BOUNDARY = [(-1.6, 0.0, -1.2), (0.0, 0.0, -1.8), (1.6, 0.0, -1.2), (1.6, 0.0, 1.2), (-1.6, 0.0, 1.2)]
+
+# Touch haptics engine: 320 Hz, one byte per sample, 256 sample queue
+_HAPTICS_DESC = collections.OrderedDict([
+    ("SampleRateHz", 320),
+    ("SampleSizeInBytes", 1),
+    ("QueueMinSizeToAvoidStarvation", 12),
+    ("SubmitMinSamples", 1),
+    ("SubmitMaxSamples", 256),
+    ("SubmitOptimalSamples", 20),
+])
+_HAPTICS_QUEUE_SIZE = 256
+
+
+class WallClock(object):
+    "Default clock of SimulatedRuntime: real time, real sleeps."
+
+    def now(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class VirtualClock(object):
+    """
+    Deterministic clock for SimulatedRuntime.
+    Time only moves when sleep() or advance() is called, so a frame loop runs
+    as fast as the CPU allows while reporting perfectly regular vsync timing.
+    """
+
+    def __init__(self, start=0.0):
+        self.time = start
+        self._lock = threading.Lock()
+
+    def now(self):
+        return self.time
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        with self._lock:
+            self.time += max(seconds, 0.0)
+
+
+def synthetic_head_motion(t):
+    "Default head motion: slow side-to-side look with a slight nod and sway."
+    yaw = 0.35 * math.sin(2.0 * math.pi * 0.20 * t)
+    pitch = 0.10 * math.sin(2.0 * math.pi * 0.45 * t)
+    cy, sy = math.cos(0.5 * yaw), math.sin(0.5 * yaw)
+    cp, sp = math.cos(0.5 * pitch), math.sin(0.5 * pitch)
+    # yaw about Y, then pitch about X
+    orientation = (cy * sp, sy * cp, -sy * sp, cy * cp)
+    position = (0.04 * math.sin(2.0 * math.pi * 0.15 * t),
+                0.01 * math.sin(2.0 * math.pi * 0.45 * t),
+                0.02 * math.sin(2.0 * math.pi * 0.10 * t))
+    return orientation, position
+
+
+def _quat_mul(a, b):
+    ax, ay, az, aw = a
+    bx, by, bz, bw = b
+    return (aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw,
+            aw * bw - ax * bx - ay * by - az * bz)
+
+
+def _quat_rotate(q, v):
+    x, y, z, w = _quat_mul(_quat_mul(q, (v[0], v[1], v[2], 0.0)), (-q[0], -q[1], -q[2], q[3]))
+    return (x, y, z)
+
+
+def _deref(arg):
+    "Recovers the ctypes object behind a byref() argument."
+    return getattr(arg, "_obj", arg)
+
+
+def _value(arg):
+    "Recovers the Python value of a simple ctypes argument."
+    return getattr(arg, "value", arg)
+
+
+def _truthy(arg):
+    value = _value(arg)
+    if isinstance(value, bytes):
+        return value != b"\x00"
+    return bool(value)
+
+
+def _ovr_bool(flag):
+    return b"\x01" if flag else b"\x00"
+
+
+def _zero(restype):
+    if restype is None:
+        return None
+    result = restype()
+    if isinstance(result, (ctypes.Structure, ctypes.Union, ctypes.Array)):
+        return result
+    return result.value
+
+
+class _Prototype(object):
+    "Takes the place of a ctypes foreign function object on SimulatedRuntime."
+
+    def __init__(self, name, simulation):
+        self.__name__ = name
+        self.restype = ctypes.c_int
+        self.argtypes = None
+        self._simulation = simulation
+
+    def __call__(self, *args):
+        if self._simulation is None:
+            return _zero(self.restype)
+        return self._simulation(*args)
+
+
+class _SwapChain(object):
+
+    def __init__(self, data, desc, first_texture_id):
+        self.data = data
+        self.desc = desc
+        length = 1 if _truthy(desc.StaticImage) else 3
+        self.texture_ids = list(range(first_texture_id, first_texture_id + length))
+        self.current_index = 0
+        self.committed = False
+
+
+class _HapticsChannel(object):
+    "The playback queue of one Touch controller, drained at SampleRateHz"
+
+    def __init__(self, now):
+        self.queue = bytearray()
+        self.time = now # playback time up to which samples were consumed
+        self.played = collections.deque(maxlen=4096) # latest amplitudes played, 0 while the queue was empty
+        self.played_count = 0 # samples played from the queue
+
+    def advance(self, now):
+        rate = _HAPTICS_DESC["SampleRateHz"]
+        n = int((now - self.time) * rate + 1e-6)
+        if n <= 0:
+            return
+        self.time += n / float(rate)
+        taken = self.queue[:n]
+        del self.queue[:n]
+        self.played.extend(taken)
+        self.played.extend(bytes(min(n - len(taken), self.played.maxlen)))
+        self.played_count += len(taken)
+
+
+class SimulatedRuntime(object):
+    """
+    Simulated LibOVRRT library object, used in place of ctypes.CDLL(...).
+    Attributes such as refresh_rate, head_motion, session_status, inputs and
+    properties may be changed at any time to steer the simulation. Setting
+    session_status["DisplayLost"] fails the frame calls with ovrError_DisplayLost
+    until the session is re-created, on the adapter given by luid. boundaries
+    maps the boundary types to their floor points; without an entry the boundary
+    is not set up. Buffers the runtime allocates for audio data and haptics clips
+    stay in native_buffers until they are released. Like the PC runtime, it
+    rejects texture swap chains with an ArraySize above 1, unless texture_arrays
+    is set.
+    """
+
+    def __init__(self, refresh_rate=90.0, head_motion=synthetic_head_motion, clock=None):
+        self.refresh_rate = refresh_rate
+        self.head_motion = head_motion
+        self.version_string = b"1.69.0"
+        self.session_status = collections.OrderedDict([
+            ("IsVisible", True),
+            ("HmdPresent", True),
+            ("HmdMounted", True),
+            ("DisplayLost", False),
+            ("ShouldQuit", False),
+            ("ShouldRecenter", False),
+        ])
+        self.connected_controllers = _ControllerType_Touch
+        self.boundaries = {_Boundary_PlayArea: list(_PLAY_AREA), _Boundary_Outer: list(_OUTER_BOUNDARY)}
+        self.inputs = {} # controller type -> {InputState field: value} reported for it
+        self.haptics = {} # Touch controller type -> _HapticsChannel, once vibrated
+        self.native_buffers = {} # address -> ctypes array allocated for the application
+        self.properties = {}
+        self.luid = b"simovr\x00" # GraphicsLuid of the adapter new sessions report
+        self.texture_arrays = False # whether swap chains may have an ArraySize above 1
+        self._lock = threading.RLock()
+        self._initialized = False
+        self._session = None
+        self._last_error = (_Success, b"")
+        self._swap_chains = {}
+        self._mirror_textures = {}
+        self._next_texture_id = 1000
+        self.clock = clock or WallClock()
+
+    def __getattr__(self, name):
+        if not name.startswith("ovr"):
+            raise AttributeError(name)
+        prototype = _Prototype(name, getattr(self, "_" + name, None))
+        self.__dict__[name] = prototype
+        return prototype
+
+    @property
+    def clock(self):
+        return self._clock
+
+    @clock.setter
+    def clock(self, clock):
+        with self._lock:
+            self._clock = clock
+            self._epoch = clock.now()
+            self._reset_frame_timing()
+
+    def _reset_frame_timing(self):
+        self._last_end_vsync = -1
+        self._last_end_time = None
+        self._last_ended_frame = 0
+        self._waited_frames = set() # frame indices waited for and not yet begun
+        self._begun_frames = set() # frame indices begun and not yet ended
+        self._last_ordered_end = None # index of the last frame ended through ovr_EndFrame
+        self._latency_marker_time = None
+        self._app_frame_count = 0
+        self._app_dropped_frames = 0
+        self._pending_frame_stats = collections.deque()
+        self._frame_stats_dropped = False
+
+    def _fail(self, result, message):
+        self._last_error = (result, message.encode("utf-8"))
+        return result
+
+    def _check_session(self, session):
+        if self._session is None or not session:
+            return False
+        return ctypes.addressof(session.contents) == ctypes.addressof(self._session)
+
+    def _check_frame_session(self, session):
+        "Like _check_session, but returns the failure result, including DisplayLost, or None"
+        if not self._check_session(session):
+            return self._fail(_Error_InvalidSession, "Invalid simulated session.")
+        if self.session_status["DisplayLost"]:
+            return self._fail(_Error_DisplayLost, "Simulated display lost; the session must be re-created.")
+        return None
+
+    # Vsync clock
+
+    def _period(self):
+        return 1.0 / self.refresh_rate
+
+    def _now(self):
+        return self._clock.now()
+
+    def _vsync_index(self, t):
+        # The small bias keeps accumulated float error from landing just before a vsync
+        return int(math.floor((t - self._epoch) / self._period() + 1e-6))
+
+    def _vsync_time(self, index):
+        return self._epoch + index * self._period()
+
+    def _predicted_display_time(self, frame_index):
+        frames_ahead = 1
+        if frame_index > 0:
+            frames_ahead = max(1, frame_index - self._last_ended_frame)
+        base_vsync = max(self._vsync_index(self._now()), self._last_end_vsync)
+        return self._vsync_time(base_vsync + frames_ahead) + 0.5 * self._period()
+
+    # Synthetic tracking
+
+    def _fill_pose(self, pose, orientation, position):
+        pose.Orientation.x, pose.Orientation.y, pose.Orientation.z, pose.Orientation.w = orientation
+        pose.Position.x, pose.Position.y, pose.Position.z = position
+
+    def _fill_pose_state(self, pose_state, t, offset=(0.0, 0.0, 0.0)):
+        dt = 1e-3
+        q0, p0 = self.head_motion(t)
+        q1, p1 = self.head_motion(t + dt)
+        p0 = tuple(a + b for a, b in zip(p0, offset))
+        p1 = tuple(a + b for a, b in zip(p1, offset))
+        self._fill_pose(pose_state.ThePose, q0, p0)
+        dq = _quat_mul(q1, (-q0[0], -q0[1], -q0[2], q0[3]))
+        sign = 1.0 if dq[3] >= 0 else -1.0
+        av = pose_state.AngularVelocity
+        av.x, av.y, av.z = (2.0 * sign * c / dt for c in dq[:3])
+        lv = pose_state.LinearVelocity
+        lv.x, lv.y, lv.z = ((b - a) / dt for a, b in zip(p0, p1))
+        pose_state.TimeInSeconds = t
+
+    def _hand_offset(self, hand):
+        return (-0.2 if hand == 0 else 0.2, -0.35, -0.3)
+
+    # OVR_CAPI.h
+
+    def _ovr_Initialize(self, params):
+        params = _deref(params)
+        minor = int(self.version_string.split(b".")[1])
+        if params.Flags & _Init_RequestVersion and params.RequestedMinorVersion > minor:
+            return self._fail(_Error_LibVersion, "Simulated runtime 1.%d is older than the requested version." % minor)
+        self._initialized = True
+        return _Success
+
+    def _ovr_Shutdown(self):
+        self._initialized = False
+        self._session = None
+
+    def _ovr_GetLastErrorInfo(self, errorInfo):
+        errorInfo = _deref(errorInfo)
+        errorInfo.Result, errorInfo.ErrorString = self._last_error
+
+    def _ovr_GetVersionString(self):
+        return self.version_string
+
+    def _ovr_Detect(self, timeoutMilliseconds):
+        result = self.ovr_Detect.restype()
+        result.IsOculusServiceRunning = _ovr_bool(True)
+        result.IsOculusHMDConnected = _ovr_bool(self.session_status["HmdPresent"])
+        return result
+
+    def _ovr_Create(self, pSession, pLuid):
+        if not self._initialized:
+            return self._fail(_Error_NotInitialized, "Simulated runtime is not initialized.")
+        if self._session is not None:
+            return self._fail(_Error_InvalidOperation, "A simulated session already exists.")
+        if not self.session_status["HmdPresent"]:
+            return self._fail(_Error_NoHmd, "No simulated HMD is present.")
+        pSession = _deref(pSession)
+        with self._lock:
+            self._session = type(pSession)._type_()
+            pSession.contents = self._session
+            self.session_status["DisplayLost"] = False
+            self._reset_frame_timing()
+        luid = _deref(pLuid)
+        if luid is not None:
+            luid.Reserved = self.luid
+        return _Success
+
+    def _ovr_Destroy(self, session):
+        if self._check_session(session):
+            with self._lock:
+                self._session = None
+                self._swap_chains.clear()
+                self._mirror_textures.clear()
+
+    def _ovr_GetHmdDesc(self, session):
+        desc = self.ovr_GetHmdDesc.restype()
+        if session and not self._check_session(session):
+            return desc
+        desc.Type = 14 # ovrHmd_CV1
+        desc.ProductName = b"Oculus Rift CV1 (simulated)"
+        desc.Manufacturer = b"Oculus VR"
+        desc.SerialNumber = b"SIMULATED0000"
+        desc.AvailableTrackingCaps = desc.DefaultTrackingCaps = 0x0070
+        for eye in range(2):
+            for fov in (desc.DefaultEyeFov[eye], desc.MaxEyeFov[eye]):
+                fov.UpTan, fov.DownTan, fov.LeftTan, fov.RightTan = _DEFAULT_EYE_FOV[eye]
+        desc.Resolution.w, desc.Resolution.h = _RESOLUTION
+        desc.DisplayRefreshRate = self.refresh_rate
+        return desc
+
+    def _ovr_GetTrackerCount(self, session):
+        return 1
+
+    def _ovr_GetSessionStatus(self, session, sessionStatus):
+        if not self._check_session(session):
+            return self._fail(_Error_InvalidSession, "Invalid simulated session.")
+        sessionStatus = _deref(sessionStatus)
+        for name, flag in self.session_status.items():
+            setattr(sessionStatus, name, _ovr_bool(flag))
+        return _Success
+
+    def _ovr_RecenterTrackingOrigin(self, session):
+        self.session_status["ShouldRecenter"] = False
+        return _Success
+
+    def _ovr_ClearShouldRecenterFlag(self, session):
+        self.session_status["ShouldRecenter"] = False
+
+    def _ovr_GetTrackingState(self, session, absTime, latencyMarker):
+        now = self._now()
+        t = _value(absTime) or now
+        state = self.ovr_GetTrackingState.restype()
+        self._fill_pose_state(state.HeadPose, t)
+        state.StatusFlags = _Status_Tracked
+        for hand in range(2):
+            self._fill_pose_state(state.HandPoses[hand], t, self._hand_offset(hand))
+            state.HandStatusFlags[hand] = _Status_Tracked
+        state.CalibratedOrigin.Orientation.w = 1.0
+        if _truthy(latencyMarker):
+            self._latency_marker_time = now
+        return state
+
+    def _ovr_GetDevicePoses(self, session, deviceTypes, deviceCount, absTime, outDevicePoses):
+        if not self._check_session(session):
+            return self._fail(_Error_InvalidSession, "Invalid simulated session.")
+        deviceTypes = _deref(deviceTypes)
+        outDevicePoses = _deref(outDevicePoses)
+        t = _value(absTime) or self._now()
+        for i in range(deviceCount):
+            device = deviceTypes[i]
+            if device == _TrackedDevice_HMD:
+                self._fill_pose_state(outDevicePoses[i], t)
+            elif device in (_TrackedDevice_LTouch, _TrackedDevice_RTouch):
+                hand = 0 if device == _TrackedDevice_LTouch else 1
+                self._fill_pose_state(outDevicePoses[i], t, self._hand_offset(hand))
+            else:
+                return self._fail(_Error_InvalidParameter, "Unsupported device type %d." % device)
+        return _Success
+
+    def _ovr_GetInputState(self, session, controllerType, inputState):
+        if not self._check_session(session):
+            return self._fail(_Error_InvalidSession, "Invalid simulated session.")
+        inputState = _deref(inputState)
+        inputState.TimeInSeconds = self._now()
+        inputState.ControllerType = _value(controllerType) & self.connected_controllers
+        for name, value in self.inputs.get(inputState.ControllerType, {}).items():
+            setattr(inputState, name, value)
+        return _Success
+
+    def _ovr_GetConnectedControllerTypes(self, session):
+        return self.connected_controllers
+
+    # Boundary system
+
+    def _ovr_GetBoundaryGeometry(self, session, boundaryType, outFloorPoints, outFloorPointsCount):
+        if not self._check_session(session):
+            return self._fail(_Error_InvalidSession, "Invalid simulated session.")
+        points = self.boundaries.get(_value(boundaryType), [])
+        _deref(outFloorPointsCount).value = len(points)
+        if outFloorPoints:
+            outFloorPoints = _deref(outFloorPoints)
+            for i, point in enumerate(points):
+                outFloorPoints[i].x, outFloorPoints[i].y, outFloorPoints[i].z = point
+        return _Success if points else _Success_BoundaryInvalid
+
+    def _ovr_GetBoundaryDimensions(self, session, boundaryType, outDimensions):
+        if not self._check_session(session):
+            return self._fail(_Error_InvalidSession, "Invalid simulated session.")
+        points = self.boundaries.get(_value(boundaryType), [])
+        if not points:
+            return _Success_BoundaryInvalid
+        outDimensions = _deref(outDimensions)
+        outDimensions.x, outDimensions.y, outDimensions.z = [max(p[i] for p in points) - min(p[i] for p in points) for i in range(3)]
+        return _Success
+
+    # Touch haptics
+
+    def _haptics_channel(self, controllerType):
+        controllerType = _value(controllerType)
+        if controllerType not in (_ControllerType_LTouch, _ControllerType_RTouch):
+            return None
+        if not controllerType & self.connected_controllers:
+            return None
+        now = self._now()
+        channel = self.haptics.get(controllerType)
+        if channel is None:
+            channel = self.haptics[controllerType] = _HapticsChannel(now)
+        channel.advance(now)
+        return channel
+
+    def _ovr_GetTouchHapticsDesc(self, session, controllerType):
+        desc = self.ovr_GetTouchHapticsDesc.restype()
+        if _value(controllerType) in (_ControllerType_LTouch, _ControllerType_RTouch):
+            for name, value in _HAPTICS_DESC.items():
+                setattr(desc, name, value)
+        return desc
+
+    def _ovr_SubmitControllerVibration(self, session, controllerType, buffer):
+        if not self._check_session(session):
+            return self._fail(_Error_InvalidSession, "Invalid simulated session.")
+        with self._lock:
+            channel = self._haptics_channel(controllerType)
+            if channel is None:
+                return _Success_DeviceUnavailable
+            buffer = _deref(buffer)
+            count = buffer.SamplesCount
+            if not _HAPTICS_DESC["SubmitMinSamples"] <= count <= _HAPTICS_DESC["SubmitMaxSamples"]:
+                return self._fail(_Error_InvalidParameter, "Invalid haptics sample count %d." % count)
+            if len(channel.queue) + count > _HAPTICS_QUEUE_SIZE:
+                return self._fail(_Error_InvalidOperation, "Haptics queue overflow.")
+            if not channel.queue:
+                channel.time = self._now() # playback restarts with this buffer
+            channel.queue.extend(ctypes.string_at(buffer.Samples, count))
+        return _Success
+
+    def _ovr_GetControllerVibrationState(self, session, controllerType, outState):
+        if not self._check_session(session):
+            return self._fail(_Error_InvalidSession, "Invalid simulated session.")
+        with self._lock:
+            channel = self._haptics_channel(controllerType)
+            if channel is None:
+                return _Success_DeviceUnavailable
+            outState = _deref(outState)
+            outState.SamplesQueued = len(channel.queue)
+            outState.RemainingQueueSpace = _HAPTICS_QUEUE_SIZE - len(channel.queue)
+        return _Success
+
+    # Audio data and haptics clips
+
+    def _allocate(self, ctype, values):
+        "Allocates an array of values that lives until _release(address); returns its address"
+        buffer = (ctype * len(values))(*values)
+        self.native_buffers[ctypes.addressof(buffer)] = buffer
+        return ctypes.addressof(buffer)
+
+    def _release(self, address):
+        self.native_buffers.pop(address, None)
+
+    def _ovr_ReadWavFromBuffer(self, outAudioChannel, inputData, dataSizeInBytes, stereoChannelToUse):
+        size = _value(dataSizeInBytes)
+        data = bytes(inputData[:size]) if isinstance(inputData, (bytes, bytearray)) else ctypes.string_at(inputData, size)
+        try:
+            wav = wave.open(io.BytesIO(data))
+            channels, width = wav.getnchannels(), wav.getsampwidth()
+            frequency, frames = wav.getframerate(), wav.readframes(wav.getnframes())
+        except (wave.Error, EOFError):
+            return self._fail(_Error_InvalidParameter, "Invalid Wav data.")
+        channel = min(_value(stereoChannelToUse), channels - 1)
+        if width == 1:
+            samples = [(b - 128) / 128.0 for b in bytearray(frames)]
+        elif width == 2:
+            samples = [s / 32768.0 for s in struct.unpack("<%dh" % (len(frames) // 2), frames)]
+        else:
+            return self._fail(_Error_InvalidParameter, "Unsupported Wav sample size %d." % width)
+        samples = samples[channel::channels]
+        out = _deref(outAudioChannel)
+        out.Samples = ctypes.cast(self._allocate(ctypes.c_float, samples), type(out.Samples))
+        out.SamplesCount = len(samples)
+        out.Frequency = frequency
+        return _Success
+
+    def _ovr_GenHapticsFromAudioData(self, outHapticsClip, audioChannel, genMode):
+        audio = _deref(audioChannel)
+        if not audio.Samples or audio.Frequency <= 0:
+            return self._fail(_Error_InvalidParameter, "Invalid audio channel data.")
+        rate = _HAPTICS_DESC["SampleRateHz"]
+        step = audio.Frequency / float(rate)
+        count = audio.SamplesCount * rate // audio.Frequency
+        samples = [int(round(min(abs(audio.Samples[int(i * step)]), 1.0) * 255)) for i in range(count)] # point sampled
+        out = _deref(outHapticsClip)
+        out.Samples = self._allocate(ctypes.c_ubyte, samples)
+        out.SamplesCount = count
+        return _Success
+
+    def _ovr_ReleaseAudioChannelData(self, audioChannel):
+        audio = _deref(audioChannel)
+        self._release(ctypes.cast(audio.Samples, ctypes.c_void_p).value)
+        audio.Samples = None
+        audio.SamplesCount = 0
+
+    def _ovr_ReleaseHapticsClip(self, hapticsClip):
+        clip = _deref(hapticsClip)
+        self._release(clip.Samples)
+        clip.Samples = None
+        clip.SamplesCount = 0
+
+    # Texture swap chains
+
+    def _ovr_CreateTextureSwapChainGL(self, session, desc, out_TextureSwapChain):
+        failure = self._check_frame_session(session)
+        if failure is not None:
+            return failure
+        desc = _deref(desc)
+        out = _deref(out_TextureSwapChain)
+        if desc.ArraySize > 1 and not self.texture_arrays:
+            return self._fail(_Error_InvalidParameter, "Texture arrays are not supported.")
+        with self._lock:
+            chain = _SwapChain(type(out)._type_(), type(desc).from_buffer_copy(desc), self._next_texture_id)
+            self._next_texture_id += len(chain.texture_ids)
+            self._swap_chains[ctypes.addressof(chain.data)] = chain
+        out.contents = chain.data
+        return _Success
+
+    def _find_swap_chain(self, chain):
+        if not chain:
+            return None
+        return self._swap_chains.get(ctypes.addressof(chain.contents))
+
+    def _ovr_GetTextureSwapChainLength(self, session, chain, out_Length):
+        swap_chain = self._find_swap_chain(chain)
+        if swap_chain is None:
+            return self._fail(_Error_InvalidParameter, "Unknown texture swap chain.")
+        _deref(out_Length).value = len(swap_chain.texture_ids)
+        return _Success
+
+    def _ovr_GetTextureSwapChainCurrentIndex(self, session, chain, out_Index):
+        swap_chain = self._find_swap_chain(chain)
+        if swap_chain is None:
+            return self._fail(_Error_InvalidParameter, "Unknown texture swap chain.")
+        _deref(out_Index).value = swap_chain.current_index
+        return _Success
+
+    def _ovr_GetTextureSwapChainDesc(self, session, chain, out_Desc):
+        swap_chain = self._find_swap_chain(chain)
+        if swap_chain is None:
+            return self._fail(_Error_InvalidParameter, "Unknown texture swap chain.")
+        ctypes.pointer(_deref(out_Desc))[0] = swap_chain.desc
+        return _Success
+
+    def _ovr_GetTextureSwapChainBufferGL(self, session, chain, index, out_TexId):
+        swap_chain = self._find_swap_chain(chain)
+        if swap_chain is None:
+            return self._fail(_Error_InvalidParameter, "Unknown texture swap chain.")
+        if index < 0:
+            index = swap_chain.current_index
+        if index >= len(swap_chain.texture_ids):
+            return self._fail(_Error_InvalidParameter, "Swap chain index %d out of range." % index)
+        _deref(out_TexId).value = swap_chain.texture_ids[index]
+        return _Success
+
+    def _ovr_CommitTextureSwapChain(self, session, chain):
+        swap_chain = self._find_swap_chain(chain)
+        if swap_chain is None:
+            return self._fail(_Error_InvalidParameter, "Unknown texture swap chain.")
+        if _truthy(swap_chain.desc.StaticImage) and swap_chain.committed:
+            return self._fail(_Error_TextureSwapChainFull, "Static image was already committed.")
+        swap_chain.committed = True
+        swap_chain.current_index = (swap_chain.current_index + 1) % len(swap_chain.texture_ids)
+        return _Success
+
+    def _ovr_DestroyTextureSwapChain(self, session, chain):
+        if chain:
+            self._swap_chains.pop(ctypes.addressof(chain.contents), None)
+
+    def _ovr_CreateMirrorTextureGL(self, session, desc, out_MirrorTexture):
+        failure = self._check_frame_session(session)
+        if failure is not None:
+            return failure
+        out = _deref(out_MirrorTexture)
+        with self._lock:
+            data = type(out)._type_()
+            self._mirror_textures[ctypes.addressof(data)] = (data, self._next_texture_id)
+            self._next_texture_id += 1
+        out.contents = data
+        return _Success
+
+    def _ovr_GetMirrorTextureBufferGL(self, session, mirrorTexture, out_TexId):
+        entry = self._mirror_textures.get(ctypes.addressof(mirrorTexture.contents)) if mirrorTexture else None
+        if entry is None:
+            return self._fail(_Error_InvalidParameter, "Unknown mirror texture.")
+        _deref(out_TexId).value = entry[1]
+        return _Success
+
+    def _ovr_DestroyMirrorTexture(self, session, mirrorTexture):
+        if mirrorTexture:
+            self._mirror_textures.pop(ctypes.addressof(mirrorTexture.contents), None)
+
+    # Frame timing
+
+    def _ovr_GetFovTextureSize(self, session, eye, fov, pixelsPerDisplayPixel):
+        size = self.ovr_GetFovTextureSize.restype()
+        density = _value(pixelsPerDisplayPixel)
+        size.w = int(math.ceil((fov.LeftTan + fov.RightTan) * _PIXELS_PER_TAN_ANGLE[0] * density))
+        size.h = int(math.ceil((fov.UpTan + fov.DownTan) * _PIXELS_PER_TAN_ANGLE[1] * density))
+        return size
+
+    def _render_desc(self, restype, eyeType, fov):
+        desc = restype()
+        eye = _value(eyeType)
+        desc.Eye = eye
+        desc.Fov = fov
+        half_width = _RESOLUTION[0] // 2
+        desc.DistortedViewport.Pos.x = eye * half_width
+        desc.DistortedViewport.Size.w, desc.DistortedViewport.Size.h = half_width, _RESOLUTION[1]
+        desc.PixelsPerTanAngleAtCenter.x, desc.PixelsPerTanAngleAtCenter.y = _PIXELS_PER_TAN_ANGLE
+        return desc, (-0.5 if eye == 0 else 0.5) * _IPD
+
+    def _ovr_GetRenderDesc2(self, session, eyeType, fov):
+        desc, offset = self._render_desc(self.ovr_GetRenderDesc2.restype, eyeType, fov)
+        desc.HmdToEyePose.Orientation.w = 1.0
+        desc.HmdToEyePose.Position.x = offset
+        return desc
+
+    def _ovr_GetRenderDesc(self, session, eyeType, fov):
+        "Before SDK 1.17: HmdToEyeOffset instead of HmdToEyePose"
+        desc, offset = self._render_desc(self.ovr_GetRenderDesc.restype, eyeType, fov)
+        desc.HmdToEyeOffset.x = offset
+        return desc
+
+    def _ovr_WaitToBeginFrame(self, session, frameIndex):
+        failure = self._check_frame_session(session)
+        if failure is not None:
+            return failure
+        frameIndex = _value(frameIndex)
+        with self._lock:
+            lastEnded = self._last_ordered_end
+            if lastEnded is not None and frameIndex <= lastEnded:
+                return self._fail(_Error_InvalidOperation, "Frame %d was already ended." % frameIndex)
+            # One frame may be in flight between the last ended frame and this one
+            if frameIndex > (-1 if lastEnded is None else lastEnded) + 2:
+                return self._fail(_Error_InvalidOperation, "Frame %d is more than one frame ahead of the last ended frame." % frameIndex)
+            self._waited_frames.add(frameIndex)
+        return self._wait_to_begin_frame()
+
+    def _wait_to_begin_frame(self):
+        # Let the application run at most one frame ahead of the compositor
+        delay = self._vsync_time(self._last_end_vsync + 1) - self._now()
+        if self._last_end_time is not None and delay > 0:
+            self._clock.sleep(delay)
+        if not self.session_status["IsVisible"]:
+            return _Success_NotVisible
+        return _Success
+
+    def _ovr_BeginFrame(self, session, frameIndex):
+        failure = self._check_frame_session(session)
+        if failure is not None:
+            return failure
+        frameIndex = _value(frameIndex)
+        with self._lock:
+            if frameIndex not in self._waited_frames:
+                return self._fail(_Error_InvalidOperation, "Frame %d was not waited for." % frameIndex)
+            self._waited_frames.discard(frameIndex)
+            self._begun_frames.add(frameIndex)
+        return _Success
+
+    def _ovr_EndFrame(self, session, frameIndex, viewScaleDesc, layerPtrList, layerCount):
+        failure = self._check_frame_session(session)
+        if failure is not None:
+            return failure
+        index = _value(frameIndex)
+        with self._lock:
+            if index not in self._begun_frames:
+                return self._fail(_Error_InvalidOperation, "Frame %d was not begun." % index)
+            if self._last_ordered_end is not None and index <= self._last_ordered_end:
+                return self._fail(_Error_InvalidOperation, "Frame %d ended after a later frame." % index)
+            self._begun_frames.discard(index)
+            self._last_ordered_end = index
+        return self._end_frame(frameIndex)
+
+    def _end_frame(self, frameIndex):
+        now = self._now()
+        with self._lock:
+            vsync = max(self._vsync_index(now), self._last_end_vsync + 1)
+            dropped = 0
+            if self._last_end_time is not None:
+                dropped = max(0, vsync - self._last_end_vsync - 1)
+            self._app_dropped_frames += dropped
+            self._app_frame_count += 1
+            display_time = self._vsync_time(vsync + 1) + 0.5 * self._period()
+            latency = 0.0
+            if self._latency_marker_time is not None:
+                latency = display_time - self._latency_marker_time
+            cpu_time = 0.0
+            if self._last_end_time is not None:
+                cpu_time = now - self._last_end_time
+            if len(self._pending_frame_stats) == _MaxProvidedFrameStats:
+                self._pending_frame_stats.popleft()
+                self._frame_stats_dropped = True
+            self._pending_frame_stats.append(collections.OrderedDict([
+                ("HmdVsyncIndex", vsync + 1),
+                ("AppFrameIndex", self._app_frame_count),
+                ("AppDroppedFrameCount", self._app_dropped_frames),
+                ("AppMotionToPhotonLatency", latency),
+                ("AppCpuElapsedTime", cpu_time),
+                ("AppGpuElapsedTime", 0.0),
+                ("CompositorFrameIndex", vsync + 1),
+                ("CompositorLatency", 0.5 * self._period()),
+                ("CompositorCpuStartToGpuEndElapsedTime", -1.0),
+                ("CompositorGpuEndToVsyncElapsedTime", -1.0),
+            ]))
+            self._last_end_vsync = vsync
+            self._last_end_time = now
+            self._last_ended_frame = _value(frameIndex)
+        if not self.session_status["IsVisible"]:
+            return _Success_NotVisible
+        return _Success
+
+    def _ovr_SubmitFrame2(self, session, frameIndex, viewScaleDesc, layerPtrList, layerCount):
+        failure = self._check_frame_session(session)
+        if failure is not None:
+            return failure
+        self._wait_to_begin_frame()
+        return self._end_frame(frameIndex)
+
+    _ovr_SubmitFrame = _ovr_SubmitFrame2 # before SDK 1.17, with the older ovrViewScaleDesc
+
+    def _ovr_GetPerfStats(self, session, outStats):
+        if not self._check_session(session):
+            return self._fail(_Error_InvalidSession, "Invalid simulated session.")
+        outStats = _deref(outStats)
+        with self._lock:
+            frames = list(reversed(self._pending_frame_stats)) # most recent first
+            self._pending_frame_stats.clear()
+            outStats.AnyFrameStatsDropped = _ovr_bool(self._frame_stats_dropped)
+            self._frame_stats_dropped = False
+        for i, frame in enumerate(frames):
+            for name, value in frame.items():
+                setattr(outStats.FrameStats[i], name, value)
+        outStats.FrameStatsCount = len(frames)
+        outStats.AdaptiveGpuPerformanceScale = 1.0
+        outStats.VisibleProcessId = os.getpid()
+        return _Success
+
+    def _ovr_ResetPerfStats(self, session):
+        with self._lock:
+            self._app_frame_count = 0
+            self._app_dropped_frames = 0
+        return _Success
+
+    def _ovr_GetPredictedDisplayTime(self, session, frameIndex):
+        return self._predicted_display_time(_value(frameIndex))
+
+    def _ovr_GetTimeInSeconds(self):
+        return self._now()
+
+    # Properties
+
+    def _get_property(self, propertyName, defaultVal):
+        if propertyName == b"VsyncToNextVsync":
+            return self._period()
+        return self.properties.get(propertyName, defaultVal)
+
+    def _set_property(self, propertyName, value):
+        if not propertyName:
+            return _ovr_bool(False)
+        self.properties[propertyName] = value
+        return _ovr_bool(True)
+
+    def _ovr_GetBool(self, session, propertyName, defaultVal):
+        return _ovr_bool(_truthy(self._get_property(propertyName, defaultVal)))
+
+    def _ovr_SetBool(self, session, propertyName, value):
+        return self._set_property(propertyName, _truthy(value))
+
+    def _ovr_GetInt(self, session, propertyName, defaultVal):
+        return int(self._get_property(propertyName, defaultVal))
+
+    def _ovr_SetInt(self, session, propertyName, value):
+        return self._set_property(propertyName, int(value))
+
+    def _ovr_GetFloat(self, session, propertyName, defaultVal):
+        return float(self._get_property(propertyName, defaultVal))
+
+    def _ovr_SetFloat(self, session, propertyName, value):
+        return self._set_property(propertyName, float(value))
+
+    def _ovr_GetFloatArray(self, session, propertyName, values, valuesCapacity):
+        stored = self.properties.get(propertyName, ())
+        values = _deref(values)
+        count = min(len(stored), valuesCapacity)
+        for i in range(count):
+            values[i] = stored[i]
+        return count
+
+    def _ovr_SetFloatArray(self, session, propertyName, values, valuesSize):
+        values = _deref(values)
+        return self._set_property(propertyName, tuple(values[i] for i in range(valuesSize)))
+
+    def _ovr_GetString(self, session, propertyName, defaultVal):
+        return self._get_property(propertyName, defaultVal)
+
+    def _ovr_SetString(self, session, propertyName, value):
+        return self._set_property(propertyName, value)
+
+    # OVR_CAPI_Util.h
+
+    def _ovrMatrix4f_Projection(self, fov, znear, zfar, projectionModFlags):
+        # Same construction as OVR::CreateProjection() in the SDK
+        result = self.ovrMatrix4f_Projection.restype()
+        handedness = 1.0 if projectionModFlags & _Projection_LeftHanded else -1.0
+        if projectionModFlags & _Projection_FarLessThanNear:
+            znear, zfar = zfar, znear
+        x_scale = 2.0 / (fov.LeftTan + fov.RightTan)
+        x_offset = (fov.LeftTan - fov.RightTan) * x_scale * 0.5
+        y_scale = 2.0 / (fov.UpTan + fov.DownTan)
+        y_offset = (fov.UpTan - fov.DownTan) * y_scale * 0.5
+        M = result.M
+        M[0][0] = x_scale
+        M[0][2] = handedness * x_offset
+        M[1][1] = y_scale
+        M[1][2] = handedness * -y_offset
+        if projectionModFlags & _Projection_FarClipAtInfinity:
+            M[2][2] = -handedness
+            M[2][3] = 2.0 * znear if projectionModFlags & _Projection_ClipRangeOpenGL else znear
+        elif projectionModFlags & _Projection_ClipRangeOpenGL:
+            M[2][2] = -handedness * (zfar + znear) / (znear - zfar)
+            M[2][3] = 2.0 * (zfar * znear) / (znear - zfar)
+        else:
+            M[2][2] = -handedness * zfar / (znear - zfar)
+            M[2][3] = (zfar * znear) / (znear - zfar)
+        M[3][2] = handedness
+        return result
+
+    def _ovrTimewarpProjectionDesc_FromProjection(self, projection, projectionModFlags):
+        result = self.ovrTimewarpProjectionDesc_FromProjection.restype()
+        M = projection.M
+        if projectionModFlags & _Projection_ClipRangeOpenGL:
+            # Convert the OpenGL [-w, w] clip range to [0, w]
+            result.Projection22 = 0.5 * (M[2][2] + M[3][2])
+            result.Projection23 = 0.5 * M[2][3]
+        else:
+            result.Projection22 = M[2][2]
+            result.Projection23 = M[2][3]
+        result.Projection32 = M[3][2]
+        return result
+
+    def _calc_eye_poses(self, q, p, hmdToEyeOffset, outEyePoses):
+        for eye in range(2):
+            offset = _quat_rotate(q, tuple(hmdToEyeOffset[eye]))
+            self._fill_pose(outEyePoses[eye], q, tuple(a + b for a, b in zip(p, offset)))
+
+    def _ovr_CalcEyePoses(self, headPose, hmdToEyeOffset, outEyePoses):
+        self._calc_eye_poses(tuple(headPose.Orientation), tuple(headPose.Position), hmdToEyeOffset, outEyePoses)
+
+    def _ovr_GetEyePoses(self, session, frameIndex, latencyMarker, hmdToEyeOffset, outEyePoses, outSensorSampleTime):
+        now = self._now()
+        q, p = self.head_motion(self._predicted_display_time(_value(frameIndex)))
+        self._calc_eye_poses(q, p, hmdToEyeOffset, outEyePoses)
+        if _truthy(latencyMarker):
+            self._latency_marker_time = now
+        outSensorSampleTime = _deref(outSensorSampleTime)
+        if outSensorSampleTime is not None:
+            outSensorSampleTime.value = now
+
+    def _ovrPosef_FlipHandedness(self, inPose, outPose):
+        inPose, outPose = _deref(inPose), _deref(outPose)
+        q, p = inPose.Orientation, inPose.Position
+        self._fill_pose(outPose, (-q.x, -q.y, q.z, q.w), (p.x, p.y, -p.z))
@@ -0,0 +1,93 @@
+"""
+OpenGL framebuffer objects for the images of a texture swap chain.
+
+Rendering into a swap chain by re-attaching its current texture to one FBO
+changes attachments, and makes the driver re-validate the framebuffer, every
+frame. SwapChainFramebuffers instead builds and validates one FBO per image
+of the chain once, after which each frame only binds the FBO of the current
+image:
+
+    framebuffers = SwapChainFramebuffers(session, colorChain, depthChain)
+    while running:
+        framebuffers.bind()
+        ... render ...
+        ovr.commitTextureSwapChain(session, colorChain)
+        ovr.commitTextureSwapChain(session, depthChain)
+    framebuffers.destroy()
+
+Swap chains created with an ArraySize of 2 are attached as layered texture
+arrays, so that shaders select the eye to draw to with gl_Layer.
+Requires a current OpenGL context.
+"""
+
+from OpenGL.GL import *
+import ovr
+
+
+class SwapChainFramebuffers(object):
+    """
+    One complete framebuffer per image of colorChain, with the matching image of
+    depthChain, a depth swap chain, or a depth renderbuffer, attached.
+    """
+
+    def __init__(self, session, colorChain, depthChain=None, depthRenderbuffer=None):
+        self.session = session
+        self.color_chain = colorChain
+        self.depth_chain = depthChain
+        self.depth_renderbuffer = depthRenderbuffer
+        self.layered = ovr.getTextureSwapChainDesc(session, colorChain).ArraySize > 1
+        self.color_textures = self._textures(colorChain)
+        self.depth_textures = self._textures(depthChain) if depthChain is not None else []
+        self.framebuffers = {} # (color index, depth index) -> FBO
+        # Chains committed together advance together, so pair up images of the same index
+        for index in range(len(self.color_textures)):
+            self._framebuffer(index, index if self.depth_textures else None)
+
+    def _textures(self, chain):
+        length = ovr.getTextureSwapChainLength(self.session, chain).value
+        return [ovr.getTextureSwapChainBufferGL(self.session, chain, index).value for index in range(length)]
+
+    def _framebuffer(self, colorIndex, depthIndex):
+        key = (colorIndex, depthIndex)
+        fbo = self.framebuffers.get(key)
+        if fbo is not None:
+            return fbo
+        fbo = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+        self._attach(GL_COLOR_ATTACHMENT0, self.color_textures[colorIndex])
+        if depthIndex is not None:
+            self._attach(GL_DEPTH_ATTACHMENT, self.depth_textures[depthIndex])
+        elif self.depth_renderbuffer is not None:
+            glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, self.depth_renderbuffer)
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            glDeleteFramebuffers(1, [fbo])
+            raise RuntimeError("Incomplete framebuffer for swap chain image %d (status %#x)" % (colorIndex, status))
+        self.framebuffers[key] = fbo
+        return fbo
+
+    def _attach(self, attachment, texture):
+        if self.layered:
+            glFramebufferTexture(GL_FRAMEBUFFER, attachment, texture, 0) # all layers
+        else:
+            glFramebufferTexture2D(GL_FRAMEBUFFER, attachment, GL_TEXTURE_2D, texture, 0)
+
+    def current(self):
+        "Returns the FBO of the current images of the chains"
+        colorIndex = ovr.getTextureSwapChainCurrentIndex(self.session, self.color_chain).value
+        depthIndex = None
+        if self.depth_textures:
+            depthIndex = ovr.getTextureSwapChainCurrentIndex(self.session, self.depth_chain).value
+        return self._framebuffer(colorIndex, depthIndex)
+
+    def bind(self, target=GL_FRAMEBUFFER):
+        "Binds the FBO of the current images to target, and returns it"
+        fbo = self.current()
+        glBindFramebuffer(target, fbo)
+        return fbo
+
+    def destroy(self):
+        if self.framebuffers:
+            glDeleteFramebuffers(len(self.framebuffers), list(self.framebuffers.values()))
+        self.framebuffers = {}
@@ -57,6 +57,14 @@ END_LEN
             return getattr(self, self._fields_[key][0])
 END_GETITEM
 ,
+<<"END_AS_NUMPY"
+
+    def as_numpy(self):
+        "NumPy view of the components, sharing memory with this structure (requires numpy)"
+        from .pose_math import as_array
+        return as_array(self)
+END_AS_NUMPY
+,
 );
 
 my %custom_methods = ();
@@ -124,9 +132,34 @@ push @{$custom_methods{"Matrix4f"}}, (
         i = int(key/4)
         j = key % 4
         return self.M[j][i]
+
+    def as_numpy(self, column_major=False):
+        """
+        NumPy 4x4 view of M, sharing memory with this matrix (requires numpy).
+        Indexed [row][column] as stored, or, if column_major, the same memory
+        read as a column-major matrix, i.e. the transpose.
+        """
+        from .pose_math import as_array
+        m = as_array(self)
+        if column_major:
+            return m.T
+        return m
 END_MATMETH
 );
 
+push @{$custom_methods{"Posef"}}, (
+<<"END_POSEMETH"
+
+    def as_numpy(self):
+        """
+        NumPy view with Orientation (x, y, z, w) and Position (x, y, z) fields,
+        sharing memory with this pose (requires numpy)
+        """
+        from .pose_math import as_array
+        return as_array(self)
+END_POSEMETH
+);
+
 translate_header();
 
 
@@ -142,10 +175,14 @@ Python bindings for Oculus Rift SDK version ';
 Works on Windows only at the moment (just like Oculus Rift SDK...)
 """
 
+import contextlib
 import ctypes
 from ctypes import * #@UnusedWildImport
 import math
 import platform
+import sys
+import threading
+import weakref
 
 
 OVR_PTR_SIZE = sizeof(c_voidp) # distinguish 32 vs 64 bit python
@@ -161,9 +198,49 @@ if platform.system().startswith(\"Win\"):
     _libname = \"Lib\"+_libname # i.e. \"LibOVRRT32_$sdk_lib_version\"";
     print $fh <<'END_PREAMBLE';
 
+
+class _LazyLibrary(object):
+    """
+    Binds the ovr_* functions of the backend library on first use.
+    Resolving a symbol and applying its restype and argtypes is deferred until
+    the function is first called, so importing ovr does not pay for parts of
+    the API that an application never uses.
+    """
+
+    def __init__(self, library):
+        self.library = library
+        self._prototypes = {}
+
+    def prototype(self, name, restype, argtypes=None):
+        "Records the ctypes signature of function name without resolving it"
+        self._prototypes[name] = (restype, argtypes)
+
+    def bindAll(self):
+        "Resolves every registered function now, e.g. to fail fast on a runtime missing symbols"
+        for name in self._prototypes:
+            getattr(self, name)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            restype, argtypes = self._prototypes[name]
+        except KeyError:
+            return getattr(self.library, name)
+        try:
+            function = getattr(self.library, name)
+        except AttributeError:
+            raise OculusFunctionError("The Oculus runtime does not export %s; it is older than the SDK version that added it." % name,
+                functionName=name)
+        function.restype = restype
+        if argtypes is not None:
+            function.argtypes = argtypes
+        setattr(self, name, function) # later lookups no longer reach __getattr__
+        return function
+
 # Load library
 try:
-    libovr = CDLL(_libname)
+    libovr = _LazyLibrary(CDLL(_libname))
 except:
 END_PREAMBLE
     print $fh "    print(\"Is Oculus Runtime $sdk_version2 installed on this machine?\")\n";
@@ -234,27 +311,412 @@ class OculusFunctionError(RuntimeError):
     """
     OculusFunctionError is a custom exception type for when OVR functions return a failure code.
     Such a specific exception type allows more precise exception handling that does just raising Exception().
+    The ovrResult error code is available as result, and the name of the failed function as function_name.
+    Failures with specific codes raise the subclasses below, e.g. DisplayLostError.
+    The ErrorInfo of the failure, fetched when it occurred, is available as error_info;
+    the message is only formatted when it is first read.
     """
-    pass
+    def __init__(self, message=None, result=None, functionName=None, errorInfo=None):
+        super(OculusFunctionError, self).__init__(message)
+        self.result = result
+        self.function_name = functionName
+        self.error_info = errorInfo # None if getLastErrorInfo() failed
+        self._message = message
+
+    def __str__(self):
+        if self._message is None:
+            msg = "Call to function ovr.%s() failed. Error code %d." % (
+                self.function_name, self.result)
+            errorInfo = self.error_info
+            if errorInfo is not None:
+                msg += " %s (%d)" % (errorInfo.ErrorString.decode("utf-8"), errorInfo.Result)
+            else:
+                msg += " And, annoyingly, getLastErrorInfo() failed too."
+            self._message = msg
+        return self._message
+
+class InvalidSessionError(OculusFunctionError):
+    "ovrError_InvalidSession: the session is not valid"
+
+class NoHmdError(OculusFunctionError):
+    "ovrError_NoHmd: no HMD is connected"
+
+class InvalidParameterError(OculusFunctionError):
+    "ovrError_InvalidParameter"
+
+class InvalidOperationError(OculusFunctionError):
+    "ovrError_InvalidOperation: the call is invalid in the object's current state"
+
+class InsufficientArraySizeError(OculusFunctionError):
+    "ovrError_InsufficientArraySize: the output array is too small"
+
+class LostTrackingError(OculusFunctionError):
+    "ovrError_LostTracking: tracking was lost during ovr_GetDevicePoses()"
+
+class ServiceConnectionError(OculusFunctionError):
+    "ovrError_ServiceConnection: the connection to the Oculus service was lost; the session must be destroyed"
+
+class DisplayLostError(OculusFunctionError):
+    "ovrError_DisplayLost: the session has to be re-created, see ovr.managed_session"
+
+class TextureSwapChainFullError(OculusFunctionError):
+    "ovrError_TextureSwapChainFull: the swap chain was committed too often without ending a frame"
+
+class TextureSwapChainInvalidError(OculusFunctionError):
+    "ovrError_TextureSwapChainInvalid: the swap chain is incomplete, e.g. was never committed"
+
+class GraphicsDeviceResetError(OculusFunctionError):
+    "ovrError_GraphicsDeviceReset"
+
+class DisplayRemovedError(OculusFunctionError):
+    "ovrError_DisplayRemoved: the HMD was removed from the display adapter"
+
+_errorTypes = {} # ovrResult -> OculusFunctionError subclass, filled in below the error codes
+_errorMode = threading.local() # raise_errors and last_failure of each thread
+
+def _lastErrorInfo():
+    try:
+        return getLastErrorInfo()
+    except Exception:
+        return None
 
 def _checkResult(ovrResult, functionName):
-    "Raises an exception if a function returns an error code"
-    if not FAILURE(ovrResult):
-        return # Function succeeded, so carry on
-    msg = "Call to function ovr.%s() failed. Error code %d." % (
-        functionName, ovrResult)
+    """
+    Raises the exception for ovrResult if it is a failure code, or records it when
+    raising is disabled with setRaiseOnError(False). The bindings test result < 0 before calling,
+    so the ErrorInfo of the failure is fetched right away, before any other call can replace it.
+    """
+    if ovrResult >= 0:
+        return ovrResult # Function succeeded, so carry on
+    failure = (ovrResult, functionName, _lastErrorInfo())
+    if not getattr(_errorMode, "raise_errors", True):
+        _errorMode.last_failure = failure
+        return ovrResult
+    raise _errorTypes.get(ovrResult, OculusFunctionError)(None, *failure)
+
+def setRaiseOnError(enabled):
+    """
+    With enabled False, failed calls on the calling thread return instead of raising, e.g. in
+    tight loops: functions that return an ovrResult return the failure code, others return their
+    unfilled outputs (getDevicePoses returns None), and getLastFailure() reports the failure.
+    Returns the previous setting.
+    """
+    previous = getattr(_errorMode, "raise_errors", True)
+    _errorMode.raise_errors = bool(enabled)
+    return previous
+
+@contextlib.contextmanager
+def noRaise():
+    "Context manager running its block with setRaiseOnError(False)"
+    previous = setRaiseOnError(False)
     try:
-        errorInfo = getLastErrorInfo()
-        msg += " %s (%d)" % (errorInfo.ErrorString, errorInfo.Result)
-    except:
-        msg += " And, annoyingly, getLastErrorInfo() failed too."
-    raise OculusFunctionError(msg)
+        yield
+    finally:
+        setRaiseOnError(previous)
+
+def getLastFailure():
+    """
+    Returns, without raising it, the exception for the latest call on this thread that failed
+    while raising was disabled, or None, and forgets it.
+    """
+    failure = getattr(_errorMode, "last_failure", None)
+    if failure is None:
+        return None
+    _errorMode.last_failure = None
+    return _errorTypes.get(failure[0], OculusFunctionError)(None, *failure)
 
 END_PREAMBLE
 
     process_headers($fh);
 
     print $fh <<'END_FOOTER';
+### BEGIN Error types ###
+
+_errorTypes.update({
+    Error_InvalidSession: InvalidSessionError,
+    Error_NoHmd: NoHmdError,
+    Error_InvalidParameter: InvalidParameterError,
+    Error_InvalidOperation: InvalidOperationError,
+    Error_InsufficientArraySize: InsufficientArraySizeError,
+    Error_LostTracking: LostTrackingError,
+    Error_ServiceConnection: ServiceConnectionError,
+    Error_DisplayLost: DisplayLostError,
+    Error_TextureSwapChainFull: TextureSwapChainFullError,
+    Error_TextureSwapChainInvalid: TextureSwapChainInvalidError,
+    Error_GraphicsDeviceReset: GraphicsDeviceResetError,
+    Error_DisplayRemoved: DisplayRemovedError,
+})
+
+### END Error types ###
+
+
+### BEGIN SDK version deltas ###
+
+# The declarations above follow the SDK 1.69 headers. Runtimes back to SDK 1.16
+# are supported by requesting their own minor version in initialize() and
+# dispatching the functions below to the variants that speak the older entry
+# points and structure layouts. Older runtimes lack more of the entry points
+# and structures declared above than these variants cover; the modules in
+# _legacyModules keep the complete bindings for them.
+
+OLDEST_MINOR_VERSION = 16
+_legacyModules = [ # (oldest minor version, module of the ovr package) for the SDK 1.x runtimes before OLDEST_MINOR_VERSION
+    (3, "_ovr130"), (6, "_ovr160"), (7, "_ovr170"), (8, "_ovr180"), (9, "_ovr190"),
+    (10, "_ovr1101"), (11, "_ovr1110"), (13, "_ovr1130"),
+]
+_legacyPre1Modules = ["_ovr070", "_ovr080"] # for the SDK 0.7 and 0.8 runtimes
+SDK_MINOR_VERSION = MINOR_VERSION # Minor version negotiated with the runtime by initialize()
+
+
+class EyeRenderDescPre117(Structure):
+    "ovrEyeRenderDesc as returned by ovr_GetRenderDesc before SDK 1.17"
+    _pack_ = 4
+    _fields_ = [
+        ("Eye", EyeType),  #< The eye index to which this instance corresponds.
+        ("Fov", FovPort),  #< The field of view.
+        ("DistortedViewport", Recti),  #< Distortion viewport.
+        ("PixelsPerTanAngleAtCenter", Vector2f),  #< How many display pixels will fit in tan(angle) = 1.
+        ("HmdToEyeOffset", Vector3f),  #< Translation of each eye, in meters.
+    ]
+
+    def __repr__(self):
+        return "ovr.EyeRenderDescPre117(%s, %s, %s, %s, %s)" % (self.Eye, self.Fov, self.DistortedViewport, self.PixelsPerTanAngleAtCenter, self.HmdToEyeOffset)
+
+
+class ViewScaleDescPre117(Structure):
+    "ovrViewScaleDesc as taken by ovr_SubmitFrame before SDK 1.17"
+    _pack_ = 4
+    _fields_ = [
+        ("HmdToEyeOffset", Vector3f * Eye_Count),  #< Translation of each eye.
+        ("HmdSpaceToWorldScaleInMeters", c_float),  #< Ratio of viewer units to meter units.
+    ]
+
+    def __repr__(self):
+        return "ovr.ViewScaleDescPre117(%s, %s)" % (self.HmdToEyeOffset, self.HmdSpaceToWorldScaleInMeters)
+
+
+libovr.prototype("ovr_GetRenderDesc", EyeRenderDescPre117, [Session, EyeType, FovPort])
+def getRenderDescPre117(session, eyeType, fov):
+    """
+    Computes the rendering parameters for the specified eye using the SDK 1.16 and older
+    entry point, which reports the eye position as HmdToEyeOffset.
+    """
+    result = libovr.ovr_GetRenderDesc(session, eyeType, fov)
+    return result
+
+
+libovr.prototype("ovr_SubmitFrame", Result, [Session, c_longlong, POINTER(ViewScaleDescPre117), POINTER(POINTER(LayerHeader)), c_uint])
+def submitFramePre117(session, frameIndex, viewScaleDesc, layerPtrList, layerCount=None):
+    """
+    Submits layers for distortion and display using the SDK 1.16 and older entry point.
+    viewScaleDesc may be a ViewScaleDescPre117 or a ViewScaleDesc, whose HmdToEyePose
+    orientations are dropped.
+    """
+    if isinstance(viewScaleDesc, ViewScaleDesc):
+        oldViewScaleDesc = ViewScaleDescPre117()
+        for eye in range(Eye_Count):
+            oldViewScaleDesc.HmdToEyeOffset[eye] = viewScaleDesc.HmdToEyePose[eye].Position
+        oldViewScaleDesc.HmdSpaceToWorldScaleInMeters = viewScaleDesc.HmdSpaceToWorldScaleInMeters
+        viewScaleDesc = oldViewScaleDesc
+    if layerCount is None:
+        layerCount = len(layerPtrList)
+    layerPtrList = layerPtrArray(layerPtrList)
+    result = libovr.ovr_SubmitFrame(session, frameIndex, byref(viewScaleDesc), byref(layerPtrList), layerCount)
+    if result < 0:
+        _checkResult(result, "submitFrame")
+    return result
+
+
+def _getRenderDescPre117(session, eyeType, fov):
+    "getRenderDesc() for runtimes before SDK 1.17, converting to the current ovrEyeRenderDesc"
+    oldDesc = getRenderDescPre117(session, eyeType, fov)
+    result = EyeRenderDesc(oldDesc.Eye, oldDesc.Fov, oldDesc.DistortedViewport, oldDesc.PixelsPerTanAngleAtCenter)
+    result.HmdToEyePose.Orientation.w = 1.0
+    result.HmdToEyePose.Position = oldDesc.HmdToEyeOffset
+    return result
+
+
+def _getDevicePosesPre117(session, deviceTypes, deviceCount, absTime, outDevicePoses=None):
+    "getDevicePoses() in the form of the SDK 1.16 bindings, which take the number of deviceTypes to query"
+    return _currentBindings["getDevicePoses"](session, deviceTypes[:deviceCount], absTime, outDevicePoses)
+
+
+def _waitToBeginFramePre119(session, frameIndex):
+    "Before SDK 1.19 there is nothing to wait for; ovr_SubmitFrame blocks instead"
+    return Success
+
+
+def _beginFramePre119(session, frameIndex):
+    return Success
+
+
+def _endFramePre119(session, frameIndex, viewScaleDesc, layerPtrList):
+    "endFrame() for runtimes before SDK 1.19, which only have the blocking submitFrame()"
+    return submitFrame(session, frameIndex, viewScaleDesc, layerPtrList)
+
+
+def layerPtrArray(layerPtrList):
+    """
+    Returns the ovrLayerHeader* array that endFrame() and submitFrame() build from their
+    layerPtrList. The array may be passed to them in place of the list, so that a frame loop
+    whose layers do not change need not rebuild it every frame.
+    """
+    if isinstance(layerPtrList, Array):
+        return layerPtrList
+    return (POINTER(LayerHeader) * len(layerPtrList))(*[ctypes.pointer(i) for i in layerPtrList])
+
+
+_layerTypes = {
+    LayerType_Disabled: LayerHeader,
+    LayerType_EyeFov: LayerEyeFov,
+    LayerType_EyeFovDepth: LayerEyeFovDepth,
+    LayerType_Quad: LayerQuad,
+    LayerType_EyeMatrix: LayerEyeMatrix,
+}
+_pre125Layers = {} # id of an array built by _layerPtrArrayPre125() -> (weak reference to it, the layers it copies, or None)
+_pre125Arrays = {} # id of another ovrLayerHeader* array -> (weak reference to it, its pointers, the array of copies)
+
+
+def _arrayEntry(table, array):
+    "The entry of array in table, keyed by id() as ctypes arrays are unhashable, or None"
+    entry = table.get(id(array))
+    return entry if entry is not None and entry[0]() is array else None
+
+
+def _setArrayEntry(table, array, *values):
+    "Sets the entry of array in table, which is removed when array is collected"
+    key = id(array)
+    def remove(reference):
+        if table.get(key, (None,))[0] is reference:
+            del table[key]
+    table[key] = (weakref.ref(array, remove),) + values
+
+
+def _layerPtrArrayPre125(layerPtrList):
+    """
+    layerPtrArray() for runtimes before SDK 1.25, whose ovrLayerHeader has no Reserved
+    block. The array points to copies of the layers without that block, which are
+    refreshed from the layers each time the array is passed to endFrame() or submitFrame().
+    Arrays that point to the layers themselves, e.g. built by a FrameContext before
+    initialize(), are replaced by an array of copies of the layers they point to.
+    """
+    if isinstance(layerPtrList, Array):
+        entry = _arrayEntry(_pre125Layers, layerPtrList)
+        if entry is None:
+            return _layerPtrArrayPre125(_pre125Copies(layerPtrList))
+        layerPtrs, layers = layerPtrList, entry[1]
+    else:
+        # e.g. LayerEyeFov for LayerEyeFov.Header
+        layers = [header if header is None or header._b_base_ is None else header._b_base_ for header in layerPtrList]
+        layerPtrs = (POINTER(LayerHeader) * len(layers))()
+        for i, layer in enumerate(layers):
+            if layer is not None:
+                layerPtrs[i] = cast(create_string_buffer(sizeof(layer) - LayerHeader.Reserved.size), POINTER(LayerHeader))
+        _setArrayEntry(_pre125Layers, layerPtrs, layers)
+    start = LayerHeader.Reserved.offset
+    end = start + LayerHeader.Reserved.size
+    for layerPtr, layer in zip(layerPtrs, layers):
+        if layer is not None:
+            ctypes.memmove(layerPtr, addressof(layer), start)
+            ctypes.memmove(addressof(layerPtr.contents) + start, addressof(layer) + end, sizeof(layer) - end)
+    return layerPtrs
+
+
+def _pre125Copies(layerPtrs):
+    "The _layerPtrArrayPre125() array for the layers that layerPtrs points to, rebuilt when its pointers change"
+    pointers = string_at(addressof(layerPtrs), sizeof(layerPtrs))
+    entry = _arrayEntry(_pre125Arrays, layerPtrs)
+    if entry is not None and entry[1] == pointers:
+        return entry[2]
+    layers = []
+    for address in cast(layerPtrs, POINTER(c_void_p))[:len(layerPtrs)]:
+        if address is None:
+            layers.append(None) # no layer in this slot
+            continue
+        layerType = LayerHeader.from_address(address).Type
+        if layerType not in _layerTypes:
+            raise ValueError("Layer type %d has no SDK 1.%d layout" % (layerType, SDK_MINOR_VERSION))
+        layers.append(_layerTypes[layerType].from_address(address)) # does not keep layerPtrs alive
+    copies = _layerPtrArrayPre125(layers)
+    _setArrayEntry(_pre125Arrays, layerPtrs, pointers, copies)
+    return copies
+
+
+# Functions replaced on runtimes older than the SDK minor version that
+# introduced their current form, oldest first
+_sdkVersionDeltas = [
+    (17, {"getRenderDesc": _getRenderDescPre117, "submitFrame": submitFramePre117, "getDevicePoses": _getDevicePosesPre117}),
+    (19, {"waitToBeginFrame": _waitToBeginFramePre119, "beginFrame": _beginFramePre119, "endFrame": _endFramePre119}),
+    (25, {"layerPtrArray": _layerPtrArrayPre125}),
+]
+_currentBindings = dict((name, globals()[name]) for _, variants in _sdkVersionDeltas for name in variants)
+_selectedBindings = dict(_currentBindings) # name -> the variant selected by selectSdkVersion()
+
+
+def _sdkVersionDispatcher(name):
+    "Returns a function that calls the selected variant of function name"
+    current = _currentBindings[name]
+    def dispatch(*args, **kwargs):
+        return _selectedBindings[name](*args, **kwargs)
+    dispatch.__name__ = current.__name__
+    dispatch.__doc__ = current.__doc__
+    return dispatch
+
+globals().update((name, _sdkVersionDispatcher(name)) for name in _currentBindings)
+
+
+def getRuntimeMinorVersion():
+    """
+    Returns the minor version of the loaded LibOVRRT, parsed from getVersionString().
+    Raises OculusFunctionError if its major version does not match DLL_COMPATIBLE_VERSION.
+    """
+    version = getVersionString().decode("ascii", "replace").split(".")
+    try:
+        major, minor = int(version[0]), int(version[1])
+    except (IndexError, ValueError):
+        return MINOR_VERSION # unrecognized format, assume a current runtime
+    if major != DLL_COMPATIBLE_VERSION % 100:
+        message = "LibOVRRT version %s is not compatible with these bindings (%d.%d)." % (
+            ".".join(version), MAJOR_VERSION, MINOR_VERSION)
+        if major == 0:
+            message += " Use the ovr.%s module instead." % " or ovr.".join(_legacyPre1Modules)
+        raise OculusFunctionError(message)
+    return minor
+
+
+def selectSdkVersion(minorVersion):
+    """
+    Selects the variants for SDK 1.minorVersion of the functions that changed after it.
+    initialize() calls this with the negotiated minor version;
+    selectSdkVersion(MINOR_VERSION) restores the current variants.
+    The functions dispatch to the selected variant on every call, so references to them
+    taken earlier, as by "from ovr import endFrame", follow the selection too.
+    """
+    global SDK_MINOR_VERSION
+    if minorVersion < OLDEST_MINOR_VERSION:
+        raise ValueError("SDK 1.%d is older than the oldest supported version 1.%d; use the ovr.%s module instead" % (
+            minorVersion, OLDEST_MINOR_VERSION, legacyModule(minorVersion)))
+    for firstVersion, variants in _sdkVersionDeltas:
+        for name, variant in variants.items():
+            _selectedBindings[name] = variant if minorVersion < firstVersion else _currentBindings[name]
+    SDK_MINOR_VERSION = minorVersion
+    package = sys.modules.get(__package__ or "")
+    if package is not None:
+        package.SDK_MINOR_VERSION = minorVersion
+    return minorVersion
+
+
+def legacyModule(minorVersion):
+    "Name of the module of the ovr package with the bindings for SDK 1.minorVersion runtimes older than OLDEST_MINOR_VERSION"
+    names = [name for firstVersion, name in _legacyModules if firstVersion <= minorVersion]
+    if minorVersion >= OLDEST_MINOR_VERSION or not names:
+        raise ValueError("No legacy module for SDK 1.%d" % minorVersion)
+    return names[-1]
+
+
+### END SDK version deltas ###
+
+
 # Run test program
 if __name__ == "__main__":
     # Transcribed from initial example at 
@@ -416,7 +878,7 @@ sub process_functions {
         my $py_fn_name = translate_function_name($fn_name);
 
         # Return type for ctypes function
-        my $trans = "libovr.$fn_name.restype = $return_type\n";
+        my $trans = "libovr.prototype(\"$fn_name\", $return_type";
         my @arg_names = ();
         my @arg_types = ();
         my %types_by_arg = ();
@@ -424,7 +886,7 @@ sub process_functions {
 
         # Argument types for ctypes function
         if (defined($argument_list) and $argument_list =~ m/\S/) {
-            $trans .= "libovr.$fn_name.argtypes = [";
+            $trans .= ", [";
             my @args = split '\s*,\s*', $argument_list;
             foreach my $arg (@args) {
                 die $arg unless $arg =~ m/^\s*
@@ -459,8 +921,9 @@ sub process_functions {
                 $types_by_arg{$ident} = $type;
             }
             $trans .= join ", ", @arg_types;
-            $trans .= "]\n";
+            $trans .= "]";
         }
+        $trans .= ")\n";
 
         # Maybe create local variable for out parameters
         my @out_args = ();
@@ -513,7 +976,12 @@ sub process_functions {
             # print $arg, "\n";
             my $pointee_type = $1;
             # print $pointee_type, "\n";
-            $trans .= "    $arg = ($pointee_type * len($arg))(*[ctypes.pointer(i) for i in $arg])\n";
+            if ($pointee_type =~ m/^POINTER\(LayerHeader\)$/) {
+                $trans .= "    $arg = layerPtrArray($arg)\n"; # see SDK version deltas
+            }
+            else {
+                $trans .= "    $arg = ($pointee_type * len($arg))(*[ctypes.pointer(i) for i in $arg])\n";
+            }
         }
         
         # Special case for initialize method
@@ -525,6 +993,14 @@ sub process_functions {
         params.Flags = Init_RequestVersion
         params.RequestedMinorVersion = MINOR_VERSION
         params.ConnectionTimeoutMS = 0
+    # Older runtimes refuse a newer minor version than their own, so request theirs
+    # and select the variants of the functions that changed since (see selectSdkVersion)
+    runtimeMinorVersion = getRuntimeMinorVersion()
+    if params.Flags & Init_RequestVersion:
+        params.RequestedMinorVersion = min(params.RequestedMinorVersion, runtimeMinorVersion)
+        selectSdkVersion(params.RequestedMinorVersion)
+    else:
+        selectSdkVersion(min(MINOR_VERSION, runtimeMinorVersion))
 END_INIT_HACK
         	$trans .= $parammer;
         } 
@@ -565,10 +1041,16 @@ END_INIT_HACK
         $trans .= join ", ", @call_args;
         $trans .= ")\n";
 
+        # Special case for shutdown method
+        if ($py_fn_name eq "shutdown") {
+            $trans .= "    selectSdkVersion(MINOR_VERSION) # until the next initialize() negotiates a version again\n";
+        }
+
         # Handle OVR specific return codes
         if ($return_type =~ m/^Result$/) {
             $trans .= <<EOF;
-    _checkResult(result, \"$py_fn_name\")
+    if result < 0:
+        _checkResult(result, \"$py_fn_name\")
 EOF
         }
         my @return_items = ();
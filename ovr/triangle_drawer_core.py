@@ -0,0 +1,67 @@
+#!/bin/env python
+
+
+import numpy
+from OpenGL.GL import *
+
+from ovr.rift_gl_renderer_core import STEREO_INSTANCES, STEREO_VERTEX_SHADER_HEADER, link_stereo_program
+
+
+class TriangleDrawerCore():
+    "Draws the triangle of TriangleDrawerCompatibility, for both eyes in one call"
+
+    vertex_shader = STEREO_VERTEX_SHADER_HEADER + """
+in vec3 position;
+
+void main() {
+    gl_Position = stereoPosition(vec4(position, 1.0));
+}
+"""
+
+    fragment_shader = """#version 330 core
+out vec4 color;
+
+void main() {
+    color = vec4(0.3, 0.3, 0.3, 1.0);
+}
+"""
+
+    def __init__(self):
+        self.program = None
+        self.vao = None
+        self.vbo = None
+
+    def init_gl(self):
+        size = 0.15
+        x = 0.10
+        y = 0.00
+        z = -0.5
+        vertices = numpy.array([
+            x, y, z,
+            x, y+size, z,
+            x+size, y+size, z,
+        ], dtype=numpy.float32)
+        self.program = link_stereo_program(self.vertex_shader, self.fragment_shader)
+        self.vao = glGenVertexArrays(1)
+        glBindVertexArray(self.vao)
+        self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        position = glGetAttribLocation(self.program, "position")
+        glEnableVertexAttribArray(position)
+        glVertexAttribPointer(position, 3, GL_FLOAT, GL_FALSE, 0, None)
+        glBindVertexArray(0)
+
+    def display_gl(self):
+        glUseProgram(self.program)
+        glBindVertexArray(self.vao)
+        glDrawArraysInstanced(GL_TRIANGLE_STRIP, 0, 3, STEREO_INSTANCES)
+
+    def dispose_gl(self):
+        if self.vao is not None:
+            glDeleteVertexArrays(1, [self.vao])
+            glDeleteBuffers(1, [self.vbo])
+            glDeleteProgram(self.program)
+        self.program = None
+        self.vao = None
+        self.vbo = None
@@ -0,0 +1,270 @@
+#!/bin/env python
+"""
+Measures the per-call cost of the ovr bindings used every frame, and of
+marshalling their structures, and compares it with stored baselines.
+
+    python benchmark_bindings.py                  # compare with benchmark_bindings.json
+    python benchmark_bindings.py --save           # store the results as the new baselines
+    python benchmark_bindings.py --threshold 1.5 getTrackingState endFrame
+
+Unless PYOVR_BACKEND selects a backend, the bindings call benchmark_stub.c,
+a shared library compiled with the C compiler $CC (default "cc") that exports
+the benchmarked entry points with their C prototypes and does no work in
+them (the other entry points the bindings declare are exported as empty
+functions, so that they can be bound but not called), so the results are the cost of the ctypes calls and the marshalling of
+their arguments and results. Each binding is also timed as a "raw" call of
+the backend function with prebuilt arguments, so the difference is the cost
+the Python binding adds. Baselines are stored per backend, in units of the
+time of a small pure-Python reference workload timed just before each
+benchmark, which takes out most of the difference between machines and CPU
+clock speeds.
+
+Every benchmark is measured in each of several runs, and compared by the
+median of the runs. Exits with status 1 if the median of any benchmark
+exceeds threshold times its baseline by more than its noise, three times the
+median absolute deviation of the runs.
+"""
+
+import argparse
+import collections
+import ctypes
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(TESTS_DIR, "benchmark_bindings.json")
+STUB_SOURCE = os.path.join(TESTS_DIR, "benchmark_stub.c")
+NOISE_DEVIATIONS = 3.0 # median absolute deviations of the runs tolerated beyond the threshold
+
+SIZES_SCRIPT = """
+import ctypes
+import ovr
+print(" ".join(str(i) for i in (ctypes.sizeof(ovr.TrackingState), ctypes.sizeof(ovr.HmdDesc),
+    ctypes.sizeof(ovr.EyeRenderDesc), ovr.MAJOR_VERSION, ovr.MINOR_VERSION)))
+print(" ".join(sorted(ovr.libovr._prototypes)))
+"""
+
+
+def build_stub(directory):
+    """
+    Compiles benchmark_stub.c into a shared library in directory, with the sizes of the
+    structures returned by value read from the bindings, and returns its path
+    """
+    env = dict(os.environ, PYOVR_BACKEND="sim", PYTHONPATH=os.path.join(TESTS_DIR, os.pardir))
+    output = subprocess.check_output([sys.executable, "-c", SIZES_SCRIPT], env=env)
+    sizes, names = output.decode().splitlines()
+    trackingState, hmdDesc, eyeRenderDesc, major, minor = sizes.split()
+    with open(STUB_SOURCE) as f:
+        defined = set(re.findall(r"OVR_EXPORT [^(]*\b(ovr_\w+)\(", f.read()))
+    exports = os.path.join(directory, "ovrstub_exports.c")
+    with open(exports, "w") as f:
+        f.write('#include "%s"\n' % STUB_SOURCE.replace("\\", "/"))
+        for name in names.split():
+            if name not in defined:
+                f.write("OVR_EXPORT void %s(void) {}\n" % name)
+    path = os.path.join(directory, "ovrstub.dll" if sys.platform == "win32" else "ovrstub.so")
+    subprocess.check_call([os.environ.get("CC", "cc"), "-shared", "-fPIC", "-O2",
+        "-DTRACKING_STATE_SIZE=%s" % trackingState, "-DHMD_DESC_SIZE=%s" % hmdDesc,
+        "-DEYE_RENDER_DESC_SIZE=%s" % eyeRenderDesc,
+        '-DVERSION_STRING="%s.%s.0"' % (major, minor),
+        "-o", path, exports])
+    return path
+
+
+if "PYOVR_BACKEND" in os.environ:
+    BACKEND = os.environ["PYOVR_BACKEND"]
+else:
+    BACKEND = "stub"
+    _stubDirectory = tempfile.mkdtemp(prefix="pyovr-benchmark-")
+    os.environ["PYOVR_BACKEND"] = build_stub(_stubDirectory)
+sys.path.insert(0, os.path.join(TESTS_DIR, os.pardir))
+
+import ovr
+
+
+class Fixture(object):
+    "Session and prebuilt arguments shared by the benchmarks"
+
+    def __init__(self):
+        try:
+            from ovr.simulated_runtime import SimulatedRuntime, VirtualClock
+            if isinstance(ovr.libovr.library, SimulatedRuntime):
+                ovr.libovr.library.clock = VirtualClock() # endFrame never waits for a vsync
+        except ImportError:
+            pass
+        ovr.initialize(None)
+        self.session, luid = ovr.create()
+        hmdDesc = ovr.getHmdDesc(self.session)
+        self.hmdToEyeOffset = (ovr.Vector3f * 2)()
+        for eye in range(2):
+            self.hmdToEyeOffset[eye] = ovr.getRenderDesc(self.session, eye, hmdDesc.DefaultEyeFov[eye]).HmdToEyePose.Position
+        self.eyePoses = (ovr.Posef * 2)()
+        self.headPose = ovr.getTrackingState(self.session, 0, False).HeadPose.ThePose
+        self.layers = [ovr.LayerEyeFov() for i in range(16)]
+        for layer in self.layers:
+            layer.Header.Type = ovr.LayerType_EyeFov
+        desc = ovr.TextureSwapChainDesc()
+        desc.Type = ovr.Texture_2D
+        desc.Format = ovr.OVR_FORMAT_R8G8B8A8_UNORM_SRGB
+        desc.ArraySize = 1
+        desc.Width = 64
+        desc.Height = 64
+        desc.MipLevels = 1
+        desc.SampleCount = 1
+        self.swapChain = ovr.createTextureSwapChainGL(self.session, desc)
+
+    def close(self):
+        ovr.destroyTextureSwapChain(self.session, self.swapChain)
+        ovr.destroy(self.session)
+        ovr.shutdown()
+
+
+def benchmarks(f):
+    """
+    Returns an OrderedDict of benchmark name -> callable. Names ending in
+    "/raw" call the backend directly.
+    """
+    s = f.session
+    lib = ovr.libovr
+    ovrFalse = ovr.toOvrBool(False)
+    result = collections.OrderedDict()
+
+    result["getTrackingState"] = lambda: ovr.getTrackingState(s, 0, False)
+    result["getTrackingState/raw"] = lambda: lib.ovr_GetTrackingState(s, 0.0, ovrFalse)
+
+    sampleTime = ctypes.c_double()
+    result["getEyePoses"] = lambda: ovr.getEyePoses(s, 0, False, f.hmdToEyeOffset, f.eyePoses)
+    result["getEyePoses/raw"] = lambda: lib.ovr_GetEyePoses(s, 0, ovrFalse, f.hmdToEyeOffset, f.eyePoses, ctypes.byref(sampleTime))
+
+    result["calcEyePoses"] = lambda: ovr.calcEyePoses(f.headPose, f.hmdToEyeOffset, f.eyePoses)
+    result["calcEyePoses/raw"] = lambda: lib.ovr_CalcEyePoses(f.headPose, f.hmdToEyeOffset, f.eyePoses)
+
+    for count in (1, 4, 16):
+        headers = [layer.Header for layer in f.layers[:count]]
+        layerPtrs = ovr.layerPtrArray(headers)
+        result["endFrame[%d]" % count] = lambda headers=headers: ovr.endFrame(s, 0, None, headers)
+        result["endFrame[%d]/prebuilt" % count] = lambda layerPtrs=layerPtrs: ovr.endFrame(s, 0, None, layerPtrs)
+        result["endFrame[%d]/raw" % count] = lambda layerPtrs=layerPtrs, count=count: lib.ovr_EndFrame(s, 0, None, layerPtrs, count)
+
+    inputState = ovr.InputState()
+    result["getInputState"] = lambda: ovr.getInputState(s, ovr.ControllerType_Touch)
+    result["getInputState/raw"] = lambda: lib.ovr_GetInputState(s, ovr.ControllerType_Touch, ctypes.byref(inputState))
+
+    textureId = ctypes.c_uint()
+    result["getTextureSwapChainBufferGL"] = lambda: ovr.getTextureSwapChainBufferGL(s, f.swapChain, 0)
+    result["getTextureSwapChainBufferGL/raw"] = lambda: lib.ovr_GetTextureSwapChainBufferGL(s, f.swapChain, 0, ctypes.byref(textureId))
+
+    perfStats = ovr.PerfStats()
+    result["getPerfStats"] = lambda: ovr.getPerfStats(s)
+    result["getPerfStats/reused"] = lambda: ovr.getPerfStats(s, perfStats)
+    result["getPerfStats/raw"] = lambda: lib.ovr_GetPerfStats(s, ctypes.byref(perfStats))
+
+    # Structure marshalling
+    state = ovr.getTrackingState(s, 0, False)
+    stateBytes = bytes(state)
+    result["TrackingState()"] = ovr.TrackingState
+    result["TrackingState.from_buffer_copy"] = lambda: ovr.TrackingState.from_buffer_copy(stateBytes)
+    result["TrackingState memmove"] = lambda: ctypes.memmove(ctypes.addressof(state), stateBytes, len(stateBytes))
+    result["TrackingState.HeadPose.ThePose.Position.x"] = lambda: state.HeadPose.ThePose.Position.x
+    result["Posef(Quatf, Vector3f)"] = lambda: ovr.Posef(ovr.Quatf(0, 0, 0, 1), ovr.Vector3f(0, 0, 0))
+    result["LayerEyeFov()"] = ovr.LayerEyeFov
+    result["layerPtrArray[4]"] = lambda headers=[layer.Header for layer in f.layers[:4]]: ovr.layerPtrArray(headers)
+    return result
+
+
+def time_call(function, repeats):
+    "Returns the fastest of repeats measurements of the time per call of function, in seconds"
+    timer = timeit.Timer(function)
+    number, total = timer.autorange()
+    return min(timer.repeat(repeats, number)) / number
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2.0
+
+
+def median_absolute_deviation(values):
+    center = median(values)
+    return median([abs(value - center) for value in values])
+
+
+def _reference():
+    return sum(range(256))
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("names", nargs="*", help="run only the benchmarks whose name starts with one of these")
+    parser.add_argument("--runs", type=int, default=5, help="measurements of every benchmark, compared by their median")
+    parser.add_argument("--repeats", type=int, default=3, help="timings per measurement, of which the fastest counts")
+    parser.add_argument("--threshold", type=float, default=1.5, help="largest acceptable ratio to the baseline")
+    parser.add_argument("--baselines", default=BASELINE_FILE)
+    parser.add_argument("--save", action="store_true", help="store the results as baselines")
+    args = parser.parse_args(argv)
+
+    backend = BACKEND
+    baselines = load_baselines(args.baselines)
+    stored = baselines.get(backend, {})
+    fixture = Fixture()
+    costs = collections.OrderedDict() # name -> cost in each run
+    seconds = collections.defaultdict(list)
+    try:
+        selected = [(name, function) for name, function in benchmarks(fixture).items()
+            if not args.names or any(name.startswith(prefix) for prefix in args.names)]
+        for run in range(args.runs): # interleaved, so that a slow spell of the machine affects every benchmark alike
+            for name, function in selected:
+                unit = time_call(_reference, args.repeats)
+                seconds[name].append(time_call(function, args.repeats))
+                costs.setdefault(name, []).append(seconds[name][-1] / unit)
+    finally:
+        fixture.close()
+
+    results = collections.OrderedDict()
+    regressions = []
+    for name, runs in costs.items():
+        results[name] = cost = median(runs)
+        noise = NOISE_DEVIATIONS * median_absolute_deviation(runs)
+        line = "%-45s %9.3f us %7.3f units +- %5.1f%%" % (name, median(seconds[name]) * 1e6, cost, 100.0 * noise / cost)
+        if name in stored:
+            line += "  %5.2fx baseline" % (cost / stored[name])
+            if cost - noise > args.threshold * stored[name]:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+
+    print("backend: %s" % backend)
+    if args.save:
+        stored.update(results)
+        baselines[backend] = stored
+        with open(args.baselines, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print("saved baselines to %s" % args.baselines)
+    elif regressions:
+        print("%d benchmark(s) slower than %.2fx baseline: %s" % (len(regressions), args.threshold, ", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        status = main()
+    finally:
+        if BACKEND == "stub":
+            shutil.rmtree(_stubDirectory, ignore_errors=True)
+    sys.exit(status)
@@ -0,0 +1,109 @@
+#!/bin/env python
+"""
+Measures how long "import ovr" takes in a fresh interpreter, with the ctypes
+function prototypes bound lazily on first call (the default) and with every
+prototype bound during import, as the bindings used to do, and compares the
+results with stored baselines.
+
+    python benchmark_startup.py                  # compare with benchmark_startup.json
+    python benchmark_startup.py --save           # store the results as the new baselines
+
+Unless PYOVR_BACKEND selects a backend, the interpreters load the stub library
+that benchmark_bindings.py compiles from benchmark_stub.c, which exports every
+entry point the bindings declare, so that both paths resolve their symbols in
+a real shared library. As in benchmark_bindings.py, the baselines are stored
+per backend, in units of a small pure-Python reference workload, and the
+benchmark exits with status 1 if the median import time of either path exceeds
+threshold times its baseline by more than its noise.
+"""
+
+import argparse
+import collections
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import benchmark_bindings
+from benchmark_bindings import NOISE_DEVIATIONS, TESTS_DIR, load_baselines, median, median_absolute_deviation, time_call, _reference
+
+BASELINE_FILE = os.path.join(TESTS_DIR, "benchmark_startup.json")
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import ovr
+if %r:
+    ovr.libovr.bindAll()
+print(time.perf_counter() - start)
+"""
+
+
+def time_import(env, eager):
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SCRIPT % eager], env=env)
+    return float(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=21, help="imports of each kind, compared by their median")
+    parser.add_argument("--threshold", type=float, default=1.5, help="largest acceptable ratio to the baseline")
+    parser.add_argument("--baselines", default=BASELINE_FILE)
+    parser.add_argument("--save", action="store_true", help="store the results as baselines")
+    args = parser.parse_args(argv)
+
+    backend = benchmark_bindings.BACKEND
+    baselines = load_baselines(args.baselines)
+    stored = baselines.get(backend, {})
+    env = dict(os.environ) # PYOVR_BACKEND names the stub library, unless it was set
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYTHONPATH"] = os.pathsep.join([os.path.join(TESTS_DIR, os.pardir)] + env.get("PYTHONPATH", "").split(os.pathsep))
+    costs = collections.OrderedDict([("import ovr/lazy", []), ("import ovr/eager", [])])
+    seconds = collections.defaultdict(list)
+    with tempfile.TemporaryDirectory() as cache:
+        env["PYTHONPYCACHEPREFIX"] = cache
+        time_import(env, True) # compile bytecode once, outside of the measurements
+        for run in range(args.runs): # interleaved, so that a slow spell of the machine affects both alike
+            for name, eager in (("import ovr/lazy", False), ("import ovr/eager", True)):
+                unit = time_call(_reference, 3)
+                seconds[name].append(time_import(env, eager))
+                costs[name].append(seconds[name][-1] / unit)
+
+    results = collections.OrderedDict()
+    regressions = []
+    for name, runs in costs.items():
+        results[name] = cost = median(runs)
+        noise = NOISE_DEVIATIONS * median_absolute_deviation(runs)
+        line = "%-20s %9.2f ms %9.1f units +- %5.1f%%" % (name, median(seconds[name]) * 1e3, cost, 100.0 * noise / cost)
+        if name in stored:
+            line += "  %5.2fx baseline" % (cost / stored[name])
+            if cost - noise > args.threshold * stored[name]:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+    lazy, eager = median(seconds["import ovr/lazy"]), median(seconds["import ovr/eager"])
+    print("lazy binding saves %.2f ms (%.0f%%)" % ((eager - lazy) * 1e3, 100.0 * (eager - lazy) / eager))
+
+    print("backend: %s" % backend)
+    if args.save:
+        stored.update(results)
+        baselines[backend] = stored
+        with open(args.baselines, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print("saved baselines to %s" % args.baselines)
+    elif regressions:
+        print("%d benchmark(s) slower than %.2fx baseline: %s" % (len(regressions), args.threshold, ", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        status = main()
+    finally:
+        if benchmark_bindings.BACKEND == "stub":
+            shutil.rmtree(benchmark_bindings._stubDirectory, ignore_errors=True)
+    sys.exit(status)
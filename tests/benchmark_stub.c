@@ -0,0 +1,112 @@
+/*
+ * Stand-in for LibOVRRT for benchmark_bindings.py.
+ *
+ * Exports the ovr_* entry points that the benchmarks call, with the C
+ * prototypes of the SDK headers, and does no work in them, so that timing the
+ * bindings against it measures the ctypes marshalling of their arguments and
+ * results rather than a runtime. benchmark_bindings.py compiles it with the
+ * sizes of the ctypes structures that are returned by value, e.g.
+ *
+ *   cc -shared -fPIC -O2 -DTRACKING_STATE_SIZE=... -DHMD_DESC_SIZE=... \
+ *      -DEYE_RENDER_DESC_SIZE=... -DVERSION_STRING=... -o ovrstub.so ovrstub_exports.c
+ *
+ * where ovrstub_exports.c includes this file and defines every other entry
+ * point that the bindings declare as an empty function, so that all of them
+ * can be bound, as benchmark_startup.py does, though only these can be called.
+ */
+
+#ifdef _WIN32
+#define OVR_EXPORT __declspec(dllexport)
+#else
+#define OVR_EXPORT
+#endif
+
+typedef int ovrResult;
+typedef char ovrBool;
+typedef void *ovrSession;
+typedef void *ovrTextureSwapChain;
+
+typedef struct { float x, y, z; } ovrVector3f;
+typedef struct { float x, y, z, w; } ovrQuatf;
+typedef struct { ovrQuatf Orientation; ovrVector3f Position; } ovrPosef;
+typedef struct { float UpTan, DownTan, LeftTan, RightTan; } ovrFovPort;
+
+/* Only returned by value, through memory the caller provides, so only their size matters */
+typedef struct { char bytes[TRACKING_STATE_SIZE]; } ovrTrackingState;
+typedef struct { char bytes[HMD_DESC_SIZE]; } ovrHmdDesc;
+typedef struct { char bytes[EYE_RENDER_DESC_SIZE]; } ovrEyeRenderDesc;
+
+/* Only passed by pointer */
+typedef struct ovrInitParams ovrInitParams;
+typedef struct ovrGraphicsLuid ovrGraphicsLuid;
+typedef struct ovrErrorInfo ovrErrorInfo;
+typedef struct ovrInputState ovrInputState;
+typedef struct ovrPerfStats ovrPerfStats;
+typedef struct ovrViewScaleDesc ovrViewScaleDesc;
+typedef struct ovrLayerHeader ovrLayerHeader;
+typedef struct ovrTextureSwapChainDesc ovrTextureSwapChainDesc;
+
+static ovrTrackingState trackingState;
+static ovrHmdDesc hmdDesc;
+static ovrEyeRenderDesc eyeRenderDesc;
+static int session, swapChain;
+
+OVR_EXPORT ovrResult ovr_Initialize(const ovrInitParams *params) { return 0; }
+OVR_EXPORT void ovr_Shutdown(void) {}
+OVR_EXPORT void ovr_GetLastErrorInfo(ovrErrorInfo *errorInfo) {}
+OVR_EXPORT const char *ovr_GetVersionString(void) { return VERSION_STRING; }
+
+OVR_EXPORT ovrResult ovr_Create(ovrSession *pSession, ovrGraphicsLuid *pLuid)
+{
+    *pSession = &session;
+    return 0;
+}
+
+OVR_EXPORT void ovr_Destroy(ovrSession session) {}
+OVR_EXPORT ovrHmdDesc ovr_GetHmdDesc(ovrSession session) { return hmdDesc; }
+
+OVR_EXPORT ovrEyeRenderDesc ovr_GetRenderDesc2(ovrSession session, int eyeType, ovrFovPort fov)
+{
+    return eyeRenderDesc;
+}
+
+OVR_EXPORT ovrTrackingState ovr_GetTrackingState(ovrSession session, double absTime, ovrBool latencyMarker)
+{
+    return trackingState;
+}
+
+OVR_EXPORT void ovr_GetEyePoses(ovrSession session, long long frameIndex, ovrBool latencyMarker,
+    const ovrVector3f hmdToEyeOffset[2], ovrPosef outEyePoses[2], double *outSensorSampleTime)
+{
+    *outSensorSampleTime = 0.0;
+}
+
+OVR_EXPORT void ovr_CalcEyePoses(ovrPosef headPose, const ovrVector3f hmdToEyeOffset[2], ovrPosef outEyePoses[2])
+{
+    outEyePoses[0] = outEyePoses[1] = headPose;
+}
+
+OVR_EXPORT ovrResult ovr_EndFrame(ovrSession session, long long frameIndex, const ovrViewScaleDesc *viewScaleDesc,
+    ovrLayerHeader const * const *layerPtrList, unsigned int layerCount)
+{
+    return 0;
+}
+
+OVR_EXPORT ovrResult ovr_GetInputState(ovrSession session, int controllerType, ovrInputState *inputState) { return 0; }
+OVR_EXPORT ovrResult ovr_GetPerfStats(ovrSession session, ovrPerfStats *outStats) { return 0; }
+
+OVR_EXPORT ovrResult ovr_CreateTextureSwapChainGL(ovrSession session, const ovrTextureSwapChainDesc *desc,
+    ovrTextureSwapChain *outTextureSwapChain)
+{
+    *outTextureSwapChain = &swapChain;
+    return 0;
+}
+
+OVR_EXPORT void ovr_DestroyTextureSwapChain(ovrSession session, ovrTextureSwapChain chain) {}
+
+OVR_EXPORT ovrResult ovr_GetTextureSwapChainBufferGL(ovrSession session, ovrTextureSwapChain chain, int index,
+    unsigned int *outTexId)
+{
+    *outTexId = 1;
+    return 0;
+}
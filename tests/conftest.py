@@ -0,0 +1,5 @@
+import os
+
+# Run the test suite against the simulated runtime unless told otherwise,
+# e.g. PYOVR_BACKEND=runtime to test against a real headset.
+os.environ.setdefault("PYOVR_BACKEND", "sim")
@@ -1,9 +1,14 @@
-'''
-Created on Jul 7, 2016
-
-@author: brunsc
-'''
-
-# Programatically run as if "nosetests" on command line
-import nose
-nose.main()
+'''
+Created on Jul 7, 2016
+
+@author: brunsc
+'''
+
+import os
+
+# Use the simulated runtime unless PYOVR_BACKEND says otherwise
+os.environ.setdefault("PYOVR_BACKEND", "sim")
+
+# Programatically run as if "nosetests" on command line
+import nose
+nose.main()
@@ -0,0 +1,61 @@
+"""
+Base class of the tests that run against the simulated runtime.
+"""
+
+import copy
+import unittest
+
+import ovr
+from ovr.simulated_runtime import SimulatedRuntime, VirtualClock
+
+
+# Attributes of SimulatedRuntime that tests steer, restored after each test
+_DATA_STATE = ("session_status", "properties", "boundaries", "inputs") # copied deeply
+_OBJECT_STATE = ("haptics", "native_buffers") # copied, the objects in them shared
+_VALUE_STATE = ("refresh_rate", "head_motion", "version_string", "connected_controllers", "luid", "clock",
+                "texture_arrays")
+
+
+@unittest.skipUnless(isinstance(ovr.libovr.library, SimulatedRuntime), "requires PYOVR_BACKEND=sim")
+class SimTestCase(unittest.TestCase):
+    """
+    Runs each test with a VirtualClock as self.clock, and, unless create_session is
+    False, with ovr initialized and a session as self.hmd, which are destroyed and
+    shut down after the test. The state of the runtime self.runtime, the SDK version
+    selection and the error mode are restored after each test, whatever it changed.
+    """
+
+    create_session = True
+
+    def setUp(self):
+        self.runtime = ovr.libovr.library
+        self._saved_state = self._runtime_state()
+        self.addCleanup(self._restore_runtime_state) # after tearDown and the cleanups added later
+        self.clock = VirtualClock()
+        self.runtime.clock = self.clock
+        if self.create_session:
+            self.open_session()
+
+    def open_session(self):
+        "Initializes ovr and creates self.hmd, for tests with create_session = False"
+        ovr.initialize(None)
+        self.addCleanup(ovr.shutdown)
+        self.hmd, luid = ovr.create()
+        self.addCleanup(ovr.destroy, self.hmd)
+
+    def _runtime_state(self):
+        runtime = self.runtime
+        state = {}
+        for name in _DATA_STATE:
+            state[name] = copy.deepcopy(getattr(runtime, name))
+        for name in _OBJECT_STATE:
+            state[name] = copy.copy(getattr(runtime, name))
+        for name in _VALUE_STATE:
+            state[name] = getattr(runtime, name)
+        return state
+
+    def _restore_runtime_state(self):
+        for name, value in self._saved_state.items():
+            setattr(self.runtime, name, value)
+        ovr.setRaiseOnError(True)
+        ovr.selectSdkVersion(ovr.MINOR_VERSION)
@@ -0,0 +1,66 @@
+#!/bin/env python
+
+import asyncio
+import unittest
+
+import ovr
+from ovr import aio
+from ovr.frame_context import FrameContext
+
+from sim_test_case import SimTestCase
+
+
+class TestAio(SimTestCase):
+
+    create_session = False
+
+    def setUp(self):
+        super(TestAio, self).setUp()
+        asyncio.run(aio.initialize(None))
+        self.addCleanup(ovr.shutdown)
+        self.hmd, luid = asyncio.run(aio.create())
+        self.addCleanup(lambda: asyncio.run(aio.destroy(self.hmd)))
+
+    def test_frames(self):
+        context = FrameContext(self.hmd, [ovr.LayerEyeFov()])
+
+        async def main():
+            ticks = []
+            async for tick in aio.frames(context):
+                ticks.append(tick)
+                await aio.run(context.begin_frame, tick.index)
+                await aio.run(context.end_frame, tick.index)
+                if len(ticks) == 3:
+                    break
+            return ticks
+
+        ticks = asyncio.run(main())
+        self.assertEqual([tick.index for tick in ticks], [0, 1, 2])
+        self.assertTrue(all(ovr.SUCCESS(tick.wait_result) for tick in ticks))
+        self.assertLess(ticks[0].display_time, ticks[2].display_time)
+        self.assertEqual(context.frame_index, 3)
+
+    def test_session_status_changes(self):
+        status = self.runtime.session_status
+
+        async def main():
+            changes = []
+            async for change in aio.session_status_changes(self.hmd, interval=0):
+                changes.append(change.changed)
+                if len(changes) == 1:
+                    status["ShouldRecenter"] = True
+                elif len(changes) == 2:
+                    await aio.recenterTrackingOrigin(self.hmd)
+                else:
+                    break
+            return changes
+
+        changes = asyncio.run(main())
+        self.assertEqual(set(changes[0]), set(aio.STATUS_FIELDS))
+        self.assertFalse(changes[0]["ShouldQuit"])
+        self.assertTrue(changes[0]["HmdMounted"])
+        self.assertEqual(changes[1:], [{"ShouldRecenter": True}, {"ShouldRecenter": False}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/bin/env python
+
+import unittest
+
+import numpy
+
+import ovr
+from ovr.boundary import Boundary
+
+from sim_test_case import SimTestCase
+
+
+class TestBoundary(SimTestCase):
+
+    def test_geometry_count_then_fill(self):
+        points, count = ovr.getBoundaryGeometry(self.hmd, ovr.Boundary_Outer)
+        self.assertEqual(count.value, 5)
+        self.assertEqual(len(points), 5)
+        self.assertAlmostEqual(points[1].z, -1.8, places=6)
+        reused, count = ovr.getBoundaryGeometry(self.hmd, ovr.Boundary_PlayArea, points)
+        self.assertIs(reused, points) # long enough for the 4 play area points
+        self.assertEqual(count.value, 4)
+        del self.runtime.boundaries[ovr.Boundary_PlayArea]
+        points, count = ovr.getBoundaryGeometry(self.hmd, ovr.Boundary_PlayArea)
+        self.assertEqual((len(points), count.value), (0, 0))
+
+    def test_queries_match_rectangle(self):
+        playArea = Boundary(self.hmd, ovr.Boundary_PlayArea)
+        positions = numpy.random.RandomState(7).uniform(-2.0, 2.0, (10000, 3))
+        x, z = numpy.abs(positions[:, 0]), numpy.abs(positions[:, 2])
+        expectedInside = (x < 1.0) & (z < 0.75)
+        outside = numpy.hypot(numpy.maximum(x - 1.0, 0.0), numpy.maximum(z - 0.75, 0.0))
+        expectedDistance = numpy.where(expectedInside, numpy.minimum(1.0 - x, 0.75 - z), outside)
+        numpy.testing.assert_array_equal(playArea.contains(positions), expectedInside)
+        numpy.testing.assert_allclose(playArea.distance(positions), expectedDistance, atol=1e-6)
+        signed = playArea.signed_distance(positions.reshape(100, 100, 3))
+        self.assertEqual(signed.shape, (100, 100))
+        numpy.testing.assert_allclose(signed.ravel(), numpy.where(expectedInside, 1.0, -1.0) * expectedDistance, atol=1e-6)
+        self.assertEqual(playArea.version, 1) # read once for all the queries
+
+    def test_cached_until_changed(self):
+        outer = Boundary(self.hmd, ovr.Boundary_Outer, interval=1.0)
+        apex = [(0.0, 0.0, -1.7)]
+        self.assertTrue(outer.contains(apex)[0])
+        self.runtime.boundaries[ovr.Boundary_Outer] = [(-1.6, 0.0, -1.2), (1.6, 0.0, -1.2), (1.6, 0.0, 1.2), (-1.6, 0.0, 1.2)]
+        self.assertTrue(outer.contains(apex)[0]) # not re-read yet
+        self.clock.advance(1.0)
+        self.assertFalse(outer.contains(apex)[0])
+        self.assertEqual((outer.version, len(outer.points)), (2, 4))
+        self.assertFalse(outer.update(force=True)) # same points
+        del self.runtime.boundaries[ovr.Boundary_Outer]
+        outer.invalidate()
+        self.assertFalse(outer.contains(apex)[0])
+        self.assertFalse(outer.valid)
+        self.assertTrue(numpy.isnan(outer.distance(apex)[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
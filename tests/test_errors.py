@@ -0,0 +1,61 @@
+#!/bin/env python
+
+import unittest
+
+import ovr
+
+from sim_test_case import SimTestCase
+
+
+class TestErrors(SimTestCase):
+
+    def test_typed_exception(self):
+        self.runtime.session_status["DisplayLost"] = True
+        with self.assertRaises(ovr.DisplayLostError) as raised:
+            ovr.waitToBeginFrame(self.hmd, 0)
+        error = raised.exception
+        self.assertIsInstance(error, ovr.OculusFunctionError)
+        self.assertEqual(error.result, ovr.Error_DisplayLost)
+        self.assertEqual(error.function_name, "waitToBeginFrame")
+        self.assertIsNone(error._message) # not formatted until needed
+        self.assertEqual(error.error_info.Result, ovr.Error_DisplayLost)
+        self.assertIn("ovr.waitToBeginFrame() failed. Error code -6000.", str(error))
+
+    def test_error_info_of_the_failed_call(self):
+        self.runtime.session_status["DisplayLost"] = True
+        with self.assertRaises(ovr.DisplayLostError) as raised:
+            ovr.waitToBeginFrame(self.hmd, 0)
+        self.assertRaises(ovr.InvalidOperationError, ovr.create) # a later failure replaces the last error
+        message = str(raised.exception)
+        self.assertIn("Simulated display lost", message)
+        self.assertIn("(-6000)", message)
+        self.assertNotIn("already exists", message)
+        with ovr.noRaise():
+            ovr.waitToBeginFrame(self.hmd, 0)
+            ovr.create()
+            failures = [ovr.getLastFailure()]
+        self.assertEqual(failures[0].error_info.Result, ovr.Error_InvalidOperation) # the latest failure
+
+    def test_exception_type_by_code(self):
+        with self.assertRaises(ovr.OculusFunctionError) as raised:
+            ovr.create() # a session already exists
+        self.assertIs(type(raised.exception), ovr.InvalidOperationError)
+
+    def test_no_raise(self):
+        self.runtime.session_status["DisplayLost"] = True
+        with ovr.noRaise():
+            self.assertIsNone(ovr.getLastFailure())
+            self.assertEqual(ovr.waitToBeginFrame(self.hmd, 0), ovr.Error_DisplayLost)
+            failure = ovr.getLastFailure()
+            self.assertIsInstance(failure, ovr.DisplayLostError)
+            self.assertEqual(failure.function_name, "waitToBeginFrame")
+            self.assertIsNone(ovr.getLastFailure())
+            self.assertIsNone(ovr.getDevicePoses(self.hmd, [ovr.TrackedDevice_Object0], 0.0))
+            self.assertEqual(ovr.getLastFailure().result, ovr.Error_InvalidParameter)
+        self.assertRaises(ovr.DisplayLostError, ovr.waitToBeginFrame, self.hmd, 0)
+        self.assertTrue(ovr.setRaiseOnError(False))
+        self.assertFalse(ovr.setRaiseOnError(True))
+
+
+if __name__ == '__main__':
+    unittest.main()
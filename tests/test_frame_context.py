@@ -0,0 +1,60 @@
+#!/bin/env python
+
+import unittest
+
+import ovr
+from ovr.frame_context import FrameContext
+
+from sim_test_case import SimTestCase
+
+
+class TestFrameContext(SimTestCase):
+
+    def setUp(self):
+        super(TestFrameContext, self).setUp()
+        hmdDesc = ovr.getHmdDesc(self.hmd)
+        self.hmdToEyePoses = [ovr.getRenderDesc(self.hmd, eye, hmdDesc.DefaultEyeFov[eye]).HmdToEyePose for eye in range(2)]
+
+    def test_layers_marshalled_once(self):
+        layer = ovr.LayerEyeFov()
+        layer.Header.Type = ovr.LayerType_EyeFov
+        context = FrameContext(self.hmd, [layer], self.hmdToEyePoses)
+        layerPtrs = context.layerPtrs
+        self.assertFalse(context.set_layers([layer.Header]))
+        for i in range(3):
+            context.wait_to_begin_frame()
+            context.begin_frame()
+            context.end_frame()
+        self.assertIs(context.layerPtrs, layerPtrs)
+        self.assertEqual(context.frame_index, 3)
+        self.assertEqual(ovr.getPerfStats(self.hmd).FrameStats[0].AppFrameIndex, 3)
+        self.assertTrue(context.set_layers([layer, ovr.LayerQuad()]))
+        self.assertEqual(len(context.layerPtrs), 2)
+        context.submit_frame()
+
+    def test_empty_frames_while_not_visible(self):
+        context = FrameContext(self.hmd, [ovr.LayerEyeFov()], self.hmdToEyePoses)
+        self.runtime.session_status["IsVisible"] = False
+        for i in range(2):
+            context.wait_to_begin_frame()
+            context.begin_frame()
+            self.assertEqual(context.end_empty_frame(), ovr.Success_NotVisible)
+        self.runtime.session_status["IsVisible"] = True
+        context.wait_to_begin_frame()
+        context.begin_frame()
+        self.assertEqual(context.end_empty_frame(), ovr.Success)
+        self.assertEqual(context.frame_index, 3)
+        self.assertEqual(ovr.getPerfStats(self.hmd).FrameStats[0].AppFrameIndex, 3)
+
+    def test_calc_eye_poses(self):
+        layer = ovr.LayerEyeFov()
+        context = FrameContext(self.hmd, [layer], self.hmdToEyePoses)
+        self.assertEqual(context.viewScaleDesc.HmdSpaceToWorldScaleInMeters, 1.0)
+        headPose = ovr.getTrackingState(self.hmd, context.get_predicted_display_time(), True).HeadPose.ThePose
+        context.calc_eye_poses(headPose, layer.RenderPose)
+        ipd = sum((a - b)**2 for a, b in zip(layer.RenderPose[0].Position, layer.RenderPose[1].Position)) ** 0.5
+        self.assertAlmostEqual(ipd, 0.064, places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
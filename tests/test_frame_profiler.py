@@ -0,0 +1,84 @@
+#!/bin/env python
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import ovr
+from ovr.frame_context import FrameContext
+from ovr.frame_profiler import FrameProfiler
+from ovr.perf_stats import PerfStatsCollector
+
+from sim_test_case import SimTestCase
+
+
+class TestFrameProfiler(unittest.TestCase):
+
+    def test_disabled(self):
+        profiler = FrameProfiler(enabled=False)
+        with profiler.scope("a"):
+            pass
+        self.assertIs(profiler.scope("a"), profiler.scope("b"))
+        self.assertEqual(profiler.count, 0)
+        self.assertIsNone(profiler.starts) # nothing allocated until enabled
+        self.assertEqual(profiler.chrome_trace()["traceEvents"], [])
+        profiler.enabled = True
+        self.assertEqual(len(profiler.starts), 16384)
+        with profiler.scope("a"):
+            pass
+        self.assertEqual(list(profiler.breakdown(0)), ["a"])
+
+    def test_nested_scopes(self):
+        profiler = FrameProfiler(capacity=7)
+        for frame in range(3):
+            profiler.begin_frame(frame)
+            with profiler.scope("frame"):
+                for eye in range(2):
+                    with profiler.scope("eye"):
+                        pass
+                with profiler.scope("submit"):
+                    pass
+        self.assertEqual(profiler.count, 12)
+        self.assertEqual(list(profiler.breakdown(2)), ["frame", "frame/eye", "frame/submit"])
+        breakdown = profiler.breakdown(2)
+        self.assertGreaterEqual(breakdown["frame"], breakdown["frame/eye"] + breakdown["frame/submit"])
+        # Frame 1 lost its outer scope to the ring
+        self.assertEqual(list(profiler.breakdown(1)), ["eye", "submit"])
+        self.assertEqual(list(profiler.breakdown(0)), [])
+        trace = profiler.chrome_trace()
+        self.assertEqual(len(trace["traceEvents"]), 7)
+        self.assertEqual(trace["traceEvents"][-1]["args"], {"frame": 2})
+
+
+class TestChromeTrace(SimTestCase):
+
+    def setUp(self):
+        super(TestChromeTrace, self).setUp()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_perf_stats(self):
+        context = FrameContext(self.hmd)
+        stats = PerfStatsCollector(self.hmd)
+        profiler = FrameProfiler()
+        for i in range(4):
+            profiler.begin_frame(context.frame_index)
+            with profiler.scope("frame"):
+                context.wait_to_begin_frame()
+                context.begin_frame()
+                context.end_frame()
+            stats.poll()
+        path = os.path.join(self.directory, "trace.json")
+        profiler.write_chrome_trace(path, stats)
+        with open(path) as f:
+            events = json.load(f)["traceEvents"]
+        self.assertEqual([event["args"]["frame"] for event in events], [0, 1, 2, 3])
+        self.assertTrue(all("AppMotionToPhotonLatency" in event["args"] for event in events))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+#!/bin/env python
+
+import threading
+import unittest
+
+from ovr.frame_queue import FrameQueue
+
+
+class TestFrameQueue(unittest.TestCase):
+
+    def test_keeps_newest_without_sink(self):
+        frames = FrameQueue(queueSize=2)
+        for frameIndex in range(5):
+            frames.put(frameIndex, "pixels %d" % frameIndex)
+        self.assertEqual(frames.dropped, 3)
+        self.assertEqual(frames.get(), (3, "pixels 3"))
+        self.assertEqual(frames.get(), (4, "pixels 4"))
+        self.assertIsNone(frames.get())
+        frames.close()
+
+    def test_drops_while_sink_is_busy(self):
+        busy = threading.Event()
+        release = threading.Event()
+        received = []
+        def sink(frameIndex, pixels):
+            busy.set()
+            release.wait(5)
+            received.append(frameIndex)
+        frames = FrameQueue(sink, queueSize=2)
+        frames.put(0, None)
+        self.assertTrue(busy.wait(5))
+        for frameIndex in range(1, 5): # the sink still holds frame 0
+            frames.put(frameIndex, None)
+        self.assertEqual(frames.dropped, 2)
+        release.set()
+        frames.close()
+        self.assertEqual(received, [0, 1, 2])
+
+    def test_sink_error(self):
+        def sink(frameIndex, pixels):
+            raise ValueError("encoder closed")
+        frames = FrameQueue(sink, queueSize=1)
+        for frameIndex in range(20): # never blocks, although the sink stopped consuming
+            frames.put(frameIndex, None)
+        with self.assertRaises(ValueError):
+            frames.close()
+        self.assertIsInstance(frames.error, ValueError)
+        self.assertEqual(frames.dropped, 19) # frame 0 raised, the rest never reached the sink
+
+
+if __name__ == '__main__':
+    unittest.main()
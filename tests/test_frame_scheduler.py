@@ -0,0 +1,64 @@
+#!/bin/env python
+
+import threading
+import time
+import unittest
+
+import ovr
+from ovr.frame_context import FrameContext
+from ovr.frame_scheduler import FrameScheduler
+
+from sim_test_case import SimTestCase
+
+
+class TestFrameScheduler(SimTestCase):
+
+    def setUp(self):
+        super(TestFrameScheduler, self).setUp()
+        self.layer = ovr.LayerEyeFov()
+        self.layer.Header.Type = ovr.LayerType_EyeFov
+        self.context = FrameContext(self.hmd, [self.layer])
+
+    def test_frames_in_order(self):
+        prepared = []
+        def prepare(frame):
+            prepared.append((frame.index, threading.current_thread().name))
+            return frame.index * 10
+        with FrameScheduler(self.context, prepare) as scheduler:
+            for i in range(10):
+                frame = scheduler.next_frame(5.0)
+                self.assertEqual(frame.index, i)
+                self.assertEqual(frame.data, i * 10)
+                self.assertEqual(frame.tracking_state.HeadPose.TimeInSeconds, frame.display_time)
+                scheduler.end_frame(frame)
+        self.assertEqual(self.context.frame_index, 10)
+        self.assertEqual([index for index, thread in prepared[:10]], list(range(10)))
+        self.assertEqual(set(thread for index, thread in prepared), set(["ovr.FrameScheduler"]))
+        self.assertEqual(ovr.getPerfStats(self.hmd).FrameStats[0].AppFrameIndex, 10)
+
+    def test_one_frame_ahead(self):
+        waited = []
+        def prepare(frame):
+            waited.append(frame.index)
+        with FrameScheduler(self.context, prepare) as scheduler:
+            for i in range(5):
+                frame = scheduler.next_frame(5.0)
+                time.sleep(0.01) # render slowly; the worker must not wait for a frame further ahead
+                self.assertLessEqual(max(waited), frame.index + 1)
+                scheduler.end_frame(frame)
+        self.assertEqual(self.context.frame_index, 5)
+        # The simulated runtime rejects frames waited for out of order
+        self.assertRaises(ovr.InvalidOperationError, ovr.waitToBeginFrame, self.hmd, 7)
+        self.assertRaises(ovr.InvalidOperationError, ovr.waitToBeginFrame, self.hmd, 4)
+        self.assertEqual(ovr.beginFrame(self.hmd, 20), ovr.Error_InvalidOperation) # not waited for
+
+    def test_worker_error(self):
+        def prepare(frame):
+            raise ValueError("simulation failed")
+        with FrameScheduler(self.context, prepare) as scheduler:
+            self.assertRaises(ValueError, scheduler.next_frame, 5.0)
+            self.assertRaises(ValueError, scheduler.next_frame, 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
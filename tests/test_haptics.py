@@ -0,0 +1,79 @@
+#!/bin/env python
+
+import time
+import unittest
+
+import numpy
+
+import ovr
+from ovr.haptics import HapticsEngine, HapticsEffect, ConstantEffect, ClipEffect
+from ovr.simulated_runtime import WallClock
+
+from sim_test_case import SimTestCase
+
+
+class TestHapticsEngine(SimTestCase):
+
+    def setUp(self):
+        super(TestHapticsEngine, self).setUp()
+        self.runtime.haptics.clear()
+
+    def run_engine(self, engine, seconds, step=0.01):
+        for i in range(int(round(seconds / step))):
+            engine.pump()
+            self.clock.advance(step)
+
+    def played(self, controllerType):
+        ovr.getControllerVibrationState(self.hmd, controllerType, ovr.HapticsPlaybackState()) # drain up to now
+        return list(self.runtime.haptics[controllerType].played)
+
+    def test_stream_survives_hitch(self):
+        engine = HapticsEngine(self.hmd, lead=0.05)
+        right = ovr.ControllerType_RTouch
+        self.assertEqual(sorted(engine.channels), [ovr.ControllerType_LTouch, right])
+        effect = engine.play(right, ConstantEffect(0.5, duration=0.5))
+        self.run_engine(engine, 0.2)
+        self.clock.advance(0.035) # the pumping thread stalls for less than the lead
+        self.run_engine(engine, 0.5)
+        played = self.played(right)
+        self.assertEqual(played.count(128), 160) # 0.5 s at 320 Hz, uninterrupted
+        start = played.index(128)
+        self.assertEqual(played[start:start + 160], [128] * 160)
+        self.assertEqual(engine.starved, 0)
+        self.assertEqual(engine.playing(right), [])
+        self.assertNotIn(ovr.ControllerType_LTouch, self.runtime.haptics) # nothing was played on it
+        self.assertIsNone(effect.render(numpy.zeros(1, numpy.float32)) or None)
+
+    def test_effect_must_render(self):
+        self.assertRaises(TypeError, HapticsEffect)
+
+    def test_mix_and_starvation(self):
+        engine = HapticsEngine(self.hmd, lead=0.05)
+        left = ovr.ControllerType_LTouch
+        engine.play(left, ConstantEffect(0.75))
+        engine.play(left, ClipEffect(numpy.array([0, 255, 0, 255], numpy.uint8), loop=True))
+        self.run_engine(engine, 0.1)
+        self.clock.advance(0.2) # longer than the lead
+        engine.pump()
+        played = self.played(left)
+        start = played.index(191)
+        self.assertEqual(played[start:start + 4], [191, 255, 191, 255]) # saturated at 1.0
+        self.assertIn(0, played[start:])
+        self.assertEqual(engine.starved, 1)
+        engine.cancel_all(left)
+        self.assertEqual(engine.pump(), 0)
+        self.assertRaises(ValueError, engine.play, ovr.ControllerType_XBox, ConstantEffect(1.0))
+
+    def test_thread(self):
+        self.runtime.clock = WallClock()
+        with HapticsEngine(self.hmd, lead=0.05) as engine:
+            engine.play(ovr.ControllerType_RTouch, ConstantEffect(1.0, duration=0.1))
+            deadline = time.time() + 5
+            while engine.playing(ovr.ControllerType_RTouch) and time.time() < deadline:
+                time.sleep(0.005)
+        self.assertIsNone(engine.error)
+        self.assertEqual(engine.submitted, 40) # 32 samples, rounded up to whole chunks of 20
+
+
+if __name__ == '__main__':
+    unittest.main()
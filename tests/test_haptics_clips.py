@@ -0,0 +1,98 @@
+#!/bin/env python
+
+import io
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import wave
+
+import numpy
+
+import ovr
+from ovr.haptics_clips import HapticsClipCache
+
+from sim_test_case import SimTestCase
+
+
+def wav_data(amplitude, seconds, frequency=3200):
+    "16 bit mono Wav file contents of a constant amplitude"
+    count = int(seconds * frequency)
+    out = io.BytesIO()
+    wav = wave.open(out, "wb")
+    wav.setnchannels(1)
+    wav.setsampwidth(2)
+    wav.setframerate(frequency)
+    wav.writeframes(struct.pack("<%dh" % count, *([int(amplitude * 32767)] * count)))
+    wav.close()
+    return out.getvalue()
+
+
+class TestHapticsClipCache(SimTestCase):
+
+    create_session = False
+
+    def setUp(self):
+        super(TestHapticsClipCache, self).setUp()
+        self.runtime.native_buffers.clear()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_converts_once(self):
+        cache = HapticsClipCache()
+        data = wav_data(0.5, 0.1)
+        clip = cache.load_wav("impact", data)
+        self.assertEqual(clip.size, 32) # 0.1 s at 320 Hz
+        self.assertEqual(list(clip.samples()), [127] * 32)
+        self.assertEqual(len(self.runtime.native_buffers), 1) # the audio data was released
+        self.assertIs(cache.load_wav("impact", data), clip)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        effect = clip.effect(loop=True)
+        cache.clear()
+        self.assertEqual(self.runtime.native_buffers, {})
+        self.assertEqual(cache.size, 0)
+        out = numpy.zeros(40, numpy.float32)
+        self.assertTrue(effect.render(out)) # the effect has its own copy of the samples
+        self.assertAlmostEqual(float(out[-1]), 127 / 255.0)
+
+    def test_lru_budget(self):
+        cache = HapticsClipCache(budget=80)
+        for key in ("a", "b"):
+            cache.load_wav(key, wav_data(0.25, 0.1))
+        cache.get("a")
+        cache.load_wav("c", wav_data(1.0, 0.1))
+        self.assertEqual(cache.keys(), ["a", "c"])
+        self.assertEqual((cache.size, cache.evictions), (64, 1))
+        self.assertEqual(len(self.runtime.native_buffers), 2)
+        big = cache.load_wav("big", wav_data(1.0, 0.5))
+        self.assertEqual(cache.keys(), ["big"]) # the newest clip is kept even over budget
+        self.assertEqual(list(self.runtime.native_buffers), [big.clip.Samples])
+
+    def test_save_and_map(self):
+        path = os.path.join(self.directory, "effects.ovrhap")
+        cache = HapticsClipCache()
+        cache.load_wav("soft", wav_data(0.25, 0.1))
+        cache.load_wav(u"härt", wav_data(1.0, 0.05))
+        cache.save(path)
+        cache.clear()
+
+        loaded = HapticsClipCache()
+        added = loaded.load(path)
+        self.assertEqual([clip.key for clip in added], ["soft", u"härt"])
+        self.assertEqual(self.runtime.native_buffers, {}) # mapped, not converted
+        self.assertEqual(list(loaded.get("soft").samples()), [64] * 32)
+        self.assertEqual(loaded.get(u"härt").clip.SamplesCount, 16)
+        self.assertEqual(loaded.load(path), []) # keys already held are kept
+        loaded.clear()
+        self.assertEqual(len(loaded), 0)
+
+        with open(path, "r+b") as f:
+            f.write(b"NOTCLIPS")
+        self.assertRaises(ValueError, loaded.load, path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/bin/env python
+
+import time
+import unittest
+
+import numpy
+
+import ovr
+from ovr.input_history import InputHistory, INPUT_DTYPE
+
+from sim_test_case import SimTestCase
+
+
+class TestInputHistory(SimTestCase):
+
+    def poll(self, history, buttons, trigger=0.0):
+        self.runtime.inputs[ovr.ControllerType_Touch] = {"Buttons": buttons, "IndexTrigger": (trigger, 0.0)}
+        history.poll()
+        self.clock.advance(0.004)
+
+    def test_edges(self):
+        history = InputHistory(self.hmd, capacity=8)
+        touch = ovr.ControllerType_Touch
+        self.assertEqual(history.pressed(touch), 0)
+        for buttons in (0, ovr.Button_A, ovr.Button_A | ovr.Button_X, ovr.Button_X):
+            self.poll(history, buttons)
+        self.assertEqual(list(history.rings), [touch]) # only connected types are polled
+        times, samples = history.window(touch)
+        self.assertEqual(samples.dtype, INPUT_DTYPE)
+        self.assertEqual(list(samples["Buttons"]), [0, ovr.Button_A, ovr.Button_A | ovr.Button_X, ovr.Button_X])
+        self.assertEqual(history.pressed(touch), ovr.Button_A | ovr.Button_X)
+        self.assertEqual(history.released(touch), ovr.Button_A)
+        self.assertEqual(history.held(touch), 0)
+        # The window starts at the last sample polled at or before since
+        since = times[2]
+        self.assertEqual(history.pressed(touch, since), 0)
+        self.assertEqual(history.released(touch, since), ovr.Button_A)
+        self.assertEqual(history.held(touch, since), ovr.Button_X)
+        edgeTimes, pressed, released = history.edges(touch, times[1] + 0.001)
+        self.assertEqual(list(edgeTimes), list(times[2:]))
+        self.assertEqual(list(pressed), [ovr.Button_X, 0])
+        self.assertEqual(list(released), [0, ovr.Button_A])
+
+    def test_ring_and_analog(self):
+        history = InputHistory(self.hmd, capacity=4)
+        for i in range(10):
+            self.poll(history, 0, 0.1 * i)
+        times, samples = history.window(ovr.ControllerType_Touch)
+        self.assertEqual(len(samples), 3) # capacity - 1 readable slots
+        self.assertTrue(numpy.all(numpy.diff(times) > 0))
+        mean = history.analog(ovr.ControllerType_Touch, "IndexTrigger")
+        self.assertAlmostEqual(float(mean[0]), 0.8, places=5)
+        self.assertEqual(history.analog(ovr.ControllerType_Touch, "Thumbstick").shape, (2, 2))
+        self.assertIsNone(history.analog(ovr.ControllerType_XBox, "HandTrigger"))
+        self.assertRaises(ValueError, history.analog, ovr.ControllerType_Touch, "Buttons")
+
+    def test_thread(self):
+        self.runtime.clock = ovr.simulated_runtime.WallClock()
+        self.runtime.connected_controllers = ovr.ControllerType_Touch | ovr.ControllerType_XBox
+        with InputHistory(self.hmd, rate=1000.0) as history:
+            deadline = time.time() + 5
+            while ovr.ControllerType_XBox not in history.rings and time.time() < deadline:
+                time.sleep(0.001)
+        self.assertGreater(len(history.window(ovr.ControllerType_XBox)[1]), 0)
+        self.assertGreater(len(history.window(ovr.ControllerType_Touch)[1]), 0)
+
+    def test_thread_error(self):
+        prototype = self.runtime.ovr_GetInputState
+        self.addCleanup(setattr, prototype, "_simulation", prototype._simulation)
+        prototype._simulation = lambda session, controllerType, inputState: self.runtime._fail(
+            ovr.Error_ServiceConnection, "Lost the connection to the service.")
+        history = InputHistory(self.hmd)
+        history.start()
+        history._thread.join(5.0)
+        self.assertFalse(history._thread.is_alive())
+        self.assertIsInstance(history.error, ovr.ServiceConnectionError)
+        self.assertRaises(ovr.ServiceConnectionError, history.pressed, ovr.ControllerType_Touch)
+        self.assertRaises(ovr.ServiceConnectionError, history.stop)
+        self.assertIsNone(history._thread)
+
+
+if __name__ == '__main__':
+    unittest.main()
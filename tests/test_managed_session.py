@@ -0,0 +1,110 @@
+#!/bin/env python
+
+import ctypes
+import unittest
+
+import ovr
+from ovr.frame_context import FrameContext
+from ovr.managed_session import ManagedSession, is_display_lost
+
+from sim_test_case import SimTestCase
+
+
+class TestManagedSession(SimTestCase):
+
+    create_session = False
+
+    def setUp(self):
+        super(TestManagedSession, self).setUp()
+        ovr.initialize(None)
+        self.addCleanup(ovr.shutdown)
+        self.managed = ManagedSession()
+        self.managed.create()
+        self.addCleanup(self.managed.destroy)
+        desc = ovr.TextureSwapChainDesc()
+        desc.Type = ovr.Texture_2D
+        desc.ArraySize = 1
+        desc.Format = ovr.OVR_FORMAT_R8G8B8A8_UNORM_SRGB
+        desc.Width, desc.Height = 64, 32
+        desc.MipLevels = desc.SampleCount = 1
+        self.chain = self.managed.create_swap_chain(desc)
+        mirrorDesc = ovr.MirrorTextureDesc()
+        mirrorDesc.Width, mirrorDesc.Height = 32, 16
+        self.mirror = self.managed.create_mirror_texture(mirrorDesc)
+
+    def lose_display(self, context):
+        self.runtime.session_status["DisplayLost"] = True
+        with self.assertRaises(ovr.OculusFunctionError) as raised:
+            context.wait_to_begin_frame()
+        self.assertTrue(is_display_lost(raised.exception))
+        self.assertEqual(raised.exception.result, ovr.Error_DisplayLost)
+
+    def test_recover_in_place(self):
+        session = self.managed.session
+        context = FrameContext(session, [ovr.LayerEyeFov()])
+        oldTexture = ovr.getTextureSwapChainBufferGL(session, self.chain, 0).value
+        oldAddress = ctypes.addressof(session.contents)
+        self.lose_display(context)
+        self.assertTrue(self.managed.recover(timeout=0))
+        self.assertIs(self.managed.session, session)
+        self.assertNotEqual(ctypes.addressof(session.contents), oldAddress)
+        # The handles held before now name the re-created objects
+        self.assertEqual(ovr.getTextureSwapChainDesc(session, self.chain).Width, 64)
+        self.assertNotEqual(ovr.getTextureSwapChainBufferGL(session, self.chain, 0).value, oldTexture)
+        ovr.getMirrorTextureBufferGL(session, self.mirror)
+        self.assertEqual(ovr.getSessionStatus(session).DisplayLost, b"\x00")
+        context.wait_to_begin_frame()
+        context.begin_frame()
+        context.end_frame()
+        self.assertEqual(self.managed.recoveries, 1)
+
+    def test_recover_waits_for_hmd(self):
+        context = FrameContext(self.managed.session, [ovr.LayerEyeFov()])
+        self.lose_display(context)
+        self.runtime.session_status["HmdPresent"] = False
+        with self.assertRaises(ovr.OculusFunctionError):
+            self.managed.recover(timeout=0)
+        self.runtime.session_status["HmdPresent"] = True
+        self.runtime.luid = b"other\x00\x00"
+        self.assertFalse(self.managed.recover(timeout=0))
+        self.assertEqual(self.managed.luid.Reserved, b"other")
+        context.wait_to_begin_frame()
+
+    def test_recover_without_raising(self):
+        context = FrameContext(self.managed.session, [ovr.LayerEyeFov()])
+        self.lose_display(context)
+        self.runtime.session_status["HmdPresent"] = False
+        with ovr.noRaise():
+            # A failed ovr.create() raises rather than leaving a NULL session
+            self.assertRaises(ovr.NoHmdError, self.managed.recover, 0)
+            self.runtime.session_status["HmdPresent"] = True
+            self.assertTrue(self.managed.recover(timeout=0))
+            self.assertEqual(context.wait_to_begin_frame(), ovr.Success)
+            self.assertIsNone(ovr.getLastFailure())
+        self.assertEqual(self.managed.recoveries, 1)
+
+    def test_recover_destroyed(self):
+        self.managed.destroy()
+        self.assertIsNone(self.managed.luid)
+        self.assertFalse(self.managed.recover(timeout=0)) # no adapter to compare with
+        self.assertIsNotNone(self.managed.session)
+        self.assertEqual(self.managed.luid.Reserved, b"simovr")
+        self.assertEqual(ovr.getSessionStatus(self.managed.session).HmdPresent, b"\x01")
+
+    def test_texture_arrays(self):
+        desc = ovr.getTextureSwapChainDesc(self.managed.session, self.chain)
+        desc.ArraySize = 2
+        # Rejected like the PC runtime does, which doesn't support texture arrays
+        self.assertFalse(self.managed.supports_texture_arrays())
+        with self.assertRaises(ovr.OculusFunctionError) as raised:
+            self.managed.create_swap_chain(desc)
+        self.assertEqual(raised.exception.result, ovr.Error_InvalidParameter)
+        self.assertEqual(len(self.managed.swap_chains), 1)
+        self.runtime.texture_arrays = True
+        self.assertTrue(self.managed.supports_texture_arrays())
+        chain = self.managed.create_swap_chain(desc)
+        self.assertEqual(ovr.getTextureSwapChainDesc(self.managed.session, chain).ArraySize, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/bin/env python
+
+import unittest
+
+import ovr
+from ovr.frame_context import FrameContext
+from ovr.perf_stats import PerfStatsCollector
+
+from sim_test_case import SimTestCase
+
+
+class TestPerfStatsCollector(SimTestCase):
+
+    def setUp(self):
+        super(TestPerfStatsCollector, self).setUp()
+        self.context = FrameContext(self.hmd)
+
+    def frame(self, extraVsyncs=0):
+        self.context.wait_to_begin_frame()
+        self.context.begin_frame()
+        self.clock.advance(extraVsyncs / 90.0)
+        self.context.end_frame()
+
+    def test_collect(self):
+        alerts = []
+        stats = PerfStatsCollector(self.hmd, capacity=16)
+        stats.add_callback(lambda name, value, budget, frame: alerts.append((name, value, frame.AppFrameIndex)))
+        for i in range(3):
+            self.frame()
+        self.assertEqual(stats.poll(), 3)
+        self.assertEqual(stats.poll(), 0)
+        self.frame(extraVsyncs=2)
+        self.frame()
+        stats.poll()
+        self.assertEqual(len(stats), 5)
+        self.assertEqual(stats.values("AppDroppedFrameCount"), [0, 0, 0, 2, 0])
+        self.assertEqual(alerts, [("AppDroppedFrameCount", 2, 4)])
+        self.assertEqual(stats.percentiles("AppDroppedFrameCount"), (0, 2, 2))
+        self.assertEqual(stats.percentiles("AppDroppedFrameCount", window=2), (0, 2, 2))
+        vsyncs = list(stats.vsync_index)[:5]
+        self.assertEqual(vsyncs, sorted(set(vsyncs)))
+
+    def test_ring(self):
+        stats = PerfStatsCollector(self.hmd, capacity=4, budgets={})
+        self.assertEqual(stats.percentiles("AppMotionToPhotonLatency"), (None, None, None))
+        for i in range(10):
+            self.frame()
+            stats.poll()
+        self.assertEqual(stats.count, 10)
+        self.assertEqual(len(stats.values("AppCpuElapsedTime")), 4)
+        self.assertEqual(sorted(stats.summary()), sorted(stats.fields))
+        self.assertRaises(ValueError, PerfStatsCollector, self.hmd, fields=["AppGpuElapsedTime"], budgets={"AppCpuElapsedTime": 0.01})
+
+
+if __name__ == '__main__':
+    unittest.main()
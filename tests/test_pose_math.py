@@ -0,0 +1,138 @@
+#!/bin/env python
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import ovr
+
+from sim_test_case import SimTestCase
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestPoseMath(unittest.TestCase):
+
+    def setUp(self):
+        from ovr import pose_math
+        self.pm = pose_math
+        rng = numpy.random.RandomState(1)
+        self.quats = self.pm.quat_normalize(rng.normal(size=(50, 4))).astype(numpy.float32)
+        self.vectors = rng.normal(size=(50, 3)).astype(numpy.float32)
+
+    def test_as_array_is_a_view(self):
+        poses = (ovr.Posef * 3)()
+        view = self.pm.as_array(poses)
+        self.assertEqual(view.shape, (3,))
+        view["Orientation"][:, 3] = 1.0
+        view["Position"][2] = (1, 2, 3)
+        self.assertEqual(poses[0].Orientation.w, 1.0)
+        self.assertEqual(list(poses[2].Position), [1, 2, 3])
+        state = ovr.PoseStatef()
+        state.TimeInSeconds = 4.5
+        self.assertEqual(self.pm.as_array(state)["TimeInSeconds"], 4.5)
+        self.assertEqual(self.pm.as_array(ovr.Matrix4f()).shape, (4, 4))
+
+    def test_euler_angles_match_quatf(self):
+        angles = self.pm.euler_angles(self.quats)
+        for q, abc in zip(self.quats, angles):
+            expected = ovr.Quatf(*q).getEulerAngles()
+            numpy.testing.assert_allclose(abc, expected, atol=1e-5)
+        angles = self.pm.euler_angles(self.quats, 1, 0, 2, -1, -1)
+        numpy.testing.assert_allclose(angles[7], ovr.Quatf(*self.quats[7]).getEulerAngles(1, 0, 2, -1, -1), atol=1e-5)
+
+    def test_rotation(self):
+        rotated = self.pm.quat_rotate(self.quats, self.vectors)
+        matrices = self.pm.quat_to_matrix(self.quats)
+        numpy.testing.assert_allclose(rotated, numpy.einsum("nij,nj->ni", matrices, self.vectors), atol=1e-5)
+        back = self.pm.quat_rotate(self.pm.quat_inverse(self.quats), rotated)
+        numpy.testing.assert_allclose(back, self.vectors, atol=1e-5)
+        product = self.pm.quat_multiply(self.quats, self.pm.quat_inverse(self.quats))
+        numpy.testing.assert_allclose(product, numpy.tile([0, 0, 0, 1], (50, 1)), atol=1e-6)
+
+    def test_slerp(self):
+        a, b = self.quats[:-1], self.quats[1:]
+        numpy.testing.assert_allclose(numpy.abs(numpy.sum(self.pm.quat_slerp(a, b, 0.0) * a, axis=-1)), 1.0, atol=1e-5)
+        numpy.testing.assert_allclose(numpy.abs(numpy.sum(self.pm.quat_slerp(a, b, 1.0) * b, axis=-1)), 1.0, atol=1e-5)
+        half = self.pm.quat_slerp(a, b, 0.5)
+        numpy.testing.assert_allclose(numpy.abs(numpy.sum(half * a, axis=-1)), numpy.abs(numpy.sum(half * b, axis=-1)), atol=1e-5)
+
+    def test_pose_matrices(self):
+        poses = (ovr.Posef * 50)()
+        view = self.pm.as_array(poses)
+        view["Orientation"] = self.quats
+        view["Position"] = self.vectors
+        m = self.pm.pose_to_matrix(view)
+        self.assertEqual(m.shape, (50, 4, 4))
+        points = numpy.ones((50, 3), dtype=numpy.float32)
+        expected = self.pm.pose_transform(view["Orientation"], view["Position"], points)
+        numpy.testing.assert_allclose(numpy.einsum("nij,nj->ni", m[:, :3, :3], points) + m[:, :3, 3], expected, atol=1e-5)
+        inverse = self.pm.pose_to_matrix(*self.pm.pose_inverse(view["Orientation"], view["Position"]))
+        numpy.testing.assert_allclose(numpy.matmul(m, inverse), numpy.tile(numpy.eye(4), (50, 1, 1)), atol=1e-5)
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestNumpyViews(unittest.TestCase):
+
+    def test_matrix4f(self):
+        m = ovr.Matrix4f()
+        for row in range(4):
+            for col in range(4):
+                m.M[row][col] = 10 * row + col
+        view = m.as_numpy()
+        self.assertEqual(view.shape, (4, 4))
+        self.assertEqual(view[1, 3], 13)
+        self.assertEqual(m.as_numpy(column_major=True)[1, 3], 31)
+        self.assertEqual(list(m.as_numpy(column_major=True).ravel(order="K")), list(view.ravel()))
+        self.assertEqual([m[i] for i in range(16)], list(view.T.ravel()))
+        view[0, 0] = -1.0
+        self.assertEqual(m.M[0][0], -1.0)
+        self.assertTrue(view.flags.c_contiguous)
+        self.assertEqual(bytes(memoryview(m)), view.tobytes())
+
+    def test_vectors_and_poses(self):
+        v = ovr.Vector3f(1, 2, 3)
+        self.assertEqual(list(v.as_numpy()), [1, 2, 3])
+        v.as_numpy()[2] = 5
+        self.assertEqual(v.z, 5)
+        q = ovr.Quatf(0, 0, 0, 1)
+        self.assertEqual(q.as_numpy().dtype, numpy.float32)
+        self.assertEqual(q.as_numpy().shape, (4,))
+        pose = ovr.Posef(q, v)
+        pose.as_numpy()["Position"][0] = 7
+        self.assertEqual(pose.Position.x, 7)
+        self.assertEqual(list(pose.as_numpy()["Orientation"]), [0, 0, 0, 1])
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestEyeViewProjection(SimTestCase):
+
+    def test_view_projection(self):
+        from ovr import pose_math
+        hmdDesc = ovr.getHmdDesc(self.hmd)
+        hmdToEyeOffset = [ovr.getRenderDesc(self.hmd, eye, hmdDesc.DefaultEyeFov[eye]).HmdToEyePose.Position for eye in range(2)]
+        headPose = ovr.Posef(ovr.Quatf(0.1, 0.3, -0.2, 0.9), ovr.Vector3f(0.5, 1.7, -2.0))
+        headPose.as_numpy()["Orientation"] /= numpy.linalg.norm(headPose.as_numpy()["Orientation"])
+        eyePoses = pose_math.as_array(ovr.calcEyePoses(headPose, hmdToEyeOffset))
+        projections = numpy.stack([ovr.matrix4f_Projection(hmdDesc.DefaultEyeFov[eye], 0.2, 100.0,
+                ovr.Projection_ClipRangeOpenGL).as_numpy() for eye in range(2)])
+        out = numpy.zeros((2, 4, 4), dtype=numpy.float32)
+        result = pose_math.view_projection(projections, eyePoses["Orientation"], eyePoses["Position"], out=out)
+        self.assertIs(result, out)
+        # Points given in the space of each eye land where its projection alone puts them
+        points = numpy.random.RandomState(2).uniform(-1, 1, size=(2, 3)).astype(numpy.float32) - (0, 0, 2)
+        world = pose_math.pose_transform(eyePoses["Orientation"], eyePoses["Position"], points)
+        clip = numpy.einsum("eij,ej->ei", out, numpy.concatenate([world, numpy.ones((2, 1))], axis=-1))
+        expected = numpy.einsum("eij,ej->ei", projections, numpy.concatenate([points, numpy.ones((2, 1))], axis=-1))
+        numpy.testing.assert_allclose(clip, expected, atol=1e-4)
+        # A point straight ahead of the eye projects onto the axis of its frustum
+        ahead = numpy.einsum("eij,ej->ei", out, numpy.concatenate([
+                pose_math.pose_transform(eyePoses["Orientation"], eyePoses["Position"], (0, 0, -1)), numpy.ones((2, 1))], axis=-1))
+        numpy.testing.assert_allclose(ahead[:, 3], 1.0, atol=1e-5)
+        numpy.testing.assert_allclose(ahead[:, :2], -projections[:, :2, 2], atol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/bin/env python
+
+import time
+import unittest
+
+import ovr
+from ovr.pose_sampler import PoseSampler
+
+from sim_test_case import SimTestCase
+
+
+class TestPoseSampler(SimTestCase):
+
+    def test_ring(self):
+        sampler = PoseSampler(self.hmd, capacity=8, deviceTypes=[ovr.TrackedDevice_HMD])
+        self.assertIsNone(sampler.latest())
+        for i in range(20):
+            sampler.sample()
+            self.clock.advance(0.001)
+        self.assertEqual(sampler.count, 20)
+        self.assertAlmostEqual(sampler.latest_time(), 0.019)
+        self.assertAlmostEqual(sampler.latest().HeadPose.TimeInSeconds, 0.019)
+        # Only the newest capacity - 1 samples are readable
+        times, states, devicePoses = sampler.window(0.0)
+        self.assertEqual(len(times), 7)
+        self.assertAlmostEqual(times[0], 0.013)
+        self.assertAlmostEqual(states[-1].HeadPose.TimeInSeconds, 0.019)
+        self.assertAlmostEqual(devicePoses[-1][0].TimeInSeconds, 0.019)
+        times, states, devicePoses = sampler.window(0.0145, 0.0175)
+        self.assertEqual([round(t, 3) for t in times], [0.015, 0.016, 0.017])
+        self.assertEqual(len(sampler.window(1.0)[0]), 0)
+
+    def test_fill_in_place(self):
+        state = ovr.TrackingState()
+        self.clock.advance(0.25)
+        self.assertIs(ovr.getTrackingState(self.hmd, 0, False, state), state)
+        self.assertAlmostEqual(state.HeadPose.TimeInSeconds, 0.25)
+        deviceTypes = (ovr.TrackedDeviceType * 1)(ovr.TrackedDevice_HMD)
+        poses = (ovr.PoseStatef * 1)()
+        self.assertIs(ovr.getDevicePoses(self.hmd, deviceTypes, 0, outDevicePoses=poses), poses)
+        self.assertAlmostEqual(poses[0].TimeInSeconds, 0.25)
+
+    def test_thread(self):
+        with PoseSampler(self.hmd, rate=2000.0, capacity=64) as sampler:
+            deadline = time.time() + 5.0
+            while sampler.count < 100 and time.time() < deadline:
+                self.clock.advance(0.0005)
+                time.sleep(0.001)
+                sampler.latest()
+        self.assertGreaterEqual(sampler.count, 100)
+        times, states = sampler.window(0.0)
+        self.assertEqual(len(times), 63)
+        self.assertEqual(list(times), sorted(times))
+
+    def test_sdk_1_16(self):
+        ovr.selectSdkVersion(16)
+        sampler = PoseSampler(self.hmd, capacity=8, deviceTypes=[ovr.TrackedDevice_HMD])
+        self.clock.advance(0.25)
+        sampler.sample()
+        self.assertAlmostEqual(sampler.window(0.0)[2][0][0].TimeInSeconds, 0.25)
+
+    def test_thread_error(self):
+        sampler = PoseSampler(self.hmd, deviceTypes=[ovr.TrackedDevice_Object0]) # not simulated
+        sampler.start()
+        sampler._thread.join(5.0)
+        self.assertIsInstance(sampler.error, ovr.OculusFunctionError)
+        self.assertEqual(sampler.error.result, ovr.Error_InvalidParameter)
+        self.assertRaises(ovr.OculusFunctionError, sampler.latest)
+        self.assertRaises(ovr.OculusFunctionError, sampler.stop)
+        self.assertIsNone(sampler._thread)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/bin/env python
+
+import unittest
+
+import ovr
+from ovr.property_cache import PropertyCache
+from ovr.session_status import SessionStatusMonitor
+
+from sim_test_case import SimTestCase
+
+
+class TestPropertyCache(SimTestCase):
+
+    def setUp(self):
+        super(TestPropertyCache, self).setUp()
+        self.now = 0.0
+        self.properties = PropertyCache(self.hmd, ttl=1.0, ttls={ovr.KEY_PLAYER_HEIGHT: None}, clock=lambda: self.now)
+
+    def test_ttl(self):
+        properties = self.properties
+        self.assertEqual(properties.get_float(ovr.KEY_EYE_HEIGHT, 1.5), 1.5)
+        self.runtime.properties[ovr.KEY_EYE_HEIGHT] = 1.25
+        self.assertEqual(properties.get_float(ovr.KEY_EYE_HEIGHT, 1.5), 1.5) # still fresh
+        self.assertEqual(properties.get_float(ovr.KEY_EYE_HEIGHT, 1.0), 1.25) # another default is another read
+        self.now = 0.5
+        self.assertEqual(properties.get_float(ovr.KEY_EYE_HEIGHT, 1.0), 1.25)
+        self.runtime.properties[ovr.KEY_EYE_HEIGHT] = 1.75
+        self.now = 1.0
+        self.assertEqual(properties.get_float(ovr.KEY_EYE_HEIGHT, 1.0), 1.75)
+        self.assertEqual((properties.hits, properties.misses), (2, 3))
+        self.assertAlmostEqual(properties.hit_rate, 0.4)
+        self.runtime.properties[ovr.KEY_PLAYER_HEIGHT] = 1.5
+        self.assertEqual(properties.get_float(ovr.KEY_PLAYER_HEIGHT, 0.0), 1.5)
+        self.runtime.properties[ovr.KEY_PLAYER_HEIGHT] = 1.25
+        self.now = 100.0
+        self.assertEqual(properties.get_float(ovr.KEY_PLAYER_HEIGHT, 0.0), 1.5) # no ttl
+        properties.invalidate(ovr.KEY_PLAYER_HEIGHT)
+        self.assertEqual(properties.get_float(ovr.KEY_PLAYER_HEIGHT, 0.0), 1.25)
+
+    def test_write_through(self):
+        properties = self.properties
+        self.assertTrue(properties.set_float(ovr.KEY_PLAYER_HEIGHT, 1.8))
+        self.assertEqual(self.runtime.properties[ovr.KEY_PLAYER_HEIGHT], 1.8)
+        self.assertAlmostEqual(properties.get_float(ovr.KEY_PLAYER_HEIGHT, 0.0), 1.8, places=6)
+        self.assertTrue(properties.set_int(ovr.KEY_PLAYER_HEIGHT, 2))
+        self.assertEqual(properties.get_int(ovr.KEY_PLAYER_HEIGHT, 0), 2)
+        self.assertEqual(properties.misses, 0)
+        self.assertEqual(properties.get_float(ovr.KEY_PLAYER_HEIGHT, 0.0), 2.0) # the float value was dropped
+        self.assertEqual(properties.misses, 1)
+        self.assertTrue(properties.set_string(b"Name", b"rift"))
+        self.assertTrue(properties.set_bool(b"Flag", True))
+        self.assertTrue(properties.set_float_array(b"Offsets", [0.5, 1.5, 2.5]))
+        self.assertEqual(properties.get_string(b"Name", None), b"rift")
+        self.assertIs(properties.get_bool(b"Flag", False), True)
+        self.assertEqual(properties.get_float_array(b"Offsets", 2), (0.5, 1.5))
+        self.assertEqual(properties.misses, 1)
+        self.assertFalse(properties.set_float(b"", 1.0)) # rejected by the runtime, so not cached
+        self.assertEqual(properties.get_float(b"", 3.0), 3.0)
+
+    def test_invalidated_by_recenter(self):
+        properties = self.properties
+        monitor = SessionStatusMonitor(self.hmd)
+        properties.watch(monitor)
+        period = properties.get_float(b"VsyncToNextVsync", 0.0)
+        self.assertAlmostEqual(period, 1.0 / self.runtime.refresh_rate, places=6)
+        properties.get_float(ovr.KEY_EYE_HEIGHT, ovr.DEFAULT_EYE_HEIGHT)
+        monitor.poll()
+        self.runtime.properties[ovr.KEY_EYE_HEIGHT] = 1.5
+        self.runtime.session_status["ShouldRecenter"] = True
+        monitor.poll()
+        self.assertEqual(properties.get_float(ovr.KEY_EYE_HEIGHT, ovr.DEFAULT_EYE_HEIGHT), 1.5)
+        properties.unwatch(monitor)
+        self.runtime.properties[ovr.KEY_EYE_HEIGHT] = 1.25
+        self.runtime.session_status["ShouldRecenter"] = False
+        monitor.poll()
+        self.runtime.session_status["ShouldRecenter"] = True
+        monitor.poll()
+        self.assertEqual(properties.get_float(ovr.KEY_EYE_HEIGHT, ovr.DEFAULT_EYE_HEIGHT), 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/bin/env python
+
+import ctypes
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import ovr
+from ovr.recording import PoseLog, Recorder, RecordingRuntime, ReplayRuntime, TRACKING_STATE, INPUT_STATE
+from ovr.simulated_runtime import SimulatedRuntime, VirtualClock
+
+
+class TestRecording(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "session.ovrlog")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def record(self, frames, close=True):
+        "Records frames tracking and input states from a SimulatedRuntime, one per 1/90 s"
+        clock = VirtualClock(10.0)
+        library = RecordingRuntime(SimulatedRuntime(clock=clock), self.path)
+        library.ovr_Initialize(ctypes.byref(ovr.InitParams()))
+        session = ovr.Session()
+        library.ovr_Create(ctypes.byref(session), ctypes.byref(ovr.GraphicsLuid()))
+        library.ovr_GetTrackingState.restype = ovr.TrackingState
+        states = []
+        for i in range(frames):
+            states.append(library.ovr_GetTrackingState(session, clock.now(), False))
+            library.ovr_GetInputState(session, ovr.ControllerType_Touch, ctypes.byref(ovr.InputState()))
+            clock.advance(1.0 / 90)
+        library.ovr_Destroy(session)
+        if close:
+            library.close()
+        else:
+            library.recorder._file.flush()
+        return states
+
+    def check_log(self, states):
+        log = PoseLog(self.path)
+        self.assertEqual(len(log), 2 * len(states))
+        self.assertAlmostEqual(log.start_time(), 10.0)
+        self.assertEqual(len(log.times(INPUT_STATE, ovr.ControllerType_Touch)), len(states))
+        out = ovr.TrackingState()
+        self.assertIsNone(log.lookup(9.0, out))
+        for i in (0, 3, len(states) - 1):
+            t = log.times(TRACKING_STATE)[i]
+            self.assertEqual(bytes(log.lookup(t + 0.001, out)), bytes(states[i]))
+        log.close()
+
+    def test_log(self):
+        self.check_log(self.record(10))
+
+    def test_unclosed_log(self):
+        self.check_log(self.record(5, close=False))
+
+    def test_concurrent_records(self):
+        recorder = Recorder(self.path)
+        def record(controllerType):
+            state = ovr.InputState()
+            for i in range(500):
+                state.Buttons = i
+                recorder.record(i * 0.001, state, controllerType)
+        threads = [threading.Thread(target=record, args=(1 << n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        recorder.close()
+        log = PoseLog(self.path)
+        self.assertEqual(len(log), 2000)
+        out = ovr.InputState()
+        for n in range(4):
+            self.assertEqual(len(log.times(INPUT_STATE, 1 << n)), 500)
+            for i in (0, 250, 499):
+                self.assertEqual(log.lookup(i * 0.001, out, 1 << n).Buttons, i)
+        log.close()
+
+    def test_replay(self):
+        states = self.record(10)
+        library = ReplayRuntime(self.path)
+        library.ovr_Initialize(ctypes.byref(ovr.InitParams()))
+        session = ovr.Session()
+        library.ovr_Create(ctypes.byref(session), ctypes.byref(ovr.GraphicsLuid()))
+        library.ovr_GetTrackingState.restype = ovr.TrackingState
+        for i in range(10):
+            replayed = library.ovr_GetTrackingState(session, 0, False)
+            self.assertEqual(bytes(replayed), bytes(states[i]))
+            library.clock.advance(1.0 / 90)
+        library.ovr_Destroy(session)
+        library.log.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
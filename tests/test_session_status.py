@@ -0,0 +1,57 @@
+#!/bin/env python
+
+import threading
+import unittest
+
+import ovr
+from ovr.session_status import (SessionStatusMonitor, SessionStatusEvent, VisibilityChanged,
+        QuitRequested, RecenterRequested)
+
+from sim_test_case import SimTestCase
+
+
+class TestSessionStatusMonitor(SimTestCase):
+
+    def test_poll_emits_typed_transitions(self):
+        monitor = SessionStatusMonitor(self.hmd)
+        events = []
+        quits = []
+        monitor.add_listener(events.append)
+        monitor.add_listener(quits.append, QuitRequested)
+        first = monitor.poll()
+        self.assertEqual(set(e.field for e in first), set(["IsVisible", "HmdPresent", "HmdMounted"]))
+        self.assertTrue(all(e.value for e in first))
+        self.assertEqual(monitor.poll(), [])
+        self.runtime.session_status["IsVisible"] = False
+        self.runtime.session_status["ShouldQuit"] = True
+        changes = monitor.poll()
+        self.assertEqual([type(e) for e in changes], [VisibilityChanged, QuitRequested])
+        self.assertEqual([e.value for e in changes], [False, True])
+        self.assertFalse(monitor.visible)
+        self.assertEqual(events, first + changes)
+        self.assertEqual(quits, changes[1:])
+        self.assertEqual(changes[0].status.ShouldQuit, b"\x01")
+        monitor.remove_listener(events.append)
+        self.runtime.session_status["IsVisible"] = True
+        self.assertEqual(len(monitor.poll()), 1)
+        self.assertTrue(monitor.visible)
+        self.assertEqual(len(events), 5)
+
+    def test_thread(self):
+        recentered = threading.Event()
+        monitor = SessionStatusMonitor(self.hmd, interval=0.001)
+        monitor.add_listener(lambda event: event.value and recentered.set(), RecenterRequested)
+        with monitor:
+            self.assertTrue(monitor.visible)
+            self.runtime.session_status["IsVisible"] = False
+            self.runtime.session_status["ShouldRecenter"] = True
+            self.assertTrue(recentered.wait(5))
+            self.assertFalse(monitor.wait_until_visible(0.01))
+            self.runtime.session_status["IsVisible"] = True
+            self.assertTrue(monitor.wait_until_visible(5))
+            ovr.recenterTrackingOrigin(self.hmd)
+        self.assertIsNone(monitor.error)
+
+
+if __name__ == '__main__':
+    unittest.main()
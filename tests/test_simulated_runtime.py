@@ -0,0 +1,246 @@
+#!/bin/env python
+
+import ctypes
+import unittest
+
+import ovr
+from ovr import layerPtrArray
+from ovr.frame_context import FrameContext
+
+from sim_test_case import SimTestCase
+
+
+class TestSimulatedRuntime(SimTestCase):
+
+    def test_tracking(self):
+        ts = ovr.getTrackingState(self.hmd, 1.25, True)
+        q = ts.HeadPose.ThePose.Orientation
+        self.assertAlmostEqual(q.x*q.x + q.y*q.y + q.z*q.z + q.w*q.w, 1.0, places=5)
+        self.assertEqual(ts.HeadPose.TimeInSeconds, 1.25)
+        self.assertTrue(ts.StatusFlags & ovr.Status_OrientationTracked)
+
+    def test_eye_poses(self):
+        hmdDesc = ovr.getHmdDesc(self.hmd)
+        offsets = (ovr.Vector3f * 2)()
+        for eye in range(2):
+            offsets[eye] = ovr.getRenderDesc(self.hmd, eye, hmdDesc.DefaultEyeFov[eye]).HmdToEyePose.Position
+        poses = (ovr.Posef * 2)()
+        ovr.getEyePoses(self.hmd, 0, True, offsets, poses)
+        ipd = sum((a - b)**2 for a, b in zip(poses[0].Position, poses[1].Position)) ** 0.5
+        self.assertAlmostEqual(ipd, 0.064, places=5)
+
+    def test_swap_chain(self):
+        desc = ovr.TextureSwapChainDesc()
+        desc.Type = ovr.Texture_2D
+        desc.Format = ovr.OVR_FORMAT_R8G8B8A8_UNORM_SRGB
+        desc.ArraySize = desc.Width = desc.Height = desc.MipLevels = desc.SampleCount = 1
+        chain = ovr.createTextureSwapChainGL(self.hmd, desc)
+        length = ovr.getTextureSwapChainLength(self.hmd, chain).value
+        ids = set()
+        for i in range(length):
+            ids.add(ovr.getTextureSwapChainBufferGL(self.hmd, chain, -1).value)
+            ovr.commitTextureSwapChain(self.hmd, chain)
+        self.assertEqual(len(ids), length)
+        self.assertEqual(ovr.getTextureSwapChainCurrentIndex(self.hmd, chain).value, 0)
+        ovr.destroyTextureSwapChain(self.hmd, chain)
+
+    def test_swap_chains_in_lockstep(self):
+        # SwapChainFramebuffers pairs the images of color and depth chains by index
+        desc = ovr.TextureSwapChainDesc()
+        desc.Type = ovr.Texture_2D
+        desc.Format = ovr.OVR_FORMAT_R8G8B8A8_UNORM_SRGB
+        desc.ArraySize = desc.MipLevels = desc.SampleCount = 1
+        desc.Width, desc.Height = 64, 32
+        color = ovr.createTextureSwapChainGL(self.hmd, desc)
+        self.addCleanup(ovr.destroyTextureSwapChain, self.hmd, color)
+        desc.Format = ovr.OVR_FORMAT_D32_FLOAT
+        depth = ovr.createTextureSwapChainGL(self.hmd, desc)
+        self.addCleanup(ovr.destroyTextureSwapChain, self.hmd, depth)
+        colorTextures, depthTextures = [[ovr.getTextureSwapChainBufferGL(self.hmd, chain, index).value
+                for index in range(ovr.getTextureSwapChainLength(self.hmd, chain).value)] for chain in (color, depth)]
+        self.assertEqual(len(colorTextures), len(depthTextures))
+        self.assertEqual(len(set(colorTextures + depthTextures)), 2 * len(colorTextures))
+        for frame in range(2 * len(colorTextures)):
+            index = ovr.getTextureSwapChainCurrentIndex(self.hmd, color).value
+            self.assertEqual(ovr.getTextureSwapChainCurrentIndex(self.hmd, depth).value, index)
+            self.assertEqual(index, frame % len(colorTextures))
+            self.assertEqual(ovr.getTextureSwapChainBufferGL(self.hmd, color, -1).value, colorTextures[index])
+            self.assertEqual(ovr.getTextureSwapChainBufferGL(self.hmd, depth, -1).value, depthTextures[index])
+            ovr.commitTextureSwapChain(self.hmd, color)
+            ovr.commitTextureSwapChain(self.hmd, depth)
+
+    def test_frame_pacing(self):
+        layer = ovr.LayerEyeFov()
+        layer.Header.Type = ovr.LayerType_EyeFov
+        viewScale = ovr.ViewScaleDesc()
+        for frameIndex in range(1, 9):
+            ovr.waitToBeginFrame(self.hmd, frameIndex)
+            ovr.beginFrame(self.hmd, frameIndex)
+            ovr.endFrame(self.hmd, frameIndex, viewScale, [layer.Header])
+        # One frame per vsync at 90 Hz
+        self.assertAlmostEqual(self.clock.now(), 7 / 90.0, places=6)
+        stats = ovr.getPerfStats(self.hmd)
+        self.assertEqual(stats.FrameStatsCount, ovr.MaxProvidedFrameStats)
+        self.assertTrue(ovr.fromOvrBool(stats.AnyFrameStatsDropped))
+        self.assertEqual(stats.FrameStats[0].AppFrameIndex, 8)
+        self.assertEqual(stats.FrameStats[0].AppDroppedFrameCount, 0)
+        # A slow frame misses a vsync
+        ovr.waitToBeginFrame(self.hmd, 9)
+        ovr.beginFrame(self.hmd, 9)
+        self.clock.advance(1.5 / 90.0)
+        ovr.endFrame(self.hmd, 9, viewScale, [layer.Header])
+        self.assertEqual(ovr.getPerfStats(self.hmd).FrameStats[0].AppDroppedFrameCount, 1)
+
+
+class TestSdkVersionSelection(SimTestCase):
+
+    create_session = False
+
+    def setUp(self):
+        super(TestSdkVersionSelection, self).setUp()
+        self.runtime.version_string = b"1.16.0"
+        self.open_session()
+
+    def test_pre117_runtime(self):
+        self.assertEqual(ovr.SDK_MINOR_VERSION, 16)
+        hmdDesc = ovr.getHmdDesc(self.hmd)
+        desc = ovr.getRenderDesc(self.hmd, ovr.Eye_Left, hmdDesc.DefaultEyeFov[0])
+        self.assertIsInstance(desc, ovr.EyeRenderDesc)
+        self.assertAlmostEqual(desc.HmdToEyePose.Position.x, -0.032, places=6)
+        self.assertEqual(desc.HmdToEyePose.Orientation.w, 1.0)
+        layer = ovr.LayerEyeFov()
+        layer.Header.Type = ovr.LayerType_EyeFov
+        for frameIndex in range(1, 4):
+            ovr.waitToBeginFrame(self.hmd, frameIndex)
+            ovr.beginFrame(self.hmd, frameIndex)
+            ovr.endFrame(self.hmd, frameIndex, ovr.ViewScaleDesc(), [layer.Header])
+        self.assertEqual(ovr.getPerfStats(self.hmd).FrameStats[0].AppFrameIndex, 3)
+
+    def test_pre125_layer_layout(self):
+        layer = ovr.LayerQuad()
+        layer.Header.Type = ovr.LayerType_Quad
+        layerPtrs = ovr.layerPtrArray([layer.Header])
+        layer.QuadSize.x = 2.5
+        self.assertIs(ovr.layerPtrArray(layerPtrs), layerPtrs) # refreshes the copy
+        size = ctypes.sizeof(layer) - ovr.LayerHeader.Reserved.size
+        data = ctypes.string_at(ctypes.addressof(layerPtrs[0].contents), size)
+        self.assertEqual(data[:8], ctypes.string_at(ctypes.addressof(layer), 8))
+        self.assertEqual(data[8:], ctypes.string_at(ctypes.addressof(layer) + ovr.LayerQuad.ColorTexture.offset, size - 8))
+
+    def test_layer_array_built_for_current_runtime(self):
+        layer = ovr.LayerQuad()
+        layer.Header.Type = ovr.LayerType_Quad
+        ovr.selectSdkVersion(ovr.MINOR_VERSION)
+        context = FrameContext(self.hmd, [layer]) # e.g. set up before initialize()
+        ovr.selectSdkVersion(16)
+        layer.QuadSize.x = 2.5
+        layerPtrs = ovr.layerPtrArray(context.layerPtrs)
+        self.assertIsNot(layerPtrs, context.layerPtrs)
+        self.assertIs(ovr.layerPtrArray(context.layerPtrs), layerPtrs) # the pointers did not change
+        size = ctypes.sizeof(layer) - ovr.LayerHeader.Reserved.size
+        data = ctypes.string_at(ctypes.addressof(layerPtrs[0].contents), size)
+        self.assertEqual(data[8:], ctypes.string_at(ctypes.addressof(layer) + ovr.LayerQuad.ColorTexture.offset, size - 8))
+        context.wait_to_begin_frame()
+        context.begin_frame()
+        context.end_frame()
+        context.submit_frame()
+        self.assertEqual(ovr.getPerfStats(self.hmd).FrameStats[0].AppFrameIndex, context.frame_index)
+        other = ovr.LayerQuad()
+        other.Header.Type = ovr.LayerType_Quad
+        context.layerPtrs[0] = ctypes.pointer(other.Header)
+        self.assertIsNot(ovr.layerPtrArray(context.layerPtrs), layerPtrs) # rebuilt for the new pointers
+
+    def test_references_follow_selection(self):
+        layer = ovr.LayerQuad()
+        layerPtrs = layerPtrArray([layer.Header]) # imported before initialize() selected SDK 1.16
+        self.assertNotEqual(ctypes.addressof(layerPtrs[0].contents), ctypes.addressof(layer))
+        ovr.selectSdkVersion(ovr.MINOR_VERSION)
+        self.assertEqual(ovr.SDK_MINOR_VERSION, ovr.MINOR_VERSION)
+        layerPtrs = layerPtrArray([layer.Header])
+        self.assertEqual(ctypes.addressof(layerPtrs[0].contents), ctypes.addressof(layer))
+        self.assertEqual(layerPtrArray.__name__, "layerPtrArray")
+        self.assertRaises(ValueError, ovr.selectSdkVersion, ovr.OLDEST_MINOR_VERSION - 1)
+
+    def test_missing_entry_point(self):
+        library = type(ovr.libovr)(object()) # exports nothing
+        library.prototype("ovr_GetSessionPhysicalDeviceLuid", ovr.Result, [ovr.Session])
+        with self.assertRaises(ovr.OculusFunctionError) as raised:
+            library.ovr_GetSessionPhysicalDeviceLuid
+        self.assertEqual(raised.exception.function_name, "ovr_GetSessionPhysicalDeviceLuid")
+        self.assertIn("does not export ovr_GetSessionPhysicalDeviceLuid", str(raised.exception))
+
+    def test_legacy_signatures(self):
+        headPose = ovr.Posef()
+        headPose.Orientation.w = 1.0
+        offsets = (ovr.Vector3f * 2)(ovr.Vector3f(-0.032, 0, 0), ovr.Vector3f(0.032, 0, 0))
+        poses = (ovr.Posef * 2)()
+        ovr.calcEyePoses(headPose, offsets, poses)
+        self.assertAlmostEqual(poses[1].Position.x, 0.032, places=6)
+        deviceTypes = [ovr.TrackedDevice_HMD, ovr.TrackedDevice_LTouch]
+        poseStates = ovr.getDevicePoses(self.hmd, deviceTypes, 1, 0.5) # takes the number of device types
+        self.assertEqual(len(poseStates), 1)
+        ovr.selectSdkVersion(ovr.MINOR_VERSION)
+        self.assertEqual(len(ovr.getDevicePoses(self.hmd, deviceTypes, 0.5)), 2)
+
+    def test_newer_request_rejected_by_older_runtime(self):
+        params = ovr.InitParams()
+        params.RequestedMinorVersion = ovr.MINOR_VERSION
+        params.Flags = ovr.Init_RequestVersion
+        ovr.initialize(params)
+        self.assertEqual(params.RequestedMinorVersion, 16)
+        self.runtime.version_string = b"2.0.0"
+        self.assertRaises(ovr.OculusFunctionError, ovr.getRuntimeMinorVersion)
+        self.runtime.version_string = b"0.8.0"
+        with self.assertRaises(ovr.OculusFunctionError) as raised:
+            ovr.getRuntimeMinorVersion()
+        self.assertIn("ovr._ovr080", str(raised.exception))
+
+    def test_unrequested_version_and_shutdown(self):
+        ovr.shutdown()
+        self.assertEqual(ovr.SDK_MINOR_VERSION, ovr.MINOR_VERSION) # restored by shutdown()
+        params = ovr.InitParams() # no Init_RequestVersion
+        ovr.initialize(params)
+        self.assertEqual(ovr.SDK_MINOR_VERSION, 16)
+        self.assertIsInstance(ovr.getRenderDesc(self.hmd, ovr.Eye_Left, ovr.FovPort(1, 1, 1, 1)), ovr.EyeRenderDesc)
+
+    def test_legacy_runtimes(self):
+        self.assertEqual(ovr.legacyModule(3), "_ovr130")
+        self.assertEqual(ovr.legacyModule(15), "_ovr1130")
+        self.assertRaises(ValueError, ovr.legacyModule, 16)
+        ovr.shutdown()
+        self.runtime.version_string = b"1.13.0"
+        with self.assertRaises(ValueError) as raised:
+            ovr.initialize(None)
+        self.assertIn("ovr._ovr1130", str(raised.exception))
+        self.assertEqual(ovr.SDK_MINOR_VERSION, ovr.MINOR_VERSION)
+
+
+class TestSimTestCase(SimTestCase):
+
+    create_session = False
+
+    def test_restores_runtime_state(self):
+        class Steering(SimTestCase):
+            def test_steer(self):
+                self.runtime.session_status["DisplayLost"] = True
+                self.runtime.boundaries[ovr.Boundary_PlayArea].pop()
+                self.runtime.inputs[ovr.ControllerType_Touch] = {"Buttons": ovr.Button_A}
+                self.runtime.version_string = b"1.16.0"
+                ovr.selectSdkVersion(16)
+                ovr.setRaiseOnError(False)
+        clock = self.runtime.clock
+        playArea = list(self.runtime.boundaries[ovr.Boundary_PlayArea])
+        result = unittest.TestResult()
+        Steering("test_steer").run(result)
+        self.assertTrue(result.wasSuccessful())
+        self.assertIs(self.runtime.clock, clock)
+        self.assertFalse(self.runtime.session_status["DisplayLost"])
+        self.assertEqual(self.runtime.boundaries[ovr.Boundary_PlayArea], playArea)
+        self.assertEqual(self.runtime.inputs, {})
+        self.assertEqual(self.runtime.version_string, b"1.69.0")
+        self.assertEqual(ovr.SDK_MINOR_VERSION, ovr.MINOR_VERSION)
+        self.assertRaises(ovr.OculusFunctionError, ovr.create) # not initialized, and raising again
+
+
+if __name__ == '__main__':
+    unittest.main()